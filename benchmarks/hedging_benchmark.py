@@ -0,0 +1,145 @@
+"""
+Measure tail latency of the indicator fan-out with and without hedging.
+
+Simulates provider calls with a long-tailed latency distribution (most calls
+are fast, ~2% stall) and runs batches of concurrent calls, one per indicator
+node, the way a single analysis does. A warmup phase fills the per-node
+latency windows before measuring. Prints the per-analysis latency
+percentiles and the extra call volume spent on hedges.
+
+    python benchmarks/hedging_benchmark.py [--analyses 300] [--fan-out 14]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from langchain_core.runnables import RunnableLambda  # noqa: E402
+from langgraph.graph import StateGraph, START, END  # noqa: E402
+from typing_extensions import TypedDict  # noqa: E402
+
+from llm import acall_llm, configure_llm_cache, configure_llm_hedging  # noqa: E402
+from llm_hedging import LLMHedgingPolicy  # noqa: E402
+from logger import get_logger  # noqa: E402
+from utils import percentile  # noqa: E402
+
+
+class FakeLLM:
+    """Provider stand-in with a fast median and a rare slow tail."""
+
+    def __init__(self, rng: random.Random, tail_probability: float):
+        self.rng = rng
+        self.tail_probability = tail_probability
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        if self.rng.random() < self.tail_probability:
+            latency = self.rng.uniform(0.5, 1.0)
+        else:
+            latency = self.rng.uniform(0.02, 0.06)
+        await asyncio.sleep(latency)
+        return Mock(content="ok")
+
+
+class State(TypedDict):
+    transcript: str
+
+
+def build_fan_out(llm, fan_out, logger):
+    graph = StateGraph(State)
+
+    async def detect(state):
+        await acall_llm(state["transcript"], llm, logger, use_cache=False)
+        return {}
+
+    for index in range(fan_out):
+        name = f"detect_{index}"
+        graph.add_node(name, RunnableLambda(lambda state: {}, afunc=detect))
+        graph.add_edge(START, name)
+        graph.add_edge(name, END)
+    return graph.compile()
+
+
+async def run(analyses, warmup, fan_out, policy, seed, tail_probability):
+    logger = get_logger("hedging_benchmark")
+    llm = FakeLLM(random.Random(seed), tail_probability)
+    compiled = build_fan_out(llm, fan_out, logger)
+    configure_llm_hedging(policy)
+    latencies = []
+    try:
+        for _ in range(warmup):
+            await compiled.ainvoke({"transcript": "transcript"})
+        llm.calls = 0
+        for _ in range(analyses):
+            started = time.monotonic()
+            await compiled.ainvoke({"transcript": "transcript"})
+            latencies.append(time.monotonic() - started)
+    finally:
+        configure_llm_hedging(None)
+    return sorted(latencies), llm.calls
+
+
+def report(label, latencies, calls, baseline_calls):
+    print(
+        f"{label:<10} p50={percentile(latencies, 0.5) * 1000:7.1f}ms "
+        f"p95={percentile(latencies, 0.95) * 1000:7.1f}ms "
+        f"p99={percentile(latencies, 0.99) * 1000:7.1f}ms "
+        f"calls={calls} (+{(calls - baseline_calls) / baseline_calls:.1%})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--analyses", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--fan-out", type=int, default=14)
+    parser.add_argument("--percentile", type=float, default=0.95)
+    parser.add_argument("--max-extra-ratio", type=float, default=0.1)
+    parser.add_argument("--tail-probability", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    configure_llm_cache(None)
+    baseline, baseline_calls = asyncio.run(
+        run(
+            args.analyses,
+            args.warmup,
+            args.fan_out,
+            None,
+            args.seed,
+            args.tail_probability,
+        )
+    )
+    policy = LLMHedgingPolicy(
+        latency_percentile=args.percentile,
+        max_extra_call_ratio=args.max_extra_ratio,
+    )
+    hedged, hedged_calls = asyncio.run(
+        run(
+            args.analyses,
+            args.warmup,
+            args.fan_out,
+            policy,
+            args.seed,
+            args.tail_probability,
+        )
+    )
+
+    report("baseline", baseline, baseline_calls, baseline_calls)
+    report("hedged", hedged, hedged_calls, baseline_calls)
+    metrics = policy.metrics()
+    print(
+        f"hedges={metrics['hedges']} wins={metrics['hedge_wins']} "
+        f"budget_denied={metrics['budget_denied']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compare triage-first indicator detection against the full fan-out.
+
+Runs every conversation in test_cases.json through the default graph twice,
+once with `triage_quality_indicators` off and once with it on, against the
+configured provider (needs OPENAI_API_KEY; the response cache is disabled).
+Prints the LLM calls each mode made and how often the two modes agree on
+each LLM-detected indicator, counting an indicator as flagged when it is
+detected with enough confidence to affect the score.
+
+    python benchmarks/triage_benchmark.py [--cases positive_resolution ...]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config_manager import create_config_manager  # noqa: E402
+from graph_builder import create_default_conversation_health_system  # noqa: E402
+from llm import configure_llm_cache, configure_llm_governor, get_llm  # noqa: E402
+from llm_governor import LLMGovernor  # noqa: E402
+from logger import get_logger  # noqa: E402
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def flagged_indicators(result, indicator_names):
+    indicator_results = result["health_score"]["indicator_results"]
+    return {
+        name: indicator_results[name]["pattern_detected"]
+        and indicator_results[name]["included_in_final_score"]
+        for name in indicator_names
+        if name in indicator_results
+    }
+
+
+async def run_mode(config, transcripts, triage, logger):
+    config.execution.triage_quality_indicators = triage
+    # The governor has no limits here; it only counts provider calls
+    governor = LLMGovernor()
+    configure_llm_governor(governor)
+    compiled = create_default_conversation_health_system(
+        config, get_llm(), logger
+    ).compile()
+    results = {}
+    try:
+        for name, transcript in transcripts.items():
+            results[name] = await compiled.ainvoke({"transcript": transcript})
+    finally:
+        configure_llm_governor(None)
+    return results, governor.metrics()["granted_total"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--config", default=os.path.join(SRC_DIR, "config.json"))
+    parser.add_argument(
+        "--test-cases", default=os.path.join(SRC_DIR, "test_cases.json")
+    )
+    parser.add_argument("--cases", nargs="*", help="Test case ids (default: all)")
+    args = parser.parse_args()
+
+    logger = get_logger("triage_benchmark")
+    config = create_config_manager(args.config).get_configuration()
+    with open(args.test_cases) as file:
+        test_cases = json.load(file)["test_cases"]
+    transcripts = {
+        name: case["transcript"]
+        for name, case in test_cases.items()
+        if not args.cases or name in args.cases
+    }
+    indicator_names = [
+        indicator.name
+        for indicator in config.quality_indicators
+        if indicator.derivation is None
+    ]
+
+    configure_llm_cache(None)
+    full, full_calls = asyncio.run(run_mode(config, transcripts, False, logger))
+    triaged, triage_calls = asyncio.run(run_mode(config, transcripts, True, logger))
+
+    agreements = {name: 0 for name in indicator_names}
+    for case in transcripts:
+        full_flags = flagged_indicators(full[case], indicator_names)
+        triage_flags = flagged_indicators(triaged[case], indicator_names)
+        plausible = triaged[case]["indicator_triage"]
+        print(
+            f"{case:<22} score full={full[case]['health_score']['final_score']:>3} "
+            f"triage={triaged[case]['health_score']['final_score']:>3} "
+            f"plausible={plausible.plausible_indicators if plausible else 'all'}"
+        )
+        for name in indicator_names:
+            agreements[name] += full_flags.get(name) == triage_flags.get(name)
+
+    print()
+    for name, agreed in agreements.items():
+        print(f"{name:<24} agreement={agreed / len(transcripts):.0%}")
+    total_agreed = sum(agreements.values())
+    total = len(transcripts) * len(indicator_names)
+    print(
+        f"\ncalls full={full_calls} triage={triage_calls} "
+        f"({(full_calls - triage_calls) / full_calls:.1%} saved), "
+        f"indicator agreement={total_agreed / total:.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
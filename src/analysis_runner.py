@@ -0,0 +1,275 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from analysis_store import AnalysisStore
+from batch_analysis import get_analysis_limiter
+from graph_registry import GraphRegistry
+from models import FailedAnalysisResult, SynthesisMode
+from request_context import llm_request_scope
+from tracing import start_trace
+
+
+async def run_stored_analysis(
+    graph_registry: GraphRegistry,
+    analysis_store: AnalysisStore,
+    transcript: str,
+    test_case: Optional[str] = None,
+    synthesis_mode: Optional[SynthesisMode] = None,
+    include_assessment: bool = True,
+    request_id: Optional[str] = None,
+    trace_name: str = "analyze",
+) -> Dict[str, Any]:
+    """
+    Analyze one transcript with the current config version and store the
+    result, returning it in the frontend format with its `analysisId`.
+    `request_id` groups LLM calls for the governor (a fresh id by default).
+    Waits for a slot when the process already runs its maximum number of
+    analyses.
+    """
+    async with get_analysis_limiter().slot():
+        return await _run_stored_analysis(
+            graph_registry,
+            analysis_store,
+            transcript,
+            test_case,
+            synthesis_mode,
+            include_assessment,
+            request_id,
+            trace_name,
+        )
+
+
+async def _run_stored_analysis(
+    graph_registry: GraphRegistry,
+    analysis_store: AnalysisStore,
+    transcript: str,
+    test_case: Optional[str],
+    synthesis_mode: Optional[SynthesisMode],
+    include_assessment: bool,
+    request_id: Optional[str],
+    trace_name: str,
+) -> Dict[str, Any]:
+    # Run the actual graph analysis without blocking the event loop; the
+    # request scope lets the LLM governor queue this analysis fairly and caps
+    # the total time its nodes spend retrying
+    started_at = time.perf_counter()
+    with (
+        graph_registry.acquire() as system,
+        llm_request_scope(request_id) as request_context,
+        start_trace(
+            trace_name,
+            request_id=request_context.request_id,
+            config_hash=system.config_hash,
+            include_assessment=include_assessment,
+        ) as trace,
+    ):
+        analysis_graph = (
+            system.compiled_graph if include_assessment else system.scoring_graph
+        )
+        result = await analysis_graph.ainvoke(
+            {"transcript": transcript, "synthesis_mode": synthesis_mode}
+        )
+
+    # Transform the result to match our frontend format
+    analysis_result = transform_graph_result(
+        result,
+        transcript,
+        test_case,
+        system.config_hash,
+        processing_time=time.perf_counter() - started_at,
+        node_timings=request_context.timing_breakdown(),
+    )
+    analysis_result["metadata"]["trace_id"] = trace.trace_id if trace else None
+    analysis_id = analysis_store.save(
+        result["health_score"],
+        analysis_result["overallAssessment"] if include_assessment else None,
+        config_hash=system.config_hash,
+        synthesis_mode=system.assessment_writer.resolve_synthesis_mode(synthesis_mode),
+    )
+    return {**analysis_result, "analysisId": analysis_id}
+
+
+def transform_graph_result(
+    graph_result: Dict[str, Any],
+    transcript: str,
+    test_case: Optional[str],
+    config_hash: Optional[str] = None,
+    processing_time: Optional[float] = None,
+    node_timings: Optional[Dict[str, Dict[str, float]]] = None,
+) -> Dict[str, Any]:
+    """
+    Transform the graph result to match the frontend format
+    """
+    # Extract the final assessment from your graph result; graphs run without
+    # the assessment stop at the score, so read their results from the state
+    final_assessment = graph_result.get("final_assessment") or {
+        **graph_result,
+        "overall_assessment": "",
+    }
+    health_score = final_assessment.get("health_score", {})
+
+    # Extract core metrics
+    final_score = health_score.get("final_score", 0)
+    health_level = health_score.get("health_level", "unknown").lower()
+
+    # Transform criteria evaluations
+    criteria_evaluations = {}
+    raw_criteria = final_assessment.get("criteria_evaluations", {})
+
+    for criteria_name, evaluation in raw_criteria.items():
+        if isinstance(evaluation, FailedAnalysisResult):
+            criteria_evaluations[criteria_name] = {
+                "points": health_score.get("criteria_results", {})
+                .get(criteria_name, {})
+                .get("earned_points", 0),
+                "maxPoints": 30,
+                "selectedResponse": "failed",
+                "confidence": evaluation.confidence.value,
+                "reasoning": evaluation.reasoning,
+                "color": get_color_for_response(None),
+            }
+            continue
+        criteria_evaluations[criteria_name] = {
+            "points": health_score.get("criteria_results", {})
+            .get(criteria_name, {})
+            .get("earned_points", 0),
+            "maxPoints": 30,  # You can get this from your config
+            "selectedResponse": (
+                evaluation.selected_response.value
+                if hasattr(evaluation, "selected_response")
+                else str(evaluation.get("selected_response", ""))
+            ),
+            "confidence": (
+                evaluation.confidence.value
+                if hasattr(evaluation, "confidence")
+                else str(evaluation.get("confidence", "moderate"))
+            ),
+            "reasoning": (
+                evaluation.reasoning
+                if hasattr(evaluation, "reasoning")
+                else str(evaluation.get("reasoning", ""))
+            ),
+            "color": get_color_for_response(
+                evaluation.selected_response
+                if hasattr(evaluation, "selected_response")
+                else evaluation.get("selected_response", "")
+            ),
+        }
+
+    # Transform quality indicators
+    quality_indicators = {}
+    raw_indicators = final_assessment.get("quality_indicator_detections", {})
+
+    for indicator_name, detection in raw_indicators.items():
+        if isinstance(detection, FailedAnalysisResult):
+            quality_indicators[indicator_name] = {
+                "detected": False,
+                "confidence": detection.confidence.value,
+                "impact": 0,
+                "reasoning": detection.reasoning,
+                "color": get_color_for_impact(0),
+            }
+            continue
+        quality_indicators[indicator_name] = {
+            "detected": (
+                detection.detected
+                if hasattr(detection, "detected")
+                else detection.get("detected", False)
+            ),
+            "confidence": (
+                detection.confidence.value
+                if hasattr(detection, "confidence")
+                else str(detection.get("confidence", "moderate"))
+            ),
+            "impact": health_score.get("indicator_results", {})
+            .get(indicator_name, {})
+            .get("score_impact", 0),
+            "reasoning": (
+                detection.reasoning
+                if hasattr(detection, "reasoning")
+                else str(detection.get("reasoning", ""))
+            ),
+            "color": get_color_for_impact(
+                health_score.get("indicator_results", {})
+                .get(indicator_name, {})
+                .get("score_impact", 0)
+            ),
+        }
+
+    # Overall assessment
+    overall_assessment = final_assessment.get(
+        "overall_assessment", "Analysis completed successfully"
+    )
+
+    # Uncertainty info
+    uncertainty_info = health_score.get("uncertainty_info", {})
+    failed_nodes = graph_result.get("failed_nodes", {})
+
+    return {
+        "finalScore": final_score,
+        "healthLevel": health_level,
+        "overallAssessment": overall_assessment,
+        "overallConfidence": "high",  # You can extract this from your graph if available
+        "criteriaEvaluations": criteria_evaluations,
+        "qualityIndicators": quality_indicators,
+        "uncertaintyInfo": {
+            "excludedCriteria": uncertainty_info.get("excluded_criteria", []),
+            "excludedIndicators": uncertainty_info.get("excluded_indicators", []),
+            "lowConfidenceCount": len(uncertainty_info.get("excluded_criteria", []))
+            + len(uncertainty_info.get("excluded_indicators", [])),
+            "failedCriteria": uncertainty_info.get("failed_criteria", []),
+            "failedIndicators": uncertainty_info.get("failed_indicators", []),
+        },
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "test_case": test_case,
+            "processing_time": processing_time,
+            # Per graph node: wall time, LLM time, rate-limiter queue time,
+            # tokens, cost, retries and cache hits
+            "node_timings": node_timings or {},
+            "source": "graph_analysis",
+            "config_hash": config_hash,
+            "total_criteria_points": health_score.get("total_criteria_points", 0),
+            "total_indicator_adjustment": health_score.get(
+                "total_indicator_adjustment", 0
+            ),
+            "raw_score": health_score.get("raw_score", 0),
+        },
+        "isPartial": bool(failed_nodes),
+        "failedNodes": failed_nodes,
+    }
+
+
+def get_color_for_response(response):
+    """Get color based on response type"""
+    if not response:
+        return "#6b7280"
+
+    response_str = str(response).lower()
+
+    if any(
+        word in response_str
+        for word in ["positive", "excellent", "comprehensive", "crystal"]
+    ):
+        return "#10b981"
+    elif any(
+        word in response_str
+        for word in ["negative", "poor", "unaddressed", "incomprehensible"]
+    ):
+        return "#ef4444"
+    elif any(word in response_str for word in ["moderate", "mostly", "substantial"]):
+        return "#3b82f6"
+    elif any(word in response_str for word in ["partial", "surface", "somewhat"]):
+        return "#f59e0b"
+    else:
+        return "#6b7280"
+
+
+def get_color_for_impact(impact):
+    """Get color based on impact value"""
+    if impact > 0:
+        return "#10b981"  # Green for positive
+    elif impact < 0:
+        return "#ef4444"  # Red for negative
+    else:
+        return "#6b7280"  # Gray for neutral
@@ -0,0 +1,153 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+from models import ConversationHealthScore, SynthesisMode
+
+
+class AnalysisStore:
+    """
+    Keeps calculated health scores in a local SQLite file so the assessment
+    narrative can be written later, on demand, and stored alongside; one
+    assessment per synthesis mode. Analyses expire after `ttl_seconds` and
+    the oldest are evicted once `max_entries` is exceeded.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "analyses.sqlite3",
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+    ):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("""CREATE TABLE IF NOT EXISTS analyses (
+                analysis_id TEXT PRIMARY KEY,
+                health_score TEXT NOT NULL,
+                config_hash TEXT,
+                created_at REAL NOT NULL
+            )""")
+        self._connection.execute("""CREATE TABLE IF NOT EXISTS assessments (
+                analysis_id TEXT NOT NULL,
+                synthesis_mode TEXT NOT NULL,
+                assessment TEXT NOT NULL,
+                PRIMARY KEY (analysis_id, synthesis_mode)
+            )""")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS analyses_by_age ON analyses (created_at)"
+        )
+        self._connection.commit()
+
+    def save(
+        self,
+        health_score: ConversationHealthScore,
+        assessment: Optional[str] = None,
+        config_hash: Optional[str] = None,
+        synthesis_mode: Optional[SynthesisMode] = None,
+    ) -> str:
+        analysis_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                """INSERT INTO analyses
+                (analysis_id, health_score, config_hash, created_at)
+                VALUES (?, ?, ?, ?)""",
+                (analysis_id, json.dumps(health_score), config_hash, now),
+            )
+            if assessment is not None:
+                self._insert_assessment(analysis_id, assessment, synthesis_mode)
+            self._evict(now)
+            self._connection.commit()
+        return analysis_id
+
+    def get_health_score(self, analysis_id: str) -> Optional[ConversationHealthScore]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT health_score, created_at FROM analyses WHERE analysis_id = ?",
+                (analysis_id,),
+            ).fetchone()
+        if row is None or self._is_expired(row[1], time.time()):
+            return None
+        return json.loads(row[0])
+
+    def get_assessment(
+        self, analysis_id: str, synthesis_mode: Optional[SynthesisMode] = None
+    ) -> Optional[str]:
+        """The assessment written in `synthesis_mode`, if there is one yet."""
+        with self._lock:
+            row = self._connection.execute(
+                """SELECT assessment FROM assessments
+                WHERE analysis_id = ? AND synthesis_mode = ?""",
+                (analysis_id, _mode_key(synthesis_mode)),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def get_config_hash(self, analysis_id: str) -> Optional[str]:
+        """Hash of the config version that produced the analysis."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT config_hash FROM analyses WHERE analysis_id = ?",
+                (analysis_id,),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def set_assessment(
+        self,
+        analysis_id: str,
+        assessment: str,
+        synthesis_mode: Optional[SynthesisMode] = None,
+    ) -> None:
+        with self._lock:
+            self._insert_assessment(analysis_id, assessment, synthesis_mode)
+            self._connection.commit()
+
+    def _insert_assessment(
+        self,
+        analysis_id: str,
+        assessment: str,
+        synthesis_mode: Optional[SynthesisMode],
+    ) -> None:
+        self._connection.execute(
+            """INSERT OR REPLACE INTO assessments
+            (analysis_id, synthesis_mode, assessment) VALUES (?, ?, ?)""",
+            (analysis_id, _mode_key(synthesis_mode), assessment),
+        )
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _evict(self, now: float) -> None:
+        """Delete expired analyses and those past `max_entries`, with only
+        their own assessments."""
+        evicted = set()
+        if self.ttl_seconds is not None:
+            evicted.update(
+                row[0]
+                for row in self._connection.execute(
+                    "SELECT analysis_id FROM analyses WHERE created_at < ?",
+                    (now - self.ttl_seconds,),
+                )
+            )
+        evicted.update(
+            row[0]
+            for row in self._connection.execute(
+                """SELECT analysis_id FROM analyses
+                ORDER BY created_at DESC LIMIT -1 OFFSET ?""",
+                (self.max_entries,),
+            )
+        )
+        ids = [(analysis_id,) for analysis_id in evicted]
+        self._connection.executemany("DELETE FROM analyses WHERE analysis_id = ?", ids)
+        self._connection.executemany(
+            "DELETE FROM assessments WHERE analysis_id = ?", ids
+        )
+
+
+def _mode_key(synthesis_mode: Optional[SynthesisMode]) -> str:
+    return synthesis_mode.value if synthesis_mode is not None else ""
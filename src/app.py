@@ -1,20 +1,66 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from contextlib import aclosing, asynccontextmanager
 from datetime import datetime
+import json
+import os
+import uuid
 import uvicorn
 
 # Import your conversation health modules
 from logger import get_logger
-from config_manager import ConversationHealthConfigManager
-from llm import get_llm
-from graph_builder import create_default_conversation_health_system
+from llm import (
+    get_llm,
+    configure_llm_cache,
+    get_llm_cache,
+    configure_llm_governor,
+    get_llm_governor,
+    configure_llm_retry_policy,
+    get_llm_retry_policy,
+    configure_llm_hedging,
+    get_llm_hedging,
+)
+from llm_cache import LLMResponseCache
+from llm_governor import create_llm_governor_from_env
+from llm_retry import create_llm_retry_policy_from_env
+from llm_hedging import create_llm_hedging_policy_from_env
+from indicator_prefilter import get_prefilter_stats
+from tracing import configure_trace_exporter, create_trace_exporter_from_env
+from instrumentation import (
+    configure_instrumentation,
+    create_node_instrumentation_from_env,
+    get_instrumentation,
+)
+from request_context import llm_request_scope
+from graph_registry import GraphRegistry, get_config_reload_interval
+from analysis_store import AnalysisStore
+from batch_analysis import cap_batch_concurrency, get_analysis_limiter, run_batch
+from job_queue import Job, create_job_queue_from_env
+from job_worker import JobWorkerPool, get_job_worker_count, webhook_url_error
+from early_termination import arun_until_level_settled
+from models import SynthesisMode
+from analysis_runner import run_stored_analysis
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Workers start with the server, not on import, so spawned worker
+    # processes importing this module do not start pools of their own
+    if job_worker_pool is not None:
+        job_worker_pool.start()
+    yield
+    if job_worker_pool is not None:
+        job_worker_pool.stop()
+
 
 app = FastAPI(
     title="Conversation Health Analysis API",
     description="API for analyzing conversation health and quality metrics",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -34,6 +80,24 @@ app.add_middleware(
 class AnalysisRequest(BaseModel):
     transcript: str
     test_case: Optional[str] = None
+    # Overrides the configured synthesis mode; "template" skips the LLM call
+    synthesis_mode: Optional[SynthesisMode] = None
+    # Without the assessment the analysis stops at the score; the narrative can
+    # be requested later from /analysis/{analysisId}/assessment
+    include_assessment: bool = True
+
+
+class BatchAnalysisRequest(BaseModel):
+    items: List[AnalysisRequest]
+    # Transcripts analysed at once, at most BATCH_MAX_CONCURRENT_ANALYSES (the
+    # default); analyses also share the process-wide MAX_CONCURRENT_ANALYSES
+    max_concurrency: Optional[int] = None
+
+
+class JobRequest(AnalysisRequest):
+    # POSTed the job id, status, result and error once the job finishes; must
+    # be http(s) and, when JOB_WEBHOOK_ALLOWED_HOSTS is set, on a listed host
+    webhook_url: Optional[str] = None
 
 
 class AnalysisResponse(BaseModel):
@@ -45,15 +109,66 @@ class AnalysisResponse(BaseModel):
     qualityIndicators: Dict[str, Any]
     uncertaintyInfo: Dict[str, Any]
     metadata: Dict[str, Any]
+    isPartial: bool = False
+    failedNodes: Dict[str, str] = {}
+    analysisId: Optional[str] = None
+
+
+class JobResponse(BaseModel):
+    jobId: str
+    status: str
+    attempts: int
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+    webhookError: Optional[str] = None
+    createdAt: float
+    finishedAt: Optional[float] = None
+
+
+class AssessmentResponse(BaseModel):
+    analysisId: str
+    overallAssessment: str
+
+
+class HealthLevelResponse(BaseModel):
+    healthLevel: str
+    healthColor: str
+    minScore: int
+    maxScore: int
+    terminatedEarly: bool
+    completedNodes: List[str]
+    configHash: str
 
 
 # Initialize the conversation health system
 logger = get_logger("conversation_health")
-config_manager = ConversationHealthConfigManager("config.json")
-config = config_manager.get_configuration()
 llm = get_llm()
-graph = create_default_conversation_health_system(config, llm, logger)
-compiled_graph = graph.compile()
+configure_llm_cache(
+    LLMResponseCache(
+        os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3"),
+        enabled=os.getenv("LLM_CACHE_BYPASS") is None,
+    )
+)
+# Job workers started below share the LLM rate limits with this process
+job_worker_count = get_job_worker_count()
+configure_llm_governor(create_llm_governor_from_env(processes=job_worker_count + 1))
+configure_llm_retry_policy(create_llm_retry_policy_from_env())
+configure_llm_hedging(create_llm_hedging_policy_from_env())
+configure_instrumentation(create_node_instrumentation_from_env())
+configure_trace_exporter(create_trace_exporter_from_env())
+# Compiled graphs per config version; requests pin the version they start on
+graph_registry = GraphRegistry("config.json", llm, logger)
+config_reload_interval = get_config_reload_interval()
+if config_reload_interval is not None:
+    graph_registry.start_watching(config_reload_interval)
+analysis_store = AnalysisStore(os.getenv("ANALYSIS_STORE_PATH", "analyses.sqlite3"))
+# Long analyses can be queued on /jobs and run by worker processes
+job_queue = create_job_queue_from_env()
+job_worker_pool = (
+    JobWorkerPool(job_worker_count, governor_processes=job_worker_count + 1)
+    if job_worker_count
+    else None
+)
 
 print("✅ Conversation health system initialized successfully")
 
@@ -72,172 +187,232 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    cache = get_llm_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+@app.get("/llm/governor")
+async def governor_metrics():
+    governor = get_llm_governor()
+    return governor.metrics() if governor is not None else {"enabled": False}
+
+
+@app.get("/llm/retries")
+async def retry_metrics():
+    policy = get_llm_retry_policy()
+    return policy.metrics() if policy is not None else {"enabled": False}
+
+
+@app.get("/llm/hedging")
+async def hedging_metrics():
+    policy = get_llm_hedging()
+    return policy.metrics() if policy is not None else {"enabled": False}
+
+
+@app.get("/analyze/limits")
+async def analysis_limits():
+    return get_analysis_limiter().metrics()
+
+
+@app.get("/prefilter/stats")
+async def prefilter_stats():
+    return get_prefilter_stats().metrics()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-node latency, token, cost and LLM call metrics for Prometheus"""
+    return PlainTextResponse(
+        get_instrumentation().render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@app.get("/config/versions")
+async def config_versions():
+    return graph_registry.metrics()
+
+
+@app.post("/config/reload")
+async def reload_config():
+    reloaded = graph_registry.reload()
+    return {"reloaded": reloaded, **graph_registry.metrics()}
+
+
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_conversation(request: AnalysisRequest):
     """
     Analyze a conversation transcript for health metrics
     """
+    return await run_analysis(request)
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(request: BatchAnalysisRequest):
+    """
+    Analyze many transcripts, streaming one NDJSON line per transcript as it
+    completes. A failing transcript produces an error line and does not stop
+    the others.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch cannot be empty")
+
+    # Every item queues for the LLM governor under the batch id, so the whole
+    # batch gets one fair share next to interactive requests
+    batch_id = uuid.uuid4().hex
+    max_concurrency = cap_batch_concurrency(request.max_concurrency)
+
+    async def stream_results():
+        async with aclosing(
+            run_batch(
+                request.items,
+                lambda item: run_analysis(item, request_id=batch_id),
+                max_concurrency,
+            )
+        ) as results:
+            async for item in results:
+                line = {
+                    "index": item.index,
+                    "testCase": request.items[item.index].test_case,
+                }
+                if item.error is None:
+                    line.update(status="ok", result=item.result.model_dump())
+                else:
+                    line.update(
+                        status="error",
+                        error=getattr(item.error, "detail", None) or repr(item.error),
+                    )
+                yield json.dumps(line) + "\n"
+
+    return StreamingResponse(
+        stream_results(),
+        media_type="application/x-ndjson",
+        headers={"X-Batch-Id": batch_id},
+    )
+
+
+async def run_analysis(
+    request: AnalysisRequest, request_id: Optional[str] = None
+) -> AnalysisResponse:
+    """Run one analysis and store it; `request_id` groups LLM calls for the
+    governor (a fresh id per analysis by default)"""
     if not request.transcript.strip():
         raise HTTPException(status_code=400, detail="Transcript cannot be empty")
 
     print("🔍 Running analysis with graph...")
 
-    # Run the actual graph analysis
-    result = compiled_graph.invoke({"transcript": request.transcript})
-
-    # Transform the result to match our frontend format
-    analysis_result = transform_graph_result(
-        result, request.transcript, request.test_case
+    result = await run_stored_analysis(
+        graph_registry,
+        analysis_store,
+        request.transcript,
+        request.test_case,
+        request.synthesis_mode,
+        request.include_assessment,
+        request_id=request_id,
     )
-
-    return AnalysisResponse(**analysis_result)
+    return AnalysisResponse(**result)
 
 
-def transform_graph_result(
-    graph_result: Dict[str, Any], transcript: str, test_case: Optional[str]
-) -> Dict[str, Any]:
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+async def create_job(request: JobRequest):
     """
-    Transform the graph result to match the frontend format
+    Queue an analysis for the worker processes; poll GET /jobs/{jobId} or
+    pass a webhook_url to be notified when it finishes
     """
-    # Extract the final assessment from your graph result
-    final_assessment = graph_result.get("final_assessment", {})
-    health_score = final_assessment.get("health_score", {})
-
-    # Extract core metrics
-    final_score = health_score.get("final_score", 0)
-    health_level = health_score.get("health_level", "unknown").lower()
-
-    # Transform criteria evaluations
-    criteria_evaluations = {}
-    raw_criteria = final_assessment.get("criteria_evaluations", {})
-
-    for criteria_name, evaluation in raw_criteria.items():
-        criteria_evaluations[criteria_name] = {
-            "points": health_score.get("criteria_results", {})
-            .get(criteria_name, {})
-            .get("earned_points", 0),
-            "maxPoints": 30,  # You can get this from your config
-            "selectedResponse": (
-                evaluation.selected_response.value
-                if hasattr(evaluation, "selected_response")
-                else str(evaluation.get("selected_response", ""))
-            ),
-            "confidence": (
-                evaluation.confidence.value
-                if hasattr(evaluation, "confidence")
-                else str(evaluation.get("confidence", "moderate"))
-            ),
-            "reasoning": (
-                evaluation.reasoning
-                if hasattr(evaluation, "reasoning")
-                else str(evaluation.get("reasoning", ""))
-            ),
-            "color": get_color_for_response(
-                evaluation.selected_response
-                if hasattr(evaluation, "selected_response")
-                else evaluation.get("selected_response", "")
-            ),
-        }
-
-    # Transform quality indicators
-    quality_indicators = {}
-    raw_indicators = final_assessment.get("quality_indicator_detections", {})
-
-    for indicator_name, detection in raw_indicators.items():
-        quality_indicators[indicator_name] = {
-            "detected": (
-                detection.detected
-                if hasattr(detection, "detected")
-                else detection.get("detected", False)
-            ),
-            "confidence": (
-                detection.confidence.value
-                if hasattr(detection, "confidence")
-                else str(detection.get("confidence", "moderate"))
-            ),
-            "impact": health_score.get("indicator_results", {})
-            .get(indicator_name, {})
-            .get("score_impact", 0),
-            "reasoning": (
-                detection.reasoning
-                if hasattr(detection, "reasoning")
-                else str(detection.get("reasoning", ""))
-            ),
-            "color": get_color_for_impact(
-                health_score.get("indicator_results", {})
-                .get(indicator_name, {})
-                .get("score_impact", 0)
-            ),
-        }
-
-    # Overall assessment
-    overall_assessment = final_assessment.get(
-        "overall_assessment", "Analysis completed successfully"
+    if not request.transcript.strip():
+        raise HTTPException(status_code=400, detail="Transcript cannot be empty")
+    if request.webhook_url is not None:
+        webhook_error = webhook_url_error(request.webhook_url)
+        if webhook_error is not None:
+            raise HTTPException(status_code=400, detail=webhook_error)
+
+    job_id = job_queue.enqueue(
+        request.model_dump(mode="json", exclude={"webhook_url"}),
+        webhook_url=request.webhook_url,
     )
+    return job_response(job_queue.get(job_id))
 
-    # Uncertainty info
-    uncertainty_info = health_score.get("uncertainty_info", {})
 
-    return {
-        "finalScore": final_score,
-        "healthLevel": health_level,
-        "overallAssessment": overall_assessment,
-        "overallConfidence": "high",  # You can extract this from your graph if available
-        "criteriaEvaluations": criteria_evaluations,
-        "qualityIndicators": quality_indicators,
-        "uncertaintyInfo": {
-            "excludedCriteria": uncertainty_info.get("excluded_criteria", []),
-            "excludedIndicators": uncertainty_info.get("excluded_indicators", []),
-            "lowConfidenceCount": len(uncertainty_info.get("excluded_criteria", []))
-            + len(uncertainty_info.get("excluded_indicators", [])),
-        },
-        "metadata": {
-            "timestamp": datetime.now().isoformat(),
-            "test_case": test_case,
-            "processing_time": 1.5,  # You can measure actual processing time
-            "source": "graph_analysis",
-            "total_criteria_points": health_score.get("total_criteria_points", 0),
-            "total_indicator_adjustment": health_score.get(
-                "total_indicator_adjustment", 0
-            ),
-            "raw_score": health_score.get("raw_score", 0),
-        },
-    }
+@app.get("/jobs/metrics")
+async def job_metrics():
+    return {**job_queue.metrics(), "workers": job_worker_count}
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_response(job)
 
 
-def get_color_for_response(response):
-    """Get color based on response type"""
-    if not response:
-        return "#6b7280"
-
-    response_str = str(response).lower()
-
-    if any(
-        word in response_str
-        for word in ["positive", "excellent", "comprehensive", "crystal"]
-    ):
-        return "#10b981"
-    elif any(
-        word in response_str
-        for word in ["negative", "poor", "unaddressed", "incomprehensible"]
-    ):
-        return "#ef4444"
-    elif any(word in response_str for word in ["moderate", "mostly", "substantial"]):
-        return "#3b82f6"
-    elif any(word in response_str for word in ["partial", "surface", "somewhat"]):
-        return "#f59e0b"
-    else:
-        return "#6b7280"
-
-
-def get_color_for_impact(impact):
-    """Get color based on impact value"""
-    if impact > 0:
-        return "#10b981"  # Green for positive
-    elif impact < 0:
-        return "#ef4444"  # Red for negative
-    else:
-        return "#6b7280"  # Gray for neutral
+def job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        jobId=job.job_id,
+        status=job.status.value,
+        attempts=job.attempts,
+        result=job.result,
+        error=job.error,
+        webhookError=job.webhook_error,
+        createdAt=job.created_at,
+        finishedAt=job.finished_at,
+    )
+
+
+@app.get("/analysis/{analysis_id}/assessment", response_model=AssessmentResponse)
+async def get_analysis_assessment(
+    analysis_id: str, synthesis_mode: Optional[SynthesisMode] = None
+):
+    """
+    Written assessment of a stored analysis, generated on the first request
+    for each synthesis mode
+    """
+    health_score = analysis_store.get_health_score(analysis_id)
+    if health_score is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+
+    # Prefer the config version that scored the analysis while it is loaded
+    with graph_registry.acquire() as current_system, llm_request_scope():
+        system = (
+            graph_registry.get(analysis_store.get_config_hash(analysis_id))
+            or current_system
+        )
+        synthesis_mode = system.assessment_writer.resolve_synthesis_mode(synthesis_mode)
+        assessment = analysis_store.get_assessment(analysis_id, synthesis_mode)
+        if assessment is None:
+            assessment = await system.assessment_writer.awrite_assessment(
+                health_score, synthesis_mode
+            )
+            analysis_store.set_assessment(analysis_id, assessment, synthesis_mode)
+
+    return AssessmentResponse(analysisId=analysis_id, overallAssessment=assessment)
+
+
+@app.post("/analyze/level", response_model=HealthLevelResponse)
+async def analyze_health_level(request: AnalysisRequest):
+    """
+    Determine only the health level, stopping the analysis as soon as the
+    results so far leave a single level reachable
+    """
+    if not request.transcript.strip():
+        raise HTTPException(status_code=400, detail="Transcript cannot be empty")
+
+    with graph_registry.acquire() as system, llm_request_scope():
+        result = await arun_until_level_settled(
+            system.compiled_graph, system.config, request.transcript
+        )
+
+    return HealthLevelResponse(
+        healthLevel=result["health_level"],
+        healthColor=result["health_color"],
+        minScore=result["min_score"],
+        maxScore=result["max_score"],
+        terminatedEarly=result["terminated_early"],
+        completedNodes=result["completed_nodes"],
+        configHash=system.config_hash,
+    )
 
 
 if __name__ == "__main__":
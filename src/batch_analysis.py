@@ -0,0 +1,159 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+
+# Conversations of one batch analysed at the same time; their LLM calls are
+# additionally bounded by the LLM governor when one is configured
+DEFAULT_BATCH_CONCURRENCY = 8
+# Analyses running at once across every request and batch of a process
+DEFAULT_MAX_CONCURRENT_ANALYSES = 32
+
+T = TypeVar("T")
+
+
+class BatchItemResult(NamedTuple):
+    """Outcome of one batch item; exactly one of result and error is set"""
+
+    index: int
+    result: Optional[Any] = None
+    error: Optional[BaseException] = None
+
+
+async def run_batch(
+    items: Iterable[T],
+    analyze: Callable[[T], Awaitable[Any]],
+    max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> AsyncIterator[BatchItemResult]:
+    """
+    Analyze every item with at most `max_concurrency` running at once,
+    yielding results in completion order. Items are pulled from `items` only
+    as workers free up, so a lazy iterable is never read far ahead. An item
+    that raises yields its error without affecting the others; an error
+    raised by `items` itself ends the batch. Closing the iterator early
+    cancels the analyses still running.
+    """
+    pending = enumerate(items)
+    finished: asyncio.Queue = asyncio.Queue()
+
+    async def worker() -> None:
+        try:
+            for index, item in pending:
+                try:
+                    result = BatchItemResult(index, result=await analyze(item))
+                except Exception as error:
+                    result = BatchItemResult(index, error=error)
+                finished.put_nowait(result)
+        except Exception as error:
+            # Reading the next item failed, e.g. a malformed input line
+            finished.put_nowait(error)
+        finished.put_nowait(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, max_concurrency))]
+    try:
+        running = len(workers)
+        while running:
+            result = await finished.get()
+            if result is None:
+                running -= 1
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                yield result
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+class AnalysisLimiter:
+    """
+    Process-wide cap on analyses running at once, however they were started
+    (single requests, batches or jobs). Callers beyond the cap wait for a
+    slot in arrival order.
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT_ANALYSES):
+        self.max_concurrent = max(1, max_concurrent)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running = 0
+        self._waiting = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        semaphore = self._loop_semaphore()
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        try:
+            yield
+        finally:
+            self._running -= 1
+            semaphore.release()
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "running": self._running,
+            "waiting": self._waiting,
+            "max_concurrent": self.max_concurrent,
+        }
+
+    def _loop_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; a new loop gets a fresh one
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+        return self._semaphore
+
+
+_analysis_limiter: Optional[AnalysisLimiter] = None
+
+
+def configure_analysis_limiter(limiter: Optional[AnalysisLimiter]) -> None:
+    """Install the process-wide analysis limiter (None rebuilds it from env)."""
+    global _analysis_limiter
+    _analysis_limiter = limiter
+
+
+def get_analysis_limiter() -> AnalysisLimiter:
+    """The process-wide analysis limiter, sized by MAX_CONCURRENT_ANALYSES."""
+    global _analysis_limiter
+    if _analysis_limiter is None:
+        _analysis_limiter = AnalysisLimiter(
+            int(
+                os.getenv(
+                    "MAX_CONCURRENT_ANALYSES", str(DEFAULT_MAX_CONCURRENT_ANALYSES)
+                )
+            )
+        )
+    return _analysis_limiter
+
+
+def get_batch_concurrency() -> int:
+    """Conversations analysed at once per batch, from
+    BATCH_MAX_CONCURRENT_ANALYSES."""
+    return int(
+        os.getenv("BATCH_MAX_CONCURRENT_ANALYSES", str(DEFAULT_BATCH_CONCURRENCY))
+    )
+
+
+def cap_batch_concurrency(requested: Optional[int]) -> int:
+    """A batch's concurrency: the requested value, at most
+    BATCH_MAX_CONCURRENT_ANALYSES (the default when none is requested)."""
+    limit = get_batch_concurrency()
+    return max(1, min(requested or limit, limit))
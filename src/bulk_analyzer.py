@@ -0,0 +1,316 @@
+"""
+Analyze a file of transcripts offline, appending one JSONL result per line.
+
+Reads a JSONL file (one object per line) or a CSV file with a header row and
+runs every transcript through the compiled graph with bounded concurrency,
+reading the input lazily so only the transcripts being analysed are held in
+memory. The output file doubles as the checkpoint: a rerun skips every id
+that already has a complete ("ok") result, so a crashed run resumes where it
+stopped, and failed ("error") or partial ("partial": some nodes failed)
+transcripts are retried; readers should keep the last line per id. LLM
+responses are cached as in the API
+(LLM_CACHE_PATH), so a transcript interrupted mid-analysis does not pay again
+for the calls it already made.
+
+    python bulk_analyzer.py transcripts.jsonl results.jsonl [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from contextlib import aclosing
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Set, TextIO
+
+from batch_analysis import get_batch_concurrency, run_batch
+from config_manager import create_config_manager
+from graph_builder import create_default_conversation_health_system
+from llm import (
+    configure_llm_cache,
+    configure_llm_governor,
+    configure_llm_hedging,
+    configure_llm_retry_policy,
+    get_llm,
+)
+from llm_cache import LLMResponseCache
+from llm_governor import create_llm_governor_from_env
+from llm_hedging import create_llm_hedging_policy_from_env
+from llm_retry import create_llm_retry_policy_from_env
+from logger import get_logger
+from models import SynthesisMode
+from request_context import llm_request_scope
+from utils import extract_health_score, extract_overall_assessment
+
+# Minimum seconds between progress lines
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+
+class BulkRunSummary(NamedTuple):
+    total: int
+    skipped: int
+    succeeded: int
+    partial: int
+    failed: int
+    elapsed_seconds: float
+
+
+class TranscriptRecord(NamedTuple):
+    """One input record; `error` says why a record could not be read."""
+
+    record_id: str
+    transcript: Optional[str]
+    error: Optional[Exception] = None
+
+
+def read_transcripts(
+    path: str, id_field: str = "id", transcript_field: str = "transcript"
+) -> Iterator[TranscriptRecord]:
+    """
+    Records from a JSONL or CSV file. Records without an id are identified by
+    their line (JSONL) or row (CSV) number; a malformed record is yielded
+    with its error instead of stopping the file.
+    """
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            rows = enumerate(csv.DictReader(f), start=1)
+        else:
+            rows = (
+                (number, line) for number, line in enumerate(f, start=1) if line.strip()
+            )
+        for number, row in rows:
+            record_id = f"line-{number}"
+            try:
+                record = json.loads(row) if isinstance(row, str) else row
+                if record.get(id_field) not in (None, ""):
+                    record_id = str(record[id_field])
+                transcript = record[transcript_field]
+                if not isinstance(transcript, str):
+                    raise ValueError(f"{transcript_field!r} is not text")
+            except (ValueError, KeyError, AttributeError) as e:
+                yield TranscriptRecord(record_id, None, e)
+                continue
+            yield TranscriptRecord(record_id, transcript)
+
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    """Ids with a complete result in an earlier run's output."""
+    completed: Set[str] = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # The last line of a crashed run may be cut short
+                continue
+            if record.get("status") == "ok":
+                completed.add(record["id"])
+    return completed
+
+
+def result_record(record_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """An analysis result line; "partial" when some nodes failed, so a rerun
+    analyzes the transcript again."""
+    health_score = extract_health_score(result) or result.get("health_score") or {}
+    return {
+        "id": record_id,
+        "status": "partial" if result.get("failed_nodes") else "ok",
+        "final_score": health_score.get("final_score"),
+        "health_level": health_score.get("health_level"),
+        "overall_assessment": extract_overall_assessment(result),
+        "failed_nodes": result.get("failed_nodes", {}),
+        "health_score": health_score,
+    }
+
+
+class ProgressReporter:
+    """Prints completed counts, throughput and ETA at most once a second."""
+
+    def __init__(
+        self,
+        total: int,
+        stream: TextIO = sys.stderr,
+        interval_seconds: float = PROGRESS_INTERVAL_SECONDS,
+    ):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.stream = stream
+        self.interval_seconds = interval_seconds
+        self.started_at = time.perf_counter()
+        self._printed_at: Optional[float] = None
+
+    def update(self, failed: bool = False) -> None:
+        self.done += 1
+        self.failed += failed
+        now = time.perf_counter()
+        if (
+            self.done == self.total
+            or self._printed_at is None
+            or now - self._printed_at >= self.interval_seconds
+        ):
+            self._printed_at = now
+            print(self.format(now - self.started_at), file=self.stream, flush=True)
+
+    def format(self, elapsed_seconds: float) -> str:
+        rate = self.done / elapsed_seconds if elapsed_seconds > 0 else 0.0
+        remaining = self.total - self.done
+        eta = format_duration(remaining / rate) if rate > 0 else "?"
+        return (
+            f"{self.done}/{self.total} analyzed ({self.failed} failed) · "
+            f"{rate:.2f}/s · ETA {eta}"
+        )
+
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    return f"{minutes}m{seconds:02d}s"
+
+
+async def analyze_file(
+    graph: Any,
+    input_path: str,
+    output_path: str,
+    concurrency: int = 8,
+    id_field: str = "id",
+    transcript_field: str = "transcript",
+    synthesis_mode: Optional[SynthesisMode] = None,
+    progress_stream: TextIO = sys.stderr,
+) -> BulkRunSummary:
+    """
+    Run every transcript not yet in the output through the compiled graph,
+    appending each result (or error) as soon as it completes.
+    """
+    started_at = time.perf_counter()
+    completed = load_completed_ids(output_path)
+    # A first pass only counts records, for the progress ETA
+    total = skipped = 0
+    for record_id, *_ in read_transcripts(input_path, id_field, transcript_field):
+        total += 1
+        skipped += record_id in completed
+    progress = ProgressReporter(total - skipped, progress_stream)
+    # Ids of the records handed to the batch whose result is not written yet
+    record_ids: Dict[int, str] = {}
+
+    def pending_records() -> Iterator[TranscriptRecord]:
+        records = read_transcripts(input_path, id_field, transcript_field)
+        pending = (record for record in records if record.record_id not in completed)
+        for index, record in enumerate(pending):
+            record_ids[index] = record.record_id
+            yield record
+
+    async def analyze(record: TranscriptRecord) -> Dict[str, Any]:
+        if record.error is not None:
+            # Written as an error line like a failed analysis
+            raise record.error
+        with llm_request_scope():
+            return await graph.ainvoke(
+                {"transcript": record.transcript, "synthesis_mode": synthesis_mode}
+            )
+
+    _end_partial_line(output_path)
+    counts = {"ok": 0, "partial": 0, "error": 0}
+    with open(output_path, "a") as output:
+        async with aclosing(
+            run_batch(pending_records(), analyze, concurrency)
+        ) as results:
+            async for item in results:
+                record_id = record_ids.pop(item.index)
+                if item.error is None:
+                    line = result_record(record_id, item.result)
+                else:
+                    line = {
+                        "id": record_id,
+                        "status": "error",
+                        "error": repr(item.error),
+                    }
+                counts[line["status"]] += 1
+                output.write(json.dumps(line, default=str) + "\n")
+                output.flush()
+                progress.update(failed=line["status"] != "ok")
+
+    return BulkRunSummary(
+        total=total,
+        skipped=skipped,
+        succeeded=counts["ok"],
+        partial=counts["partial"],
+        failed=counts["error"],
+        elapsed_seconds=time.perf_counter() - started_at,
+    )
+
+
+def _end_partial_line(path: str) -> None:
+    """Terminate a line cut short by a crash so new results start cleanly."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help="JSONL or CSV file of transcripts")
+    parser.add_argument("output", help="JSONL results file, appended to")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=get_batch_concurrency(),
+        help="Transcripts analysed at once",
+    )
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--transcript-field", default="transcript")
+    parser.add_argument(
+        "--synthesis-mode",
+        choices=[mode.value for mode in SynthesisMode],
+        help="Override the configured synthesis mode",
+    )
+    args = parser.parse_args()
+
+    logger = get_logger("bulk_analyzer")
+    config = create_config_manager(args.config).get_configuration()
+    configure_llm_cache(
+        LLMResponseCache(
+            os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3"),
+            enabled=os.getenv("LLM_CACHE_BYPASS") is None,
+        )
+    )
+    configure_llm_governor(create_llm_governor_from_env())
+    configure_llm_retry_policy(create_llm_retry_policy_from_env())
+    configure_llm_hedging(create_llm_hedging_policy_from_env())
+    graph = create_default_conversation_health_system(
+        config, get_llm(), logger
+    ).compile()
+
+    summary = asyncio.run(
+        analyze_file(
+            graph,
+            args.input,
+            args.output,
+            concurrency=args.concurrency,
+            id_field=args.id_field,
+            transcript_field=args.transcript_field,
+            synthesis_mode=(
+                SynthesisMode(args.synthesis_mode) if args.synthesis_mode else None
+            ),
+        )
+    )
+    print(
+        f"{summary.succeeded} analyzed, {summary.partial} partial, "
+        f"{summary.failed} failed, {summary.skipped} already done of "
+        f"{summary.total} in {format_duration(summary.elapsed_seconds)}"
+    )
+    sys.exit(1 if summary.failed or summary.partial else 0)
+
+
+if __name__ == "__main__":
+    main()
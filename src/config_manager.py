@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 from typing import Optional
@@ -30,6 +31,16 @@ class ConversationHealthConfigManager:
         return self._loaded_config
 
 
+def compute_config_hash(config_file_path: str = "config.json") -> str:
+    """SHA-256 of the configuration file contents, used as a cache key."""
+    with open(config_file_path, "rb") as f:
+        return hash_config_contents(f.read())
+
+
+def hash_config_contents(contents: bytes) -> str:
+    return hashlib.sha256(contents).hexdigest()
+
+
 def create_config_manager(
     config_file_path: str = "config.json",
 ) -> ConversationHealthConfigManager:
@@ -0,0 +1,180 @@
+from typing import Callable, Dict, Tuple
+from models import (
+    AssessmentConfidence,
+    ConcernAddressalLevel,
+    ConversationAnalysisState,
+    QualityIndicatorResult,
+)
+from transcript_metrics import get_transcript_index, word_share
+
+DerivedIndicatorFunction = Callable[[ConversationAnalysisState], QualityIndicatorResult]
+
+# A concern raised this many times while still open counts as repetitive
+REPETITION_THRESHOLD = 3
+
+# Share of all words spoken by one party that makes the effort one-sided
+ONE_SIDED_WORD_SHARE = 0.8
+
+UNRESOLVED_LEVELS = (
+    ConcernAddressalLevel.NOT_ADDRESSED,
+    ConcernAddressalLevel.PARTIALLY_ADDRESSED,
+)
+RESOLVED_LEVELS = (
+    ConcernAddressalLevel.MOSTLY_ADDRESSED,
+    ConcernAddressalLevel.FULLY_ADDRESSED,
+)
+
+_derived_indicators: Dict[str, DerivedIndicatorFunction] = {}
+_derived_indicator_reads: Dict[str, Tuple[str, ...]] = {}
+
+
+def register_derived_indicator(
+    name: str, reads: Tuple[str, ...] = ("identified_concerns",)
+) -> Callable[[DerivedIndicatorFunction], DerivedIndicatorFunction]:
+    """
+    Register a function that derives an indicator from the analysis state.
+    `reads` names the state keys it needs, so the graph runs it only after
+    they are produced.
+    """
+
+    def decorator(function: DerivedIndicatorFunction) -> DerivedIndicatorFunction:
+        _derived_indicators[name] = function
+        _derived_indicator_reads[name] = reads
+        return function
+
+    return decorator
+
+
+def get_derived_indicator(name: str) -> DerivedIndicatorFunction:
+    if name not in _derived_indicators:
+        raise ValueError(
+            f"Derived indicator '{name}' is not registered. "
+            f"Available: {sorted(_derived_indicators)}"
+        )
+    return _derived_indicators[name]
+
+
+def get_derived_indicator_reads(name: str) -> Tuple[str, ...]:
+    get_derived_indicator(name)
+    return _derived_indicator_reads[name]
+
+
+@register_derived_indicator("repetitive_unaddressed_concerns")
+def detect_repetitive_unaddressed_concerns(
+    state: ConversationAnalysisState,
+) -> QualityIndicatorResult:
+    concerns = state.identified_concerns.concerns
+    repeated = [
+        concern
+        for concern in concerns
+        if concern.times_raised >= REPETITION_THRESHOLD
+        and concern.addressal_level in UNRESOLVED_LEVELS
+    ]
+
+    if not repeated:
+        return QualityIndicatorResult(
+            detected=False,
+            reasoning=(
+                f"No concern was raised {REPETITION_THRESHOLD}+ times while "
+                f"unresolved ({len(concerns)} concern(s) identified)."
+            ),
+            confidence=(
+                AssessmentConfidence.HIGH if concerns else AssessmentConfidence.MODERATE
+            ),
+        )
+
+    # Ignored concerns are clear-cut; partial progress is a judgement call
+    ignored = any(
+        concern.addressal_level == ConcernAddressalLevel.NOT_ADDRESSED
+        for concern in repeated
+    )
+    return QualityIndicatorResult(
+        detected=True,
+        reasoning="Raised repeatedly without resolution: "
+        + "; ".join(
+            f"{concern.description} ({concern.times_raised}x, "
+            f"{concern.addressal_level.value})"
+            for concern in repeated
+        ),
+        confidence=(
+            AssessmentConfidence.HIGH if ignored else AssessmentConfidence.MODERATE
+        ),
+    )
+
+
+@register_derived_indicator("constructive_concern_handling")
+def detect_constructive_concern_handling(
+    state: ConversationAnalysisState,
+) -> QualityIndicatorResult:
+    concerns = state.identified_concerns.concerns
+    if not concerns:
+        return QualityIndicatorResult(
+            detected=False,
+            reasoning="No concerns were raised, so none were handled.",
+            confidence=AssessmentConfidence.LOW,
+        )
+
+    resolved = [
+        concern for concern in concerns if concern.addressal_level in RESOLVED_LEVELS
+    ]
+    resolved_share = len(resolved) / len(concerns)
+    fully_addressed = any(
+        concern.addressal_level == ConcernAddressalLevel.FULLY_ADDRESSED
+        for concern in concerns
+    )
+
+    if resolved_share >= 0.75 and fully_addressed:
+        confidence = (
+            AssessmentConfidence.VERY_HIGH
+            if resolved_share == 1.0
+            else AssessmentConfidence.HIGH
+        )
+        return QualityIndicatorResult(
+            detected=True,
+            reasoning=f"{len(resolved)} of {len(concerns)} concern(s) were mostly or "
+            "fully addressed.",
+            confidence=confidence,
+        )
+
+    return QualityIndicatorResult(
+        detected=False,
+        reasoning=f"Only {len(resolved)} of {len(concerns)} concern(s) were mostly "
+        "or fully addressed.",
+        confidence=(
+            AssessmentConfidence.HIGH
+            if resolved_share < 0.5
+            else AssessmentConfidence.MODERATE
+        ),
+    )
+
+
+@register_derived_indicator("one_sided_effort", reads=("transcript_index",))
+def detect_one_sided_effort(state: ConversationAnalysisState) -> QualityIndicatorResult:
+    shares = word_share(get_transcript_index(state))
+    if len(shares) < 2:
+        return QualityIndicatorResult(
+            detected=False,
+            reasoning="Fewer than two speakers were found in the transcript.",
+            confidence=AssessmentConfidence.LOW,
+        )
+
+    speaker, share = max(shares.items(), key=lambda item: item[1])
+    if share >= ONE_SIDED_WORD_SHARE:
+        return QualityIndicatorResult(
+            detected=True,
+            reasoning=f"{speaker} spoke {share:.0%} of all words in the conversation.",
+            confidence=(
+                AssessmentConfidence.HIGH
+                if share >= 0.9
+                else AssessmentConfidence.MODERATE
+            ),
+        )
+
+    return QualityIndicatorResult(
+        detected=False,
+        reasoning=f"The most active speaker, {speaker}, spoke {share:.0%} of all "
+        "words.",
+        confidence=(
+            AssessmentConfidence.HIGH if share < 0.7 else AssessmentConfidence.MODERATE
+        ),
+    )
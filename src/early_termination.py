@@ -0,0 +1,108 @@
+from contextlib import aclosing, closing
+from typing import Any, Dict, List, Optional, Tuple
+from typing_extensions import TypedDict
+from models import ConversationHealthConfig
+from score_calculator import ConversationHealthScorer
+
+
+class HealthLevelResult(TypedDict):
+    """Health level of a conversation, possibly settled before all nodes ran"""
+
+    health_level: str
+    health_color: str
+    min_score: int
+    max_score: int
+    terminated_early: bool
+    completed_nodes: List[str]
+
+
+class HealthLevelTracker:
+    """
+    Follows a graph run's node updates and reports when the score bounds of
+    the results so far fall inside a single health level.
+    """
+
+    def __init__(self, config: ConversationHealthConfig):
+        self.scorer = ConversationHealthScorer(config)
+        self.criteria_evaluations: Dict[str, Any] = {}
+        self.quality_indicator_detections: Dict[str, Any] = {}
+        self.completed_nodes: List[str] = []
+
+    def record(self, updates: Dict[str, Any]) -> None:
+        for node_name, update in updates.items():
+            self.completed_nodes.append(node_name)
+            if not update:
+                continue
+            self.criteria_evaluations.update(update.get("criteria_evaluations") or {})
+            self.quality_indicator_detections.update(
+                update.get("quality_indicator_detections") or {}
+            )
+
+    def score_bounds(self) -> Tuple[int, int]:
+        return self.scorer.calculate_score_bounds(
+            self.criteria_evaluations, self.quality_indicator_detections
+        )
+
+    def settled_result(self) -> Optional[HealthLevelResult]:
+        score_bounds = self.score_bounds()
+        health_range = self.scorer.determine_settled_health_level(score_bounds)
+        if health_range is None:
+            return None
+        return self._result(health_range.label, health_range.color, score_bounds)
+
+    def final_result(self) -> HealthLevelResult:
+        """Result once the graph has finished without the level settling."""
+        score_bounds = self.score_bounds()
+        # Results the graph never produced keep the bounds open; report the
+        # level of the midpoint score
+        health_range = self.scorer.determine_health_level(
+            (score_bounds[0] + score_bounds[1]) // 2
+        )
+        return self._result(health_range.label, health_range.color, score_bounds)
+
+    def _result(
+        self, health_level: str, health_color: str, score_bounds: Tuple[int, int]
+    ) -> HealthLevelResult:
+        return {
+            "health_level": health_level,
+            "health_color": health_color,
+            "min_score": score_bounds[0],
+            "max_score": score_bounds[1],
+            "terminated_early": False,
+            "completed_nodes": list(self.completed_nodes),
+        }
+
+
+def run_until_level_settled(
+    compiled_graph: Any, config: ConversationHealthConfig, transcript: str
+) -> HealthLevelResult:
+    """
+    Run the analysis only until the health level is known. Nodes that have
+    not started yet are never run once the level settles.
+    """
+    tracker = HealthLevelTracker(config)
+    with closing(
+        compiled_graph.stream({"transcript": transcript}, stream_mode="updates")
+    ) as updates:
+        for update in updates:
+            tracker.record(update)
+            settled = tracker.settled_result()
+            if settled is not None:
+                return {**settled, "terminated_early": True}
+    return tracker.final_result()
+
+
+async def arun_until_level_settled(
+    compiled_graph: Any, config: ConversationHealthConfig, transcript: str
+) -> HealthLevelResult:
+    """Async variant; closing the stream also cancels in-flight node calls."""
+    tracker = HealthLevelTracker(config)
+    async with aclosing(
+        compiled_graph.astream({"transcript": transcript}, stream_mode="updates")
+    ) as updates:
+        async for update in updates:
+            tracker.record(update)
+            settled = tracker.settled_result()
+            if settled is not None:
+                return {**settled, "terminated_early": True}
+    return tracker.final_result()
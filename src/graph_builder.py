@@ -4,9 +4,12 @@ from langchain_core.language_models import BaseLanguageModel
 from langgraph.graph import StateGraph, END, START
 from models import ConversationAnalysisState, ConversationHealthConfig
 from subgraph_creators import (
+    BaseSubgraphCreator,
     ConcernAnalysisSubgraphCreator,
     ConfigBasedEvaluationSubgraphCreator,
+    DerivedIndicatorSubgraphCreator,
     ScoringSynthesisSubgraphCreator,
+    TranscriptIndexSubgraphCreator,
 )
 
 
@@ -33,6 +36,7 @@ class GraphBuilder:
         entry_node: str,
         exit_connections: Dict[str, Union[str, END]],  # type: ignore
         connect_entry_to: Optional[Union[str, List[str]]] = None,
+        wait_for_all_sources: bool = False,
     ) -> "GraphBuilder":
         """
         Add a subgraph to the main workflow.
@@ -42,6 +46,8 @@ class GraphBuilder:
             entry_node: The node that should serve as entry point for this subgraph
             exit_connections: Dict of {exit_node: target_node} connections
             connect_entry_to: Node(s) to connect to this subgraph's entry (None for initial subgraph)
+            wait_for_all_sources: Run the entry once after all connect_entry_to nodes finish,
+                instead of once per finished source node
         """
         from langgraph.graph import START
 
@@ -56,6 +62,8 @@ class GraphBuilder:
         if connect_entry_to:
             if isinstance(connect_entry_to, str):
                 self.main_graph.add_edge(connect_entry_to, entry_node)
+            elif wait_for_all_sources:
+                self.main_graph.add_edge(list(connect_entry_to), entry_node)
             else:
                 for source_node in connect_entry_to:
                     self.main_graph.add_edge(source_node, entry_node)
@@ -68,6 +76,76 @@ class GraphBuilder:
 
         return self
 
+    def add_dependent_subgraphs(
+        self, creators: List[BaseSubgraphCreator]
+    ) -> "GraphBuilder":
+        """
+        Add subgraphs wired by the state keys they read and write.
+
+        A subgraph's entry waits for every other subgraph that writes a key it
+        reads. Subgraphs without upstream producers start from the initial entry
+        node, so independent branches run in parallel. Exits that no other
+        subgraph consumes are connected to END.
+        """
+        built = {id(creator): creator.create_subgraph() for creator in creators}
+        producers = {
+            id(consumer): [
+                producer
+                for producer in creators
+                if producer is not consumer
+                and set(producer.writes) & set(consumer.reads)
+            ]
+            for consumer in creators
+        }
+
+        ordered = self._order_by_dependencies(creators, producers)
+        consumed_creators = {
+            id(producer) for deps in producers.values() for producer in deps
+        }
+
+        for creator in ordered:
+            subgraph, entry_node, exit_nodes = built[id(creator)]
+            upstream_exits = [
+                exit_node
+                for producer in producers[id(creator)]
+                for exit_node in built[id(producer)][2]
+            ]
+            exit_connections = (
+                {}
+                if id(creator) in consumed_creators
+                else {exit_node: END for exit_node in exit_nodes}
+            )
+            self.add_subgraph(
+                subgraph,
+                entry_node=entry_node,
+                exit_connections=exit_connections,
+                connect_entry_to=upstream_exits or self.initial_entry_node,
+                wait_for_all_sources=True,
+            )
+
+        return self
+
+    @staticmethod
+    def _order_by_dependencies(
+        creators: List[BaseSubgraphCreator],
+        producers: Dict[int, List[BaseSubgraphCreator]],
+    ) -> List[BaseSubgraphCreator]:
+        ordered: List[BaseSubgraphCreator] = []
+        placed = set()
+        while len(ordered) < len(creators):
+            ready = [
+                creator
+                for creator in creators
+                if id(creator) not in placed
+                and all(id(p) in placed for p in producers[id(creator)])
+            ]
+            if not ready:
+                raise ValueError("Subgraph data dependencies contain a cycle")
+            for creator in ready:
+                ordered.append(creator)
+                placed.add(id(creator))
+        return ordered
+
     def build(self) -> StateGraph:
         if not self.main_graph.nodes:
             raise ValueError("No nodes added to the graph")
@@ -77,9 +155,46 @@ class GraphBuilder:
         return self.main_graph
 
 
+def get_critical_path_depth(compiled_graph: Any) -> int:
+    """
+    Number of nodes on the longest START -> END path of a compiled graph.
+
+    Nodes on the same path run sequentially, so this is the minimum number of
+    node executions a single request waits for.
+    """
+    drawable = compiled_graph.get_graph()
+    successors: Dict[str, List[str]] = {}
+    for edge in drawable.edges:
+        successors.setdefault(edge.source, []).append(edge.target)
+
+    depths: Dict[str, int] = {}
+
+    def depth_from(node: str, visiting: frozenset) -> int:
+        if node == END:
+            return 0
+        if node in depths:
+            return depths[node]
+        if node in visiting:
+            raise ValueError(f"Graph contains a cycle through '{node}'")
+        next_depths = [
+            depth_from(target, visiting | {node}) for target in successors.get(node, [])
+        ]
+        depths[node] = (0 if node == START else 1) + max(next_depths, default=0)
+        return depths[node]
+
+    return depth_from(START, frozenset())
+
+
 def create_default_conversation_health_system(
-    config: ConversationHealthConfig, llm: BaseLanguageModel, logger: Logger
+    config: ConversationHealthConfig,
+    llm: BaseLanguageModel,
+    logger: Logger,
+    include_assessment: bool = True,
 ) -> StateGraph:
+    """
+    Build the full analysis graph. Without `include_assessment` it ends once
+    the health score is calculated and writes no assessment narrative.
+    """
     builder = GraphBuilder(
         ConversationAnalysisState,
         config,
@@ -88,33 +203,19 @@ def create_default_conversation_health_system(
         initial_entry_node="start_conversation_analysis",
     )
 
-    concern_creator = ConcernAnalysisSubgraphCreator(config, llm, logger)
-    concern_graph, concern_entry, concern_exits = concern_creator.create_subgraph()
-    builder.add_subgraph(
-        concern_graph,
-        entry_node=concern_entry,
-        connect_entry_to="start_conversation_analysis",
-        exit_connections={concern_exits[0]: "start_evaluations"},
-    )
-
-    eval_creator = ConfigBasedEvaluationSubgraphCreator(config, llm, logger)
-    eval_graph, eval_entry, eval_exits = eval_creator.create_subgraph()
-    builder.add_subgraph(
-        eval_graph,
-        entry_node=eval_entry,
-        connect_entry_to=concern_exits,
-        exit_connections={
-            exit_node: "calculate_health_score" for exit_node in eval_exits
-        },
+    creators: List[BaseSubgraphCreator] = [
+        ConcernAnalysisSubgraphCreator(config, llm, logger),
+        ConfigBasedEvaluationSubgraphCreator(config, llm, logger),
+    ]
+    if any(indicator.derivation for indicator in config.quality_indicators):
+        creators.append(DerivedIndicatorSubgraphCreator(config, llm, logger))
+    creators.append(
+        ScoringSynthesisSubgraphCreator(config, llm, logger, include_assessment)
     )
+    # Index the transcript only when a subgraph consumes the turn index
+    if any("transcript_index" in creator.reads for creator in creators):
+        creators.insert(0, TranscriptIndexSubgraphCreator(config, llm, logger))
 
-    scoring_creator = ScoringSynthesisSubgraphCreator(config, llm, logger)
-    scoring_graph, scoring_entry, scoring_exits = scoring_creator.create_subgraph()
-    builder.add_subgraph(
-        scoring_graph,
-        entry_node=scoring_entry,
-        connect_entry_to=None,
-        exit_connections={scoring_exits[0]: END},
-    )
+    builder.add_dependent_subgraphs(creators)
 
     return builder.build()
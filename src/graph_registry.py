@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from logging import Logger
+from typing import Any, Dict, Iterator, Optional
+
+from langchain_core.language_models import BaseLanguageModel
+from config_manager import hash_config_contents
+from graph_builder import create_default_conversation_health_system
+from models import ConversationHealthConfig
+from subgraph_creators import ScoringSynthesisSubgraphCreator
+
+
+class AnalysisSystem:
+    """Compiled graphs built from one version of the configuration."""
+
+    def __init__(
+        self,
+        config_hash: str,
+        config: ConversationHealthConfig,
+        llm: BaseLanguageModel,
+        logger: Logger,
+    ):
+        self.config_hash = config_hash
+        self.config = config
+        self.compiled_graph = create_default_conversation_health_system(
+            config, llm, logger
+        ).compile()
+        # Ends at the health score; the narrative is written on demand
+        self.scoring_graph = create_default_conversation_health_system(
+            config, llm, logger, include_assessment=False
+        ).compile()
+        self.assessment_writer = ScoringSynthesisSubgraphCreator(config, llm, logger)
+
+
+class GraphRegistry:
+    """
+    Compiled analysis systems keyed by the hash of the config file contents.
+
+    New requests get the current version; a reload that finds changed
+    contents swaps in a newly compiled version while requests already running
+    keep the one they acquired. Versions that are no longer current are
+    dropped once their last request finishes.
+    """
+
+    def __init__(self, config_path: str, llm: BaseLanguageModel, logger: Logger):
+        self.config_path = config_path
+        self.llm = llm
+        self.logger = logger
+        self.reloads = 0
+        self.failed_reloads = 0
+        self._lock = threading.Lock()
+        # Serialises reloads so the watcher and explicit reloads never race
+        self._reload_lock = threading.Lock()
+        self._versions: Dict[str, AnalysisSystem] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._current: Optional[AnalysisSystem] = None
+        # Last rejected contents, so the watcher does not retry them every poll
+        self._rejected_hash: Optional[str] = None
+        self._stop_watching = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        # Unlike later reloads, a broken config at startup is an error
+        with open(config_path, "rb") as f:
+            self._swap_in(self._compile(f.read()))
+
+    def current(self) -> AnalysisSystem:
+        with self._lock:
+            return self._current
+
+    def get(self, config_hash: str) -> Optional[AnalysisSystem]:
+        with self._lock:
+            return self._versions.get(config_hash)
+
+    @contextmanager
+    def acquire(self) -> Iterator[AnalysisSystem]:
+        """Pin the current version for the duration of one request."""
+        with self._lock:
+            system = self._current
+            self._in_flight[system.config_hash] += 1
+        try:
+            yield system
+        finally:
+            with self._lock:
+                self._in_flight[system.config_hash] -= 1
+                self._evict_unused()
+
+    def reload(self) -> bool:
+        """
+        Compile the config file if its contents changed. An invalid file is
+        logged and the current version stays in place. Returns whether a new
+        version was swapped in.
+        """
+        with self._reload_lock:
+            return self._reload()
+
+    def _reload(self) -> bool:
+        try:
+            with open(self.config_path, "rb") as f:
+                contents = f.read()
+        except OSError as e:
+            self.logger.warning(f"Config reload skipped: {e}")
+            return False
+
+        config_hash = hash_config_contents(contents)
+        if config_hash in (self.current().config_hash, self._rejected_hash):
+            return False
+
+        try:
+            system = self._compile(contents)
+        except Exception as e:
+            self._rejected_hash = config_hash
+            self.failed_reloads += 1
+            self.logger.warning(f"Config reload rejected: {e}")
+            return False
+
+        self._swap_in(system)
+        self.reloads += 1
+        return True
+
+    def _compile(self, contents: bytes) -> AnalysisSystem:
+        config = ConversationHealthConfig.model_validate(json.loads(contents))
+        return AnalysisSystem(
+            hash_config_contents(contents), config, self.llm, self.logger
+        )
+
+    def _swap_in(self, system: AnalysisSystem) -> None:
+        with self._lock:
+            self._versions[system.config_hash] = system
+            self._in_flight.setdefault(system.config_hash, 0)
+            self._current = system
+            self._evict_unused()
+        self.logger.info(
+            f"Analysis graph compiled for config {system.config_hash[:12]}"
+        )
+
+    def _evict_unused(self) -> None:
+        for config_hash in list(self._versions):
+            if (
+                config_hash != self._current.config_hash
+                and self._in_flight[config_hash] == 0
+            ):
+                del self._versions[config_hash]
+                del self._in_flight[config_hash]
+
+    def start_watching(self, interval_seconds: float = 5.0) -> None:
+        """Poll the config file in a background thread and reload on change."""
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+
+        def watch() -> None:
+            while not self._stop_watching.wait(interval_seconds):
+                self.reload()
+
+        self._watcher = threading.Thread(
+            target=watch, name="config-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "current_config_hash": self._current.config_hash,
+                "loaded_versions": dict(self._in_flight),
+                "reloads": self.reloads,
+                "failed_reloads": self.failed_reloads,
+                "watching": self._watcher is not None,
+            }
+
+
+def get_config_reload_interval() -> Optional[float]:
+    """Seconds between config file checks from CONFIG_RELOAD_INTERVAL_SECONDS;
+    None when unset or 0, which disables hot reload."""
+    interval = os.getenv("CONFIG_RELOAD_INTERVAL_SECONDS")
+    if not interval or float(interval) <= 0:
+        return None
+    return float(interval)
@@ -0,0 +1,99 @@
+import re
+import threading
+from typing import Any, Dict, List, Pattern
+from models import (
+    IndicatorPrefilterConfig,
+    QualityIndicatorConfig,
+    QualityIndicatorResult,
+)
+
+
+def compile_prefilter(prefilter: IndicatorPrefilterConfig) -> Pattern[str]:
+    """Compile keywords and patterns into one case-insensitive alternation."""
+    alternatives = [rf"\b{re.escape(keyword)}\b" for keyword in prefilter.keywords] + [
+        f"(?:{pattern})" for pattern in prefilter.patterns
+    ]
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+
+class IndicatorPrefilter:
+    """
+    Rules an indicator out when none of its trigger vocabulary appears in the
+    transcript, so the detection node can skip its LLM call.
+    """
+
+    def __init__(self, indicator_config: QualityIndicatorConfig):
+        if indicator_config.prefilter is None:
+            raise ValueError(f"Indicator '{indicator_config.name}' has no prefilter")
+        self.indicator_name = indicator_config.name
+        self.absent_confidence = indicator_config.prefilter.absent_confidence
+        self.pattern = compile_prefilter(indicator_config.prefilter)
+
+    def rules_out(self, transcript: str) -> bool:
+        ruled_out = self.pattern.search(transcript) is None
+        _prefilter_stats.record(self.indicator_name, skipped=ruled_out)
+        return ruled_out
+
+    def absent_result(self) -> QualityIndicatorResult:
+        return QualityIndicatorResult(
+            detected=False,
+            reasoning="None of the trigger terms for this indicator appear in "
+            "the transcript.",
+            confidence=self.absent_confidence,
+        )
+
+
+def build_prefilters(
+    indicator_configs: List[QualityIndicatorConfig],
+) -> Dict[str, IndicatorPrefilter]:
+    return {
+        indicator.name: IndicatorPrefilter(indicator)
+        for indicator in indicator_configs
+        if indicator.prefilter is not None
+    }
+
+
+class PrefilterStats:
+    """Per-indicator counts of prefilter checks and the LLM calls they skipped."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked: Dict[str, int] = {}
+        self._skipped: Dict[str, int] = {}
+
+    def record(self, indicator_name: str, skipped: bool) -> None:
+        with self._lock:
+            self._checked[indicator_name] = self._checked.get(indicator_name, 0) + 1
+            if skipped:
+                self._skipped[indicator_name] = self._skipped.get(indicator_name, 0) + 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            by_indicator = {
+                name: {
+                    "checked": checked,
+                    "skipped": self._skipped.get(name, 0),
+                    "skip_rate": self._skipped.get(name, 0) / checked,
+                }
+                for name, checked in self._checked.items()
+            }
+            checked_total = sum(self._checked.values())
+            skipped_total = sum(self._skipped.values())
+        return {
+            "by_indicator": by_indicator,
+            "checked_total": checked_total,
+            "skipped_total": skipped_total,
+            "skip_rate": skipped_total / checked_total if checked_total else 0.0,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._checked.clear()
+            self._skipped.clear()
+
+
+_prefilter_stats = PrefilterStats()
+
+
+def get_prefilter_stats() -> PrefilterStats:
+    return _prefilter_stats
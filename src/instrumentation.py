@@ -0,0 +1,292 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from request_context import current_request_context
+from tracing import get_current_span, trace_span
+
+METRIC_PREFIX = "conversation_health"
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+
+# Histograms and counters exposed on /metrics, all labelled by graph node
+HISTOGRAMS: Dict[str, Tuple[str, Sequence[float]]] = {
+    "node_duration_seconds": ("Wall time of graph nodes", LATENCY_BUCKETS),
+    "llm_call_duration_seconds": (
+        "Provider response time of LLM call attempts",
+        LATENCY_BUCKETS,
+    ),
+    "llm_queue_seconds": (
+        "Time LLM call attempts waited for the rate limiter",
+        LATENCY_BUCKETS,
+    ),
+    "llm_prompt_tokens": ("Prompt tokens per LLM call attempt", TOKEN_BUCKETS),
+    "llm_completion_tokens": ("Completion tokens per LLM call attempt", TOKEN_BUCKETS),
+}
+COUNTERS: Dict[str, str] = {
+    "llm_calls_total": "LLM call attempts sent to the provider",
+    "llm_errors_total": "LLM call attempts that raised",
+    "llm_retries_total": "LLM calls retried after a retryable error",
+    "llm_cache_hits_total": "LLM calls answered from the response cache",
+    "llm_cost_total": "Estimated LLM spend from the configured token prices",
+    "node_failures_total": "Nodes replaced by their fallback after failing",
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for position, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.bucket_counts[position] += 1
+
+
+class TokenUsageHandler(BaseCallbackHandler):
+    """Sums the token usage reported by every chat model response."""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                if not isinstance(generation, ChatGeneration):
+                    continue
+                usage = getattr(generation.message, "usage_metadata", None)
+                if usage:
+                    with self._lock:
+                        self.prompt_tokens += usage.get("input_tokens", 0)
+                        self.completion_tokens += usage.get("output_tokens", 0)
+
+
+# Every LangChain run started while this is set reports to the handler, so
+# token usage is captured without changing how models are invoked
+_token_usage_handler: ContextVar[Optional[TokenUsageHandler]] = ContextVar(
+    "llm_token_usage_handler", default=None
+)
+register_configure_hook(_token_usage_handler, inheritable=True)
+
+
+class LLMCallMeasurement:
+    """Timing of one LLM call attempt, split at the rate limiter."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.dequeued_at: Optional[float] = None
+
+    def dequeued(self) -> None:
+        """Mark the end of the wait for the rate limiter."""
+        self.dequeued_at = time.perf_counter()
+
+
+class NodeInstrumentation:
+    """
+    Per-node latency, token, cost and LLM call outcome metrics. Everything is
+    aggregated process-wide for /metrics and also added to the current
+    request's timing breakdown.
+    """
+
+    def __init__(
+        self,
+        prompt_cost_per_1k_tokens: float = 0.0,
+        completion_cost_per_1k_tokens: float = 0.0,
+    ):
+        self.prompt_cost_per_1k_tokens = prompt_cost_per_1k_tokens
+        self.completion_cost_per_1k_tokens = completion_cost_per_1k_tokens
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str], float] = {}
+
+    def record_node(self, node_name: str, seconds: float) -> None:
+        self._observe("node_duration_seconds", node_name, seconds)
+        self._add_to_request(node_name, wall_seconds=seconds)
+
+    def record_node_failure(self, node_name: str) -> None:
+        self._increment("node_failures_total", node_name)
+
+    def record_cache_hit(self, node_name: str) -> None:
+        self._increment("llm_cache_hits_total", node_name)
+        self._add_to_request(node_name, cache_hits=1)
+
+    def record_retry(self, node_name: str) -> None:
+        self._increment("llm_retries_total", node_name)
+        self._add_to_request(node_name, retries=1)
+
+    def record_llm_call(
+        self,
+        node_name: str,
+        call_seconds: float,
+        queue_seconds: float,
+        prompt_tokens: int,
+        completion_tokens: int,
+        failed: bool = False,
+    ) -> None:
+        cost = (
+            prompt_tokens * self.prompt_cost_per_1k_tokens
+            + completion_tokens * self.completion_cost_per_1k_tokens
+        ) / 1000
+        self._increment("llm_calls_total", node_name)
+        if failed:
+            self._increment("llm_errors_total", node_name)
+        self._observe("llm_call_duration_seconds", node_name, call_seconds)
+        self._observe("llm_queue_seconds", node_name, queue_seconds)
+        self._observe("llm_prompt_tokens", node_name, prompt_tokens)
+        self._observe("llm_completion_tokens", node_name, completion_tokens)
+        self._increment("llm_cost_total", node_name, cost)
+        self._add_to_request(
+            node_name,
+            llm_calls=1,
+            llm_seconds=call_seconds,
+            queue_seconds=queue_seconds,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost=cost,
+        )
+
+    @contextmanager
+    def measure_llm_call(self, node_name: str) -> Iterator[LLMCallMeasurement]:
+        """
+        Record one LLM call attempt, including the tokens it reported, and
+        trace it as a child of the current LLM call span.
+        """
+        call_span = get_current_span()
+        measurement = LLMCallMeasurement()
+        handler = TokenUsageHandler()
+        token = _token_usage_handler.set(handler)
+        failed = False
+        with trace_span("llm_attempt", "llm_attempt", node=node_name) as span:
+            try:
+                yield measurement
+            except Exception:
+                failed = True
+                raise
+            finally:
+                _token_usage_handler.reset(token)
+                finished_at = time.perf_counter()
+                dequeued_at = measurement.dequeued_at or finished_at
+                queue_seconds = dequeued_at - measurement.started_at
+                self.record_llm_call(
+                    node_name,
+                    call_seconds=finished_at - dequeued_at,
+                    queue_seconds=queue_seconds,
+                    prompt_tokens=handler.prompt_tokens,
+                    completion_tokens=handler.completion_tokens,
+                    failed=failed,
+                )
+                span.set_attribute("queue_seconds", queue_seconds)
+                span.set_attribute("prompt_tokens", handler.prompt_tokens)
+                span.set_attribute("completion_tokens", handler.completion_tokens)
+                call_span.add_to_attribute("prompt_tokens", handler.prompt_tokens)
+                call_span.add_to_attribute(
+                    "completion_tokens", handler.completion_tokens
+                )
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = {
+                key: (
+                    list(histogram.buckets),
+                    list(histogram.bucket_counts),
+                    histogram.count,
+                    histogram.sum,
+                )
+                for key, histogram in self._histograms.items()
+            }
+            counters = dict(self._counters)
+
+        lines: List[str] = []
+        for metric, (description, _) in HISTOGRAMS.items():
+            name = f"{METRIC_PREFIX}_{metric}"
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+            for (series_metric, node_name), snapshot in sorted(histograms.items()):
+                if series_metric != metric:
+                    continue
+                buckets, bucket_counts, count, total = snapshot
+                label = f'node="{_escape_label(node_name)}"'
+                for upper_bound, bucket_count in zip(buckets, bucket_counts):
+                    lines.append(
+                        f'{name}_bucket{{{label},le="{upper_bound:g}"}} {bucket_count}'
+                    )
+                lines.append(f'{name}_bucket{{{label},le="+Inf"}} {count}')
+                lines.append(f"{name}_sum{{{label}}} {total:g}")
+                lines.append(f"{name}_count{{{label}}} {count}")
+
+        for metric, description in COUNTERS.items():
+            name = f"{METRIC_PREFIX}_{metric}"
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+            for (series_metric, node_name), value in sorted(counters.items()):
+                if series_metric == metric:
+                    label = f'node="{_escape_label(node_name)}"'
+                    lines.append(f"{name}{{{label}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def _observe(self, metric: str, node_name: str, value: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((metric, node_name))
+            if histogram is None:
+                histogram = Histogram(HISTOGRAMS[metric][1])
+                self._histograms[(metric, node_name)] = histogram
+            histogram.observe(value)
+
+    def _increment(self, metric: str, node_name: str, amount: float = 1) -> None:
+        with self._lock:
+            key = (metric, node_name)
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def _add_to_request(self, node_name: str, **values: float) -> None:
+        context = current_request_context.get()
+        if context is not None:
+            context.add_node_stats(node_name, **values)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def create_node_instrumentation_from_env() -> NodeInstrumentation:
+    """Build instrumentation pricing tokens from LLM_PROMPT_COST_PER_1K_TOKENS
+    and LLM_COMPLETION_COST_PER_1K_TOKENS (cost is 0 when unset)."""
+    return NodeInstrumentation(
+        prompt_cost_per_1k_tokens=float(
+            os.getenv("LLM_PROMPT_COST_PER_1K_TOKENS", "0")
+        ),
+        completion_cost_per_1k_tokens=float(
+            os.getenv("LLM_COMPLETION_COST_PER_1K_TOKENS", "0")
+        ),
+    )
+
+
+_instrumentation = NodeInstrumentation()
+
+
+def configure_instrumentation(instrumentation: NodeInstrumentation) -> None:
+    global _instrumentation
+    _instrumentation = instrumentation
+
+
+def get_instrumentation() -> NodeInstrumentation:
+    return _instrumentation
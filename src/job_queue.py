@@ -0,0 +1,341 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from enum import Enum
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(NamedTuple):
+    job_id: str
+    status: JobStatus
+    payload: Dict[str, Any]
+    attempts: int
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    webhook_url: Optional[str]
+    webhook_error: Optional[str]
+    created_at: float
+    finished_at: Optional[float]
+
+
+JOB_COLUMNS = (
+    "job_id, status, payload, attempts, result, error, webhook_url, "
+    "webhook_error, created_at, finished_at"
+)
+
+
+def _job_from_row(row: tuple) -> Job:
+    return Job(
+        job_id=row[0],
+        status=JobStatus(row[1]),
+        payload=json.loads(row[2]),
+        attempts=row[3],
+        result=json.loads(row[4]) if row[4] is not None else None,
+        error=row[5],
+        webhook_url=row[6],
+        webhook_error=row[7],
+        created_at=row[8],
+        finished_at=row[9],
+    )
+
+
+class JobQueue:
+    """
+    Durable analysis job queue in a local SQLite file, shared by the API and
+    worker processes.
+
+    A claimed job is leased to one worker for `visibility_timeout_seconds`;
+    workers extend the lease while they run it, so a job whose worker died
+    becomes visible again once the lease expires. Failed attempts are retried
+    with exponential backoff until `max_attempts`, after which the job fails.
+
+    A job with a webhook that finishes, including one failed because its
+    last lease expired, is marked as owing a notification until a worker
+    claims and delivers it with `claim_webhook`.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "jobs.sqlite3",
+        max_attempts: int = 3,
+        visibility_timeout_seconds: float = 300.0,
+        retry_delay_seconds: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.visibility_timeout_seconds = visibility_timeout_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Transactions are managed explicitly so claims can take the write
+        # lock up front; the timeout waits out other processes' writes
+        self._connection = sqlite3.connect(
+            db_path, timeout=30.0, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                webhook_url TEXT,
+                webhook_error TEXT,
+                webhook_pending INTEGER NOT NULL DEFAULT 0,
+                webhook_lease_expires_at REAL,
+                worker_id TEXT,
+                available_at REAL NOT NULL,
+                lease_expires_at REAL,
+                created_at REAL NOT NULL,
+                finished_at REAL
+            )""")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, available_at)"
+        )
+
+    def enqueue(
+        self, payload: Dict[str, Any], webhook_url: Optional[str] = None
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        now = self._clock()
+        with self._lock:
+            self._connection.execute(
+                """INSERT INTO jobs
+                (job_id, status, payload, webhook_url, available_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                (
+                    job_id,
+                    JobStatus.QUEUED.value,
+                    json.dumps(payload),
+                    webhook_url,
+                    now,
+                    now,
+                ),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {JOB_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return _job_from_row(row) if row is not None else None
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """
+        Lease the oldest job that is ready to run, or whose previous lease
+        expired, to `worker_id`. Expired jobs out of attempts are failed.
+        """
+        now = self._clock()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute(
+                    """UPDATE jobs
+                    SET status = ?, error = ?, finished_at = ?, worker_id = NULL,
+                    webhook_pending = webhook_url IS NOT NULL
+                    WHERE status = ? AND lease_expires_at <= ? AND attempts >= ?""",
+                    (
+                        JobStatus.FAILED.value,
+                        "Worker lease expired on the final attempt",
+                        now,
+                        JobStatus.RUNNING.value,
+                        now,
+                        self.max_attempts,
+                    ),
+                )
+                row = self._connection.execute(
+                    """SELECT job_id FROM jobs
+                    WHERE (status = ? AND available_at <= ?)
+                    OR (status = ? AND lease_expires_at <= ?)
+                    ORDER BY created_at LIMIT 1""",
+                    (
+                        JobStatus.QUEUED.value,
+                        now,
+                        JobStatus.RUNNING.value,
+                        now,
+                    ),
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        """UPDATE jobs
+                        SET status = ?, attempts = attempts + 1, worker_id = ?,
+                        lease_expires_at = ?
+                        WHERE job_id = ?""",
+                        (
+                            JobStatus.RUNNING.value,
+                            worker_id,
+                            now + self.visibility_timeout_seconds,
+                            row[0],
+                        ),
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return self.get(row[0]) if row is not None else None
+
+    def extend_lease(self, job_id: str, worker_id: str) -> bool:
+        """Keep a running job leased; False once another worker took it over."""
+        return self._update_leased(
+            job_id,
+            worker_id,
+            "lease_expires_at = ?",
+            (self._clock() + self.visibility_timeout_seconds,),
+        )
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        return self._update_leased(
+            job_id,
+            worker_id,
+            "status = ?, result = ?, error = NULL, finished_at = ?, "
+            "webhook_pending = webhook_url IS NOT NULL",
+            (JobStatus.SUCCEEDED.value, json.dumps(result), self._clock()),
+        )
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[JobStatus]:
+        """
+        Record a failed attempt: the job is queued again after a backoff, or
+        failed for good once it used all its attempts. Returns the new status,
+        or None when the worker no longer held the job.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        now = self._clock()
+        if job.attempts >= self.max_attempts:
+            status = JobStatus.FAILED
+            updated = self._update_leased(
+                job_id,
+                worker_id,
+                "status = ?, error = ?, finished_at = ?, "
+                "webhook_pending = webhook_url IS NOT NULL",
+                (status.value, error, now),
+            )
+        else:
+            status = JobStatus.QUEUED
+            delay = self.retry_delay_seconds * 2 ** (job.attempts - 1)
+            updated = self._update_leased(
+                job_id,
+                worker_id,
+                "status = ?, error = ?, available_at = ?, "
+                "lease_expires_at = NULL, worker_id = NULL",
+                (status.value, error, now + delay),
+            )
+        return status if updated else None
+
+    def claim_webhook(
+        self, worker_id: str, job_id: Optional[str] = None
+    ) -> Optional[Job]:
+        """
+        Lease a finished job's pending webhook (`job_id`'s, or the oldest) to
+        `worker_id` for delivery; the lease expires like a job's does, so a
+        notification whose worker died is delivered by another one.
+        """
+        now = self._clock()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    """SELECT job_id FROM jobs
+                    WHERE webhook_pending = 1 AND (job_id = ? OR ? IS NULL)
+                    AND (webhook_lease_expires_at IS NULL
+                    OR webhook_lease_expires_at <= ?)
+                    ORDER BY finished_at LIMIT 1""",
+                    (job_id, job_id, now),
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        """UPDATE jobs SET webhook_lease_expires_at = ?
+                        WHERE job_id = ?""",
+                        (now + self.visibility_timeout_seconds, row[0]),
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return self.get(row[0]) if row is not None else None
+
+    def record_webhook_error(self, job_id: str, error: Optional[str]) -> None:
+        """Record a webhook delivery's outcome; the job no longer owes one."""
+        with self._lock:
+            self._connection.execute(
+                """UPDATE jobs SET webhook_error = ?, webhook_pending = 0,
+                webhook_lease_expires_at = NULL WHERE job_id = ?""",
+                (error, job_id),
+            )
+
+    def metrics(self) -> Dict[str, Any]:
+        now = self._clock()
+        with self._lock:
+            counts = dict(
+                self._connection.execute(
+                    "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+                ).fetchall()
+            )
+            ready, delayed, oldest_ready = self._connection.execute(
+                """SELECT
+                    COALESCE(SUM(available_at <= ?), 0),
+                    COALESCE(SUM(available_at > ?), 0),
+                    MIN(CASE WHEN available_at <= ? THEN available_at END)
+                FROM jobs WHERE status = ?""",
+                (now, now, now, JobStatus.QUEUED.value),
+            ).fetchone()
+            expired_leases = self._connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND lease_expires_at <= ?",
+                (JobStatus.RUNNING.value, now),
+            ).fetchone()[0]
+            pending_webhooks = self._connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE webhook_pending = 1"
+            ).fetchone()[0]
+        return {
+            "queue_depth": ready,
+            "delayed_retries": delayed,
+            "oldest_queued_seconds": (
+                now - oldest_ready if oldest_ready is not None else 0.0
+            ),
+            "running": counts.get(JobStatus.RUNNING.value, 0),
+            "expired_leases": expired_leases,
+            "succeeded": counts.get(JobStatus.SUCCEEDED.value, 0),
+            "failed": counts.get(JobStatus.FAILED.value, 0),
+            "pending_webhooks": pending_webhooks,
+        }
+
+    def _update_leased(
+        self, job_id: str, worker_id: str, assignments: str, values: tuple
+    ) -> bool:
+        with self._lock:
+            cursor = self._connection.execute(
+                f"""UPDATE jobs SET {assignments}
+                WHERE job_id = ? AND status = ? AND worker_id = ?""",
+                (*values, job_id, JobStatus.RUNNING.value, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def create_job_queue_from_env() -> JobQueue:
+    """Job queue at JOB_QUEUE_PATH, with JOB_MAX_ATTEMPTS and
+    JOB_VISIBILITY_TIMEOUT_SECONDS overriding the defaults."""
+    return JobQueue(
+        os.getenv("JOB_QUEUE_PATH", "jobs.sqlite3"),
+        max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+        visibility_timeout_seconds=float(
+            os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "300")
+        ),
+    )
@@ -0,0 +1,299 @@
+"""
+Worker processes running queued analysis jobs.
+
+Each worker process builds its own LLM client and compiled graphs, then
+repeatedly claims a job from the SQLite job queue, runs the analysis and
+records the result, notifying the job's webhook when it finishes. LLM rate
+limits (LLM_REQUESTS_PER_MINUTE etc.) are account-wide and split evenly
+between the processes calling the provider.
+
+    python job_worker.py [--workers 4]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from analysis_runner import run_stored_analysis
+from analysis_store import AnalysisStore
+from graph_registry import GraphRegistry, get_config_reload_interval
+from job_queue import Job, JobQueue, JobStatus, create_job_queue_from_env
+from llm import (
+    configure_llm_cache,
+    configure_llm_governor,
+    configure_llm_hedging,
+    configure_llm_retry_policy,
+    get_llm,
+)
+from llm_cache import LLMResponseCache
+from llm_governor import create_llm_governor_from_env
+from llm_hedging import create_llm_hedging_policy_from_env
+from llm_retry import create_llm_retry_policy_from_env
+from logger import get_logger
+from models import SynthesisMode
+from tracing import configure_trace_exporter, create_trace_exporter_from_env
+
+POLL_INTERVAL_SECONDS = 1.0
+WEBHOOK_ATTEMPTS = 3
+WEBHOOK_TIMEOUT_SECONDS = 10.0
+
+JobAnalyzer = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+WebhookSender = Callable[[str, Dict[str, Any]], Awaitable[Optional[str]]]
+
+
+def get_webhook_allowed_hosts() -> Optional[List[str]]:
+    """Hosts webhooks may be sent to, from the comma-separated
+    JOB_WEBHOOK_ALLOWED_HOSTS; None allows any host."""
+    hosts = os.getenv("JOB_WEBHOOK_ALLOWED_HOSTS")
+    if not hosts:
+        return None
+    return [host.strip().lower() for host in hosts.split(",") if host.strip()]
+
+
+def webhook_url_error(url: str) -> Optional[str]:
+    """Why the job service will not POST to `url`, or None if it may."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return "Webhook URL must be an http or https URL"
+    allowed_hosts = get_webhook_allowed_hosts()
+    if allowed_hosts is not None and parsed.hostname.lower() not in allowed_hosts:
+        return f"Webhook host {parsed.hostname} is not allowed"
+    return None
+
+
+def webhook_payload(job: Job) -> Dict[str, Any]:
+    return {
+        "jobId": job.job_id,
+        "status": job.status.value,
+        "result": job.result,
+        "error": job.error,
+    }
+
+
+async def deliver_webhook(url: str, payload: Dict[str, Any]) -> Optional[str]:
+    """POST the payload, retrying with backoff; returns the last error, if any."""
+    error = webhook_url_error(url)
+    if error is not None:
+        # Checked again in case the allowlist changed since the job was queued
+        return error
+    async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT_SECONDS) as client:
+        for attempt in range(WEBHOOK_ATTEMPTS):
+            try:
+                response = await client.post(url, json=payload)
+                response.raise_for_status()
+                return None
+            except httpx.HTTPError as e:
+                error = repr(e)
+                if attempt < WEBHOOK_ATTEMPTS - 1:
+                    await asyncio.sleep(2**attempt)
+    return error
+
+
+async def process_job(
+    queue: JobQueue,
+    job: Job,
+    worker_id: str,
+    analyze: JobAnalyzer,
+    deliver: WebhookSender = deliver_webhook,
+) -> Optional[JobStatus]:
+    """
+    Run one claimed job, extending its lease while it runs. Returns the job's
+    new status, or None when the lease was lost to another worker.
+    """
+
+    async def keep_leased() -> None:
+        while True:
+            await asyncio.sleep(queue.visibility_timeout_seconds / 3)
+            queue.extend_lease(job.job_id, worker_id)
+
+    heartbeat = asyncio.create_task(keep_leased())
+    try:
+        result = await analyze(job.payload)
+    except Exception as e:
+        status = queue.fail(job.job_id, worker_id, repr(e))
+    else:
+        completed = queue.complete(job.job_id, worker_id, result)
+        status = JobStatus.SUCCEEDED if completed else None
+    finally:
+        heartbeat.cancel()
+
+    if status in (JobStatus.SUCCEEDED, JobStatus.FAILED) and job.webhook_url:
+        await notify_webhook(queue, worker_id, deliver, job.job_id)
+    return status
+
+
+async def notify_webhook(
+    queue: JobQueue,
+    worker_id: str,
+    deliver: WebhookSender = deliver_webhook,
+    job_id: Optional[str] = None,
+) -> bool:
+    """Deliver `job_id`'s pending webhook, or the oldest one; False if none."""
+    finished = queue.claim_webhook(worker_id, job_id)
+    if finished is None:
+        return False
+    queue.record_webhook_error(
+        finished.job_id, await deliver(finished.webhook_url, webhook_payload(finished))
+    )
+    return True
+
+
+async def run_worker(
+    queue: JobQueue,
+    analyze: JobAnalyzer,
+    worker_id: str,
+    should_stop: Callable[[], bool],
+    poll_interval_seconds: float = POLL_INTERVAL_SECONDS,
+    deliver: WebhookSender = deliver_webhook,
+) -> None:
+    """
+    Claim and run jobs one at a time until `should_stop` returns True. When
+    no job is ready, webhooks still owed for finished jobs (e.g. ones failed
+    after their worker died) are delivered.
+    """
+    while not should_stop():
+        job = queue.claim(worker_id)
+        if job is not None:
+            await process_job(queue, job, worker_id, analyze, deliver)
+        elif not await notify_webhook(queue, worker_id, deliver):
+            await asyncio.sleep(poll_interval_seconds)
+
+
+def create_job_analyzer(
+    graph_registry: GraphRegistry, analysis_store: AnalysisStore
+) -> JobAnalyzer:
+    """Analyze a queued /jobs request like /analyze does."""
+
+    async def analyze(payload: Dict[str, Any]) -> Dict[str, Any]:
+        # Payloads are stored as JSON, so the mode arrives as its plain value
+        synthesis_mode = payload.get("synthesis_mode")
+        return await run_stored_analysis(
+            graph_registry,
+            analysis_store,
+            payload["transcript"],
+            payload.get("test_case"),
+            SynthesisMode(synthesis_mode) if synthesis_mode else None,
+            payload.get("include_assessment", True),
+            trace_name="job",
+        )
+
+    return analyze
+
+
+def worker_process_main(
+    config_path: str, worker_id: str, stop_event: Any, governor_processes: int = 1
+) -> None:
+    # Stopping is coordinated by the pool; finish the current job on Ctrl+C
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logger = get_logger(f"job_worker.{worker_id}")
+    llm = get_llm()
+    configure_llm_cache(
+        LLMResponseCache(
+            os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3"),
+            enabled=os.getenv("LLM_CACHE_BYPASS") is None,
+        )
+    )
+    configure_llm_governor(create_llm_governor_from_env(governor_processes))
+    configure_llm_retry_policy(create_llm_retry_policy_from_env())
+    configure_llm_hedging(create_llm_hedging_policy_from_env())
+    configure_trace_exporter(create_trace_exporter_from_env())
+    graph_registry = GraphRegistry(config_path, llm, logger)
+    config_reload_interval = get_config_reload_interval()
+    if config_reload_interval is not None:
+        graph_registry.start_watching(config_reload_interval)
+    analysis_store = AnalysisStore(os.getenv("ANALYSIS_STORE_PATH", "analyses.sqlite3"))
+    queue = create_job_queue_from_env()
+
+    logger.info(f"Job worker {worker_id} started")
+    asyncio.run(
+        run_worker(
+            queue,
+            create_job_analyzer(graph_registry, analysis_store),
+            worker_id,
+            stop_event.is_set,
+        )
+    )
+    graph_registry.stop_watching()
+    queue.close()
+
+
+class JobWorkerPool:
+    """
+    Worker processes sharing the job queue configured from the env. The LLM
+    rate limits are split between `governor_processes` processes (the
+    workers by default; include the API process when it calls the LLM too).
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        config_path: str = "config.json",
+        governor_processes: Optional[int] = None,
+    ):
+        self.processes = processes
+        self.config_path = config_path
+        self.governor_processes = governor_processes or processes
+        # Spawned workers build their own clients instead of inheriting the
+        # parent's threads and connections
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._workers: List[multiprocessing.Process] = []
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        for number in range(self.processes):
+            worker = self._context.Process(
+                target=worker_process_main,
+                args=(
+                    self.config_path,
+                    f"{os.getpid()}-{number}",
+                    self._stop_event,
+                    self.governor_processes,
+                ),
+                name=f"job-worker-{number}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self, timeout_seconds: float = 30.0) -> None:
+        """Let workers finish their current job; terminate stragglers."""
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout_seconds
+        for worker in self._workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                # Its job becomes visible again once the lease expires
+                worker.terminate()
+        self._workers = []
+
+
+def get_job_worker_count() -> int:
+    """Worker processes the API starts, from JOB_WORKERS (0 disables them)."""
+    return int(os.getenv("JOB_WORKERS", "0"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--config", default="config.json")
+    args = parser.parse_args()
+
+    pool = JobWorkerPool(args.workers, args.config)
+    pool.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
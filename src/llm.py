@@ -1,14 +1,39 @@
 # llm.py
+import asyncio
 import os
-from typing import TypeVar, Optional, Union, Type, overload, cast
+from contextlib import nullcontext, asynccontextmanager
+from typing import (
+    TypeVar,
+    Optional,
+    Union,
+    Type,
+    overload,
+    cast,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    ContextManager,
+)
 from logging import Logger
 
 from langchain_openai import ChatOpenAI
 from langchain_core.language_models import BaseLanguageModel
 from pydantic import BaseModel
+from llm_cache import LLMResponseCache
+from llm_governor import LLMGovernor, estimate_prompt_tokens
+from llm_retry import LLMRetryPolicy
+from llm_hedging import LLMHedgingPolicy
+from instrumentation import get_instrumentation
+from request_context import get_current_node_name
+from tracing import Span, trace_span
 
 T = TypeVar("T", bound=BaseModel)
 
+_response_cache: Optional[LLMResponseCache] = None
+_governor: Optional[LLMGovernor] = None
+_retry_policy: Optional[LLMRetryPolicy] = LLMRetryPolicy()
+_hedging_policy: Optional[LLMHedgingPolicy] = None
+
 
 def get_llm() -> BaseLanguageModel:
     api_key = os.getenv("OPENAI_API_KEY")
@@ -18,15 +43,178 @@ def get_llm() -> BaseLanguageModel:
         model="o4-mini-2025-04-16",
         temperature=1,
         api_key=api_key,  # type: ignore
+        timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "60")),
+        max_retries=0,  # Retries are handled by the LLMRetryPolicy
+    )
+
+
+def configure_llm_cache(cache: Optional[LLMResponseCache]) -> None:
+    """Install (or remove, with None) the response cache used by `call_llm`."""
+    global _response_cache
+    _response_cache = cache
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    return _response_cache
+
+
+def configure_llm_governor(governor: Optional[LLMGovernor]) -> None:
+    """Install (or remove, with None) the rate limiter shared by all LLM calls."""
+    global _governor
+    _governor = governor
+
+
+def get_llm_governor() -> Optional[LLMGovernor]:
+    return _governor
+
+
+def configure_llm_retry_policy(policy: Optional[LLMRetryPolicy]) -> None:
+    """Install (or remove, with None) the timeout/retry policy for LLM calls."""
+    global _retry_policy
+    _retry_policy = policy
+
+
+def get_llm_retry_policy() -> Optional[LLMRetryPolicy]:
+    return _retry_policy
+
+
+def configure_llm_hedging(policy: Optional[LLMHedgingPolicy]) -> None:
+    """Install (or remove, with None) hedging for async LLM calls."""
+    global _hedging_policy
+    _hedging_policy = policy
+
+
+def get_llm_hedging() -> Optional[LLMHedgingPolicy]:
+    return _hedging_policy
+
+
+def _governed_call(prompt: str) -> ContextManager[None]:
+    if _governor is None:
+        return nullcontext()
+    return _governor.acquire(estimate_prompt_tokens(prompt))
+
+
+@asynccontextmanager
+async def _agoverned_call(prompt: str) -> AsyncIterator[None]:
+    if _governor is None:
+        yield
+        return
+    async with _governor.aacquire(estimate_prompt_tokens(prompt)):
+        yield
+
+
+def _start_hedge(
+    prompt: str, provider_call: Callable[[], Awaitable[T]]
+) -> Optional[Awaitable[T]]:
+    """A hedge only runs in a free governor slot; it never queues."""
+    governor = _governor
+    if governor is None:
+        return provider_call()
+    if not governor.try_acquire(estimate_prompt_tokens(prompt)):
+        return None
+    hedge = asyncio.ensure_future(provider_call())
+    # Released even when the hedge is cancelled before it starts running
+    hedge.add_done_callback(lambda _: governor.release())
+    return hedge
+
+
+def _with_call_timeout(call: Awaitable[T]) -> Awaitable[T]:
+    if _retry_policy is None:
+        return call
+    return _retry_policy.with_timeout(call)
+
+
+def _llm_call_span(
+    llm: BaseLanguageModel, model_class: Optional[Type[BaseModel]]
+) -> ContextManager[Span]:
+    """Trace span covering one call, from the cache lookup to the last retry."""
+    return trace_span(
+        "llm_call",
+        "llm",
+        node=get_current_node_name(),
+        model=getattr(llm, "model_name", None) or type(llm).__name__,
+        output=model_class.__name__ if model_class is not None else "text",
     )
 
 
+def _cache_status(cached: Optional[object], use_cache: bool) -> str:
+    if cached is not None:
+        return "hit"
+    return "miss" if use_cache and _response_cache is not None else "off"
+
+
+def _get_cached_response(
+    prompt: str,
+    llm: BaseLanguageModel,
+    logger: Logger,
+    model_class: Optional[Type[T]],
+    use_cache: bool,
+) -> Optional[Union[str, T]]:
+    if not use_cache or _response_cache is None:
+        return None
+    cached = _response_cache.get(prompt, llm, model_class)
+    if cached is not None:
+        logger.debug(f"LLM cache hit for model: {model_class}")
+        get_instrumentation().record_cache_hit(get_current_node_name())
+    return cached
+
+
+def _store_cached_response(
+    prompt: str,
+    llm: BaseLanguageModel,
+    response: Union[str, T],
+    model_class: Optional[Type[T]],
+    use_cache: bool,
+) -> None:
+    if use_cache and _response_cache is not None:
+        _response_cache.set(prompt, llm, response, model_class)
+
+
+def _invoke_llm(
+    prompt: str,
+    llm: BaseLanguageModel,
+    logger: Logger,
+    model_class: Optional[Type[T]] = None,
+) -> Union[str, T]:
+    if model_class is not None:
+        logger.debug(f"Calling LLM with structured output: {model_class}")
+        structured = llm.with_structured_output(model_class)
+        result = structured.invoke(prompt)
+        logger.debug(f"Structured LLM response: {result}")
+        return cast(T, result)
+    else:
+        logger.debug("Calling LLM for raw string output.")
+        response = llm.invoke(prompt)
+        logger.debug(f"Raw LLM response: {response.content}")
+        return response.content
+
+
+async def _ainvoke_llm(
+    prompt: str,
+    llm: BaseLanguageModel,
+    logger: Logger,
+    model_class: Optional[Type[T]] = None,
+) -> Union[str, T]:
+    if model_class is not None:
+        logger.debug(f"Calling LLM with structured output: {model_class}")
+        structured = llm.with_structured_output(model_class)
+        result = await structured.ainvoke(prompt)
+        logger.debug(f"Structured LLM response: {result}")
+        return cast(T, result)
+    else:
+        logger.debug("Calling LLM for raw string output.")
+        response = await llm.ainvoke(prompt)
+        logger.debug(f"Raw LLM response: {response.content}")
+        return response.content
+
+
 @overload
 def call_llm(
     prompt: str,
     llm: BaseLanguageModel,
     logger: Logger,
     model_class: None = None,
+    use_cache: bool = True,
 ) -> str: ...
 
 
@@ -36,6 +224,7 @@ def call_llm(
     llm: BaseLanguageModel,
     logger: Logger,
     model_class: Type[T],
+    use_cache: bool = True,
 ) -> T: ...
 
 
@@ -44,28 +233,50 @@ def call_llm(
     llm: BaseLanguageModel,
     logger: Logger,
     model_class: Optional[Type[T]] = None,
+    use_cache: bool = True,
 ) -> Union[str, T]:
     """
     Call LLM with optional structured output.
 
     - If `model_class` is None, returns raw string.
     - If `model_class` is provided, returns an instance of that BaseModel.
+    - If a response cache is configured and `use_cache` is True, identical
+      requests are answered from the cache.
+    - Retryable errors are retried in place according to the configured
+      retry policy.
     """
-    try:
-        if model_class is not None:
-            logger.debug(f"Calling LLM with structured output: {model_class}")
-            structured = llm.with_structured_output(model_class)
-            result = structured.invoke(prompt)
-            logger.debug(f"Structured LLM response: {result}")
-            return cast(T, result)
-        else:
-            logger.debug("Calling LLM for raw string output.")
-            response = llm.invoke(prompt)
-            logger.debug(f"Raw LLM response: {response.content}")
-            return response.content
-    except Exception as e:
-        logger.error(f"LLM call failed: {e}, prompt: {prompt}, model: {model_class}")
-        raise
+    with _llm_call_span(llm, model_class) as span:
+        cached = _get_cached_response(prompt, llm, logger, model_class, use_cache)
+        span.set_attribute("cache", _cache_status(cached, use_cache))
+        if cached is not None:
+            return cached
+
+        attempts = [0]
+
+        def attempt() -> Union[str, T]:
+            attempts[0] += 1
+            with get_instrumentation().measure_llm_call(
+                get_current_node_name()
+            ) as measurement:
+                with _governed_call(prompt):
+                    measurement.dequeued()
+                    return _invoke_llm(prompt, llm, logger, model_class)
+
+        try:
+            if _retry_policy is None:
+                result = attempt()
+            else:
+                result = _retry_policy.call(attempt, logger)
+        except Exception as e:
+            logger.error(
+                f"LLM call failed: {e}, prompt: {prompt}, model: {model_class}"
+            )
+            raise
+        finally:
+            span.set_attribute("retries", max(0, attempts[0] - 1))
+
+        _store_cached_response(prompt, llm, result, model_class, use_cache)
+        return result
 
 
 def call_llm_structured(
@@ -78,3 +289,89 @@ def call_llm_structured(
     Convenience wrapper: always structured.
     """
     return call_llm(prompt, llm, logger, model_class)
+
+
+@overload
+async def acall_llm(
+    prompt: str,
+    llm: BaseLanguageModel,
+    logger: Logger,
+    model_class: None = None,
+    use_cache: bool = True,
+) -> str: ...
+
+
+@overload
+async def acall_llm(
+    prompt: str,
+    llm: BaseLanguageModel,
+    logger: Logger,
+    model_class: Type[T],
+    use_cache: bool = True,
+) -> T: ...
+
+
+async def acall_llm(
+    prompt: str,
+    llm: BaseLanguageModel,
+    logger: Logger,
+    model_class: Optional[Type[T]] = None,
+    use_cache: bool = True,
+) -> Union[str, T]:
+    """
+    Async variant of `call_llm` using `ainvoke`, so the event loop stays free
+    while the provider responds. When a hedging policy is configured, slow
+    calls are hedged with a duplicate request.
+    """
+    with _llm_call_span(llm, model_class) as span:
+        cached = _get_cached_response(prompt, llm, logger, model_class, use_cache)
+        span.set_attribute("cache", _cache_status(cached, use_cache))
+        if cached is not None:
+            return cached
+
+        attempts = [0]
+
+        def provider_call() -> Awaitable[Union[str, T]]:
+            # Only the provider call is timed, not the governor queue
+            return _with_call_timeout(_ainvoke_llm(prompt, llm, logger, model_class))
+
+        async def attempt() -> Union[str, T]:
+            attempts[0] += 1
+            with get_instrumentation().measure_llm_call(
+                get_current_node_name()
+            ) as measurement:
+                async with _agoverned_call(prompt):
+                    measurement.dequeued()
+                    if _hedging_policy is None:
+                        return await provider_call()
+                    return await _hedging_policy.run(
+                        provider_call, lambda: _start_hedge(prompt, provider_call)
+                    )
+
+        try:
+            if _retry_policy is None:
+                result = await attempt()
+            else:
+                result = await _retry_policy.acall(attempt, logger)
+        except Exception as e:
+            logger.error(
+                f"LLM call failed: {e}, prompt: {prompt}, model: {model_class}"
+            )
+            raise
+        finally:
+            span.set_attribute("retries", max(0, attempts[0] - 1))
+
+        _store_cached_response(prompt, llm, result, model_class, use_cache)
+        return result
+
+
+async def acall_llm_structured(
+    prompt: str,
+    model_class: Type[T],
+    llm: BaseLanguageModel,
+    logger: Logger,
+) -> T:
+    """
+    Async convenience wrapper: always structured.
+    """
+    return await acall_llm(prompt, llm, logger, model_class)
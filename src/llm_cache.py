@@ -0,0 +1,170 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional, Type, Dict, Any
+
+from langchain_core.language_models import BaseLanguageModel
+from pydantic import BaseModel
+
+
+def get_model_identity(llm: BaseLanguageModel) -> str:
+    """Provider class plus the model settings that change its output."""
+    identity = {
+        "provider": type(llm).__name__,
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+    }
+    return json.dumps(identity, sort_keys=True, default=str)
+
+
+def build_cache_key(
+    prompt: str,
+    llm: BaseLanguageModel,
+    model_class: Optional[Type[BaseModel]] = None,
+) -> str:
+    schema = model_class.model_json_schema() if model_class is not None else None
+    payload = json.dumps(
+        {
+            "prompt": prompt,
+            "schema": schema,
+            "model": get_model_identity(llm),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Content-addressed LLM response cache backed by a local SQLite file.
+
+    Entries are keyed on the prompt, the structured output schema and the
+    model identity. Expired entries are dropped on read, and the least
+    recently used entries are evicted once `max_entries` is exceeded.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "llm_cache.sqlite3",
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        enabled: bool = True,
+    ):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("""CREATE TABLE IF NOT EXISTS llm_responses (
+                cache_key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )""")
+        self._connection.commit()
+
+    def get(
+        self,
+        prompt: str,
+        llm: BaseLanguageModel,
+        model_class: Optional[Type[BaseModel]] = None,
+    ) -> Optional[Any]:
+        if not self.enabled:
+            return None
+
+        cache_key = build_cache_key(prompt, llm, model_class)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response, created_at FROM llm_responses WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+
+            if row is not None and self._is_expired(row[1], now):
+                self._connection.execute(
+                    "DELETE FROM llm_responses WHERE cache_key = ?", (cache_key,)
+                )
+                self._connection.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._connection.execute(
+                "UPDATE llm_responses SET last_accessed = ? WHERE cache_key = ?",
+                (now, cache_key),
+            )
+            self._connection.commit()
+            self.hits += 1
+
+        if model_class is not None:
+            return model_class.model_validate_json(row[0])
+        return row[0]
+
+    def set(
+        self,
+        prompt: str,
+        llm: BaseLanguageModel,
+        response: Any,
+        model_class: Optional[Type[BaseModel]] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+
+        cache_key = build_cache_key(prompt, llm, model_class)
+        serialized = (
+            response.model_dump_json() if model_class is not None else str(response)
+        )
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                """INSERT OR REPLACE INTO llm_responses
+                (cache_key, response, created_at, last_accessed) VALUES (?, ?, ?, ?)""",
+                (cache_key, serialized, now, now),
+            )
+            self._evict(now)
+            self._connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_responses")
+            self._connection.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._connection.execute(
+                "SELECT COUNT(*) FROM llm_responses"
+            ).fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "enabled": self.enabled,
+        }
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _evict(self, now: float) -> None:
+        if self.ttl_seconds is not None:
+            self._connection.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?",
+                (now - self.ttl_seconds,),
+            )
+        self._connection.execute(
+            """DELETE FROM llm_responses WHERE cache_key IN (
+                SELECT cache_key FROM llm_responses
+                ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+            )""",
+            (self.max_entries,),
+        )
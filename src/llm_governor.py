@@ -0,0 +1,286 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional
+
+from request_context import get_current_request_id
+from utils import percentile
+
+# Upper bound on how long a waiter sleeps before re-checking the buckets
+MAX_WAIT_INTERVAL_SECONDS = 1.0
+
+
+def estimate_prompt_tokens(prompt: str) -> int:
+    """Cheap prompt token estimate (~4 characters per token)."""
+    return max(1, len(prompt) // 4)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated_at = clock()
+
+    def refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_second)
+        self._updated_at = now
+
+    def seconds_until_available(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        deficit = amount - self.tokens
+        return 0.0 if deficit <= 0 else deficit / self.rate_per_second
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+
+class _Waiter:
+    def __init__(self, request_id: str, estimated_tokens: int, enqueued_at: float):
+        self.request_id = request_id
+        self.estimated_tokens = estimated_tokens
+        self.enqueued_at = enqueued_at
+        self.granted = False
+        self.wake: Callable[[], None] = lambda: None
+
+
+class LLMGovernor:
+    """
+    Process-wide admission control for LLM calls.
+
+    Combines a requests-per-minute bucket, an estimated prompt
+    tokens-per-minute bucket and a cap on in-flight calls. Waiting calls are
+    queued per request id and admitted round-robin across requests, so one
+    large analysis cannot starve the others. Works from threads and from
+    asyncio tasks.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+        wait_sample_size: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_in_flight = max_in_flight
+        self._clock = clock
+        self._request_bucket = (
+            TokenBucket(requests_per_minute, clock=clock)
+            if requests_per_minute
+            else None
+        )
+        self._token_bucket = (
+            TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute else None
+        )
+        self._lock = threading.Lock()
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._in_flight = 0
+        self._granted_total = 0
+        self._max_queue_depth = 0
+        self._wait_times: Deque[float] = deque(maxlen=wait_sample_size)
+
+    @contextmanager
+    def acquire(self, estimated_tokens: int = 1) -> Iterator[None]:
+        waiter = _Waiter(get_current_request_id(), estimated_tokens, self._clock())
+        event = threading.Event()
+        waiter.wake = event.set
+        self._enqueue(waiter)
+        try:
+            while True:
+                wait_seconds = self._admission_wait(waiter)
+                if wait_seconds is None:
+                    break
+                event.wait(wait_seconds)
+                event.clear()
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aacquire(self, estimated_tokens: int = 1) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = _Waiter(get_current_request_id(), estimated_tokens, self._clock())
+        waiter.wake = lambda: loop.call_soon_threadsafe(event.set)
+        self._enqueue(waiter)
+        try:
+            while True:
+                wait_seconds = self._admission_wait(waiter)
+                if wait_seconds is None:
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=wait_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def try_acquire(self, estimated_tokens: int = 1) -> bool:
+        """
+        Admit a call only if it can start right now without overtaking queued
+        waiters. The caller must `release` the slot when the call finishes.
+        """
+        with self._lock:
+            if self._queues:
+                return False
+            for bucket in (self._request_bucket, self._token_bucket):
+                if bucket is not None:
+                    bucket.refill()
+            waiter = _Waiter(get_current_request_id(), estimated_tokens, self._clock())
+            if self._seconds_until_capacity(waiter) != 0:
+                return False
+            self._grant(waiter)
+            return True
+
+    def release(self) -> None:
+        self._release()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            wait_times = sorted(self._wait_times)
+            queue_depth = sum(len(queue) for queue in self._queues.values())
+            return {
+                "queue_depth": queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "queued_requests": len(self._queues),
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "granted_total": self._granted_total,
+                "wait_seconds": {
+                    "count": len(wait_times),
+                    "mean": (sum(wait_times) / len(wait_times) if wait_times else 0.0),
+                    "p50": percentile(wait_times, 0.5),
+                    "p95": percentile(wait_times, 0.95),
+                    "max": wait_times[-1] if wait_times else 0.0,
+                },
+            }
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        with self._lock:
+            self._queues.setdefault(waiter.request_id, deque()).append(waiter)
+            queue_depth = sum(len(queue) for queue in self._queues.values())
+            self._max_queue_depth = max(self._max_queue_depth, queue_depth)
+
+    def _admission_wait(self, waiter: _Waiter) -> Optional[float]:
+        """None once the waiter is admitted, else how long to sleep."""
+        with self._lock:
+            if waiter.granted:
+                return None
+            wait_seconds = self._dispatch()
+            if waiter.granted:
+                return None
+            if wait_seconds is None:
+                return MAX_WAIT_INTERVAL_SECONDS
+            return min(wait_seconds, MAX_WAIT_INTERVAL_SECONDS)
+
+    def _dispatch(self) -> Optional[float]:
+        """Admit queued waiters in round-robin order while capacity allows."""
+        for bucket in (self._request_bucket, self._token_bucket):
+            if bucket is not None:
+                bucket.refill()
+
+        while self._queues:
+            request_id, queue = next(iter(self._queues.items()))
+            waiter = queue[0]
+            wait_seconds = self._seconds_until_capacity(waiter)
+            if wait_seconds is None or wait_seconds > 0:
+                return wait_seconds
+
+            queue.popleft()
+            if queue:
+                self._queues.move_to_end(request_id)
+            else:
+                del self._queues[request_id]
+            self._grant(waiter)
+        return None
+
+    def _seconds_until_capacity(self, waiter: _Waiter) -> Optional[float]:
+        if self.max_in_flight is not None and self._in_flight >= self.max_in_flight:
+            return None  # Wait for a release
+        wait_seconds = 0.0
+        if self._request_bucket is not None:
+            wait_seconds = max(
+                wait_seconds, self._request_bucket.seconds_until_available(1)
+            )
+        if self._token_bucket is not None:
+            wait_seconds = max(
+                wait_seconds,
+                self._token_bucket.seconds_until_available(waiter.estimated_tokens),
+            )
+        return wait_seconds
+
+    def _grant(self, waiter: _Waiter) -> None:
+        if self._request_bucket is not None:
+            self._request_bucket.consume(1)
+        if self._token_bucket is not None:
+            self._token_bucket.consume(waiter.estimated_tokens)
+        self._in_flight += 1
+        self._granted_total += 1
+        self._wait_times.append(self._clock() - waiter.enqueued_at)
+        waiter.granted = True
+        waiter.wake()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        with self._lock:
+            if waiter.granted:
+                self._in_flight -= 1
+            else:
+                queue = self._queues.get(waiter.request_id)
+                if queue is not None and waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        del self._queues[waiter.request_id]
+            self._dispatch()
+
+
+def create_llm_governor_from_env(processes: int = 1) -> Optional[LLMGovernor]:
+    """Build a governor from LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE and
+    LLM_MAX_IN_FLIGHT; returns None when none of them is set.
+
+    The limits are account-wide: with `processes` processes calling the same
+    provider, each gets an even share so together they stay within them."""
+    requests_per_minute = os.getenv("LLM_REQUESTS_PER_MINUTE")
+    tokens_per_minute = os.getenv("LLM_TOKENS_PER_MINUTE")
+    max_in_flight = os.getenv("LLM_MAX_IN_FLIGHT")
+    if not (requests_per_minute or tokens_per_minute or max_in_flight):
+        return None
+    return LLMGovernor(
+        requests_per_minute=(
+            float(requests_per_minute) / processes if requests_per_minute else None
+        ),
+        tokens_per_minute=(
+            float(tokens_per_minute) / processes if tokens_per_minute else None
+        ),
+        max_in_flight=(
+            max(1, int(max_in_flight) // processes) if max_in_flight else None
+        ),
+    )
@@ -0,0 +1,161 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from request_context import get_current_node_name
+from utils import percentile
+
+R = TypeVar("R")
+
+
+class LLMHedgingPolicy:
+    """
+    Hedged async LLM calls.
+
+    Latencies are tracked per graph node. Once a node has `min_samples`
+    observations, a call that is still running after the node's
+    `latency_percentile` latency fires one duplicate; the first successful
+    response wins and the other call is cancelled. Duplicates are capped at
+    `max_extra_call_ratio` of all calls made through the policy.
+
+    The policy should wrap the provider call only, after any rate limiter
+    admitted it, so latencies and hedge delays exclude queueing time.
+    """
+
+    def __init__(
+        self,
+        latency_percentile: float = 0.95,
+        max_extra_call_ratio: float = 0.1,
+        min_samples: int = 20,
+        window_size: int = 500,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.latency_percentile = latency_percentile
+        self.max_extra_call_ratio = max_extra_call_ratio
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._budget_denied = 0
+        self._capacity_denied = 0
+
+    def hedge_delay(self, node_name: str) -> Optional[float]:
+        """How long to wait before hedging a call from `node_name`."""
+        with self._lock:
+            samples = self._latencies.get(node_name)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            return percentile(sorted(samples), self.latency_percentile)
+
+    def record_latency(self, node_name: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._latencies.setdefault(
+                node_name, deque(maxlen=self.window_size)
+            )
+            samples.append(seconds)
+
+    async def run(
+        self,
+        operation: Callable[[], Awaitable[R]],
+        start_hedge: Optional[Callable[[], Optional[Awaitable[R]]]] = None,
+    ) -> R:
+        """
+        Run `operation`, hedging it once it is slow. `start_hedge` starts the
+        duplicate call (defaults to `operation`) and may return None to skip
+        the hedge, e.g. when the rate limiter has no spare capacity.
+        """
+        node_name = get_current_node_name()
+        delay = self.hedge_delay(node_name)
+        with self._lock:
+            self._calls += 1
+
+        started = self._clock()
+        if delay is None:
+            result = await operation()
+            self.record_latency(node_name, self._clock() - started)
+            return result
+
+        primary = asyncio.ensure_future(operation())
+        attempts = {primary: started}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if not done:
+                hedge = self._start_hedge(start_hedge or operation)
+                if hedge is not None:
+                    attempts[asyncio.ensure_future(hedge)] = self._clock()
+
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self.record_latency(node_name, self._clock() - attempts[task])
+                        if task is not primary:
+                            with self._lock:
+                                self._hedge_wins += 1
+                        return task.result()
+            # Every attempt failed; surface the primary call's error
+            return primary.result()
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            thresholds = {
+                node_name: percentile(sorted(samples), self.latency_percentile)
+                for node_name, samples in self._latencies.items()
+                if len(samples) >= self.min_samples
+            }
+            return {
+                "calls": self._calls,
+                "hedges": self._hedges,
+                "hedge_wins": self._hedge_wins,
+                "budget_denied": self._budget_denied,
+                "capacity_denied": self._capacity_denied,
+                "extra_call_ratio": self._hedges / self._calls if self._calls else 0.0,
+                "hedge_delay_seconds": thresholds,
+            }
+
+    def _start_hedge(
+        self, start_hedge: Callable[[], Optional[Awaitable[R]]]
+    ) -> Optional[Awaitable[R]]:
+        if not self._reserve_hedge():
+            return None
+        hedge = start_hedge()
+        if hedge is None:
+            with self._lock:
+                self._hedges -= 1
+                self._capacity_denied += 1
+        return hedge
+
+    def _reserve_hedge(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self.max_extra_call_ratio * self._calls:
+                self._budget_denied += 1
+                return False
+            self._hedges += 1
+            return True
+
+
+def create_llm_hedging_policy_from_env() -> Optional[LLMHedgingPolicy]:
+    """Build a hedging policy from LLM_HEDGE_PERCENTILE and
+    LLM_HEDGE_MAX_EXTRA_RATIO; returns None unless LLM_HEDGE_PERCENTILE is set."""
+    latency_percentile = os.getenv("LLM_HEDGE_PERCENTILE")
+    if not latency_percentile:
+        return None
+    max_extra_ratio = os.getenv("LLM_HEDGE_MAX_EXTRA_RATIO")
+    return LLMHedgingPolicy(
+        latency_percentile=float(latency_percentile),
+        max_extra_call_ratio=float(max_extra_ratio) if max_extra_ratio else 0.1,
+    )
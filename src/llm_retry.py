@@ -0,0 +1,199 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from logging import Logger
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from openai import APIConnectionError, InternalServerError, RateLimitError
+
+from request_context import current_request_context, get_current_node_name
+from instrumentation import get_instrumentation
+
+R = TypeVar("R")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Timeouts, connection failures, rate limits and 5xx responses."""
+    if isinstance(
+        error,
+        (
+            TimeoutError,
+            ConnectionError,
+            APIConnectionError,
+            RateLimitError,
+            InternalServerError,
+        ),
+    ):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+class LLMRetryPolicy:
+    """
+    Per-call timeout plus exponential backoff with full jitter.
+
+    Retries happen inside the failing call, so only the node that hit the
+    error repeats its work. The time of failed attempts and of backoff is
+    charged to the surrounding `llm_request_scope`, and a call gives up once
+    the request has spent `max_total_retry_seconds` on them. Retries and
+    exhausted calls are counted per graph node.
+
+    `timeout_seconds` bounds the provider call of an async attempt; llm.py
+    applies it after the governor admits the call, so waiting for a rate
+    limiter slot never times out.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        timeout_seconds: Optional[float] = 60.0,
+        initial_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 20.0,
+        max_total_retry_seconds: Optional[float] = 60.0,
+        is_retryable: Callable[[BaseException], bool] = is_retryable_error,
+        sleep: Callable[[float], None] = time.sleep,
+        async_sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        jitter: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.timeout_seconds = timeout_seconds
+        self.initial_backoff_seconds = initial_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_total_retry_seconds = max_total_retry_seconds
+        self.is_retryable = is_retryable
+        self._sleep = sleep
+        self._async_sleep = async_sleep
+        self._jitter = jitter
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._retries_by_node: Dict[str, int] = {}
+        self._exhausted_by_node: Dict[str, int] = {}
+
+    def backoff_seconds(self, attempt: int) -> float:
+        """Delay before retrying after failed attempt number `attempt`."""
+        ceiling = min(
+            self.max_backoff_seconds,
+            self.initial_backoff_seconds * 2 ** (attempt - 1),
+        )
+        return ceiling * self._jitter()
+
+    def call(self, operation: Callable[[], R], logger: Logger) -> R:
+        """
+        Run `operation` with retries. Sync calls rely on the client timeout
+        set in `get_llm`.
+        """
+        spent = [0.0]
+        attempt = 1
+        while True:
+            started_at = self._clock()
+            try:
+                return operation()
+            except Exception as error:
+                delay = self._retry_delay(
+                    error, attempt, spent, logger, self._clock() - started_at
+                )
+                if delay is None:
+                    raise
+            self._sleep(delay)
+            attempt += 1
+
+    async def acall(self, operation: Callable[[], Awaitable[R]], logger: Logger) -> R:
+        spent = [0.0]
+        attempt = 1
+        while True:
+            started_at = self._clock()
+            try:
+                return await operation()
+            except Exception as error:
+                delay = self._retry_delay(
+                    error, attempt, spent, logger, self._clock() - started_at
+                )
+                if delay is None:
+                    raise
+            await self._async_sleep(delay)
+            attempt += 1
+
+    def with_timeout(self, call: Awaitable[R]) -> Awaitable[R]:
+        """Bound one provider call by `timeout_seconds`."""
+        if self.timeout_seconds is None:
+            return call
+        return asyncio.wait_for(call, self.timeout_seconds)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "retries_by_node": dict(self._retries_by_node),
+                "exhausted_by_node": dict(self._exhausted_by_node),
+                "retries_total": sum(self._retries_by_node.values()),
+            }
+
+    def _retry_delay(
+        self,
+        error: Exception,
+        attempt: int,
+        spent: list,
+        logger: Logger,
+        attempt_seconds: float = 0.0,
+    ) -> Optional[float]:
+        """Backoff before the next attempt, or None to give up."""
+        if not self.is_retryable(error):
+            return None
+
+        node_name = get_current_node_name()
+        context = current_request_context.get()
+        delay = self.backoff_seconds(attempt)
+        # The failed attempt counts against the budget whether or not it is
+        # retried, so later calls of the request see the time it burnt
+        if context is not None:
+            context.add_retry_seconds(attempt_seconds)
+        spent[0] += attempt_seconds
+        retry_seconds = context.retry_seconds if context is not None else spent[0]
+        over_budget = (
+            self.max_total_retry_seconds is not None
+            and retry_seconds + delay > self.max_total_retry_seconds
+        )
+        if attempt >= self.max_attempts or over_budget:
+            with self._lock:
+                self._exhausted_by_node[node_name] = (
+                    self._exhausted_by_node.get(node_name, 0) + 1
+                )
+            logger.error(
+                f"Giving up on LLM call in node '{node_name}' after "
+                f"{attempt} attempt(s): {error!r}"
+            )
+            return None
+
+        with self._lock:
+            self._retries_by_node[node_name] = (
+                self._retries_by_node.get(node_name, 0) + 1
+            )
+        if context is not None:
+            context.record_retry(node_name, delay)
+        get_instrumentation().record_retry(node_name)
+        spent[0] += delay
+        logger.warning(
+            f"Retrying LLM call in node '{node_name}' in {delay:.2f}s "
+            f"(attempt {attempt + 1}/{self.max_attempts}): {error!r}"
+        )
+        return delay
+
+
+def create_llm_retry_policy_from_env() -> LLMRetryPolicy:
+    """Build a retry policy from LLM_MAX_ATTEMPTS, LLM_TIMEOUT_SECONDS and
+    LLM_MAX_RETRY_SECONDS, falling back to the policy defaults."""
+    max_attempts = os.getenv("LLM_MAX_ATTEMPTS")
+    timeout_seconds = os.getenv("LLM_TIMEOUT_SECONDS")
+    max_retry_seconds = os.getenv("LLM_MAX_RETRY_SECONDS")
+    policy = LLMRetryPolicy()
+    if max_attempts:
+        policy.max_attempts = max(1, int(max_attempts))
+    if timeout_seconds:
+        policy.timeout_seconds = float(timeout_seconds)
+    if max_retry_seconds:
+        policy.max_total_retry_seconds = float(max_retry_seconds)
+    return policy
@@ -1,6 +1,6 @@
-from typing import Dict, List, Any, Annotated
+from typing import Dict, List, Any, Annotated, Optional, Union
 from typing_extensions import TypedDict
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from enum import Enum
 from langgraph.graph.message import add_messages
 from utils import merge_dicts
@@ -31,6 +31,21 @@ class ConcernAddressalLevel(str, Enum):
     FULLY_ADDRESSED = "fully_addressed"
 
 
+class SynthesisCachePolicy(str, Enum):
+    """What identifies a reusable written assessment"""
+
+    DISABLED = "disabled"
+    OUTCOMES = "outcomes"
+    OUTCOMES_AND_REASONING = "outcomes_and_reasoning"
+
+
+class SynthesisMode(str, Enum):
+    """How the overall assessment text is written"""
+
+    LLM = "llm"
+    TEMPLATE = "template"
+
+
 class AssessmentConfidence(str, Enum):
     """Confidence level in an assessment result"""
 
@@ -41,6 +56,29 @@ class AssessmentConfidence(str, Enum):
     VERY_LOW = "very_low"
 
 
+class IndicatorPrefilterConfig(BaseModel):
+    """Lexical check that rules an indicator out without an LLM call"""
+
+    keywords: List[str] = Field(
+        default_factory=list,
+        description="Words or phrases matched case-insensitively as whole words",
+    )
+    patterns: List[str] = Field(
+        default_factory=list,
+        description="Regular expressions matched case-insensitively",
+    )
+    absent_confidence: AssessmentConfidence = Field(
+        default=AssessmentConfidence.MODERATE,
+        description="Confidence of the not-detected result when nothing matches",
+    )
+
+    @model_validator(mode="after")
+    def validate_terms(self):
+        if not self.keywords and not self.patterns:
+            raise ValueError("A prefilter needs at least one keyword or pattern")
+        return self
+
+
 class QualityIndicatorConfig(BaseModel):
     """Configuration for detecting conversation quality patterns"""
 
@@ -51,6 +89,23 @@ class QualityIndicatorConfig(BaseModel):
     minimum_confidence: AssessmentConfidence = Field(
         description="Minimum confidence required to apply this indicator"
     )
+    derivation: Optional[str] = Field(
+        default=None,
+        description="Registered local function that derives this indicator from "
+        "earlier analysis results instead of a dedicated LLM call",
+    )
+    uses_transcript_metrics: bool = Field(
+        default=False,
+        description="Include measured transcript metrics in the detection prompt",
+    )
+    prefilter: Optional[IndicatorPrefilterConfig] = Field(
+        default=None,
+        description="Skip the LLM call when none of these terms appear",
+    )
+    recommendation: Optional[str] = Field(
+        default=None,
+        description="Assessment snippet used by template synthesis when detected",
+    )
 
 
 class CriteriaResponseOption(BaseModel):
@@ -60,6 +115,10 @@ class CriteriaResponseOption(BaseModel):
         description="Score multiplier (-1.0-1.0) for this response", ge=-1, le=1
     )
     description: str = Field(description="What this response option represents")
+    recommendation: Optional[str] = Field(
+        default=None,
+        description="Assessment snippet used by template synthesis when selected",
+    )
 
 
 class EvaluationCriteriaConfig(BaseModel):
@@ -83,6 +142,10 @@ class EvaluationCriteriaConfig(BaseModel):
     minimum_confidence: AssessmentConfidence = Field(
         description="Minimum confidence required for scoring"
     )
+    uses_transcript_metrics: bool = Field(
+        default=False,
+        description="Include measured transcript metrics in the analysis prompt",
+    )
 
     @field_validator("response_options")
     def validate_response_options(cls, v):
@@ -115,6 +178,9 @@ class ConversationConcern(BaseModel):
         description="How well this concern was addressed"
     )
     reasoning: str = Field(description="Explanation for the addressal level assessment")
+    times_raised: int = Field(
+        default=1, ge=1, description="How many times this concern was raised"
+    )
 
 
 class IdentifiedConcerns(BaseModel):
@@ -125,6 +191,28 @@ class IdentifiedConcerns(BaseModel):
     )
 
 
+class TranscriptIndex(BaseModel):
+    """Per-turn index of a transcript, stored column-wise (one entry per turn)"""
+
+    speakers: List[str] = Field(default_factory=list, description="Turn speakers")
+    starts: List[int] = Field(
+        default_factory=list, description="Character offset where each turn starts"
+    )
+    ends: List[int] = Field(
+        default_factory=list, description="Character offset where each turn ends"
+    )
+    word_counts: List[int] = Field(
+        default_factory=list, description="Number of words in each turn"
+    )
+    is_question: List[bool] = Field(
+        default_factory=list, description="Whether each turn asks a question"
+    )
+
+    @property
+    def turn_count(self) -> int:
+        return len(self.speakers)
+
+
 class ConcernHandlingAssessment(BaseModel):
     """Assessment of how well concerns were handled overall"""
 
@@ -150,6 +238,74 @@ class QualityIndicatorResult(BaseModel):
     confidence: AssessmentConfidence = Field(description="Confidence in this detection")
 
 
+class IndicatorTriageResult(BaseModel):
+    """Quick screen of which quality indicators are plausibly present"""
+
+    screened_indicators: List[str] = Field(
+        description="Indicators the triage call was asked about"
+    )
+    plausible_indicators: List[str] = Field(
+        description="Screened indicators that may be present and need detection"
+    )
+    reasoning: str = Field(description="Explanation for the triage decision")
+    confidence: AssessmentConfidence = Field(
+        description="Confidence that the indicators left out are absent"
+    )
+
+    def absent_result(self) -> QualityIndicatorResult:
+        return QualityIndicatorResult(
+            detected=False,
+            reasoning=f"Ruled out by triage: {self.reasoning}",
+            confidence=self.confidence,
+        )
+
+
+class FailedAnalysisResult(BaseModel):
+    """Placeholder for a criteria or indicator whose analysis node failed"""
+
+    error: str = Field(description="Error that made the analysis fail")
+    confidence: AssessmentConfidence = Field(
+        default=AssessmentConfidence.VERY_LOW,
+        description="Failed analyses never meet a confidence threshold",
+    )
+
+    @property
+    def reasoning(self) -> str:
+        return f"Analysis failed: {self.error}"
+
+
+class AnalysisExecutionConfig(BaseModel):
+    """Switches controlling how the analysis graph issues LLM calls"""
+
+    fuse_quality_indicators: bool = Field(
+        default=False,
+        description="Detect all quality indicators in one structured LLM call",
+    )
+    fuse_evaluation_criteria: bool = Field(
+        default=False,
+        description="Evaluate all config-based criteria in one structured LLM call",
+    )
+    single_pass_concern_analysis: bool = Field(
+        default=False,
+        description="Identify concerns and rate their handling in one LLM call",
+    )
+    triage_quality_indicators: bool = Field(
+        default=False,
+        description="Screen indicators with one triage call and run detection "
+        "only for those plausibly present",
+    )
+    synthesis_cache: SynthesisCachePolicy = Field(
+        default=SynthesisCachePolicy.DISABLED,
+        description="Reuse written assessments for identical categorical outcomes, "
+        "optionally requiring identical reasoning as well",
+    )
+    synthesis_mode: SynthesisMode = Field(
+        default=SynthesisMode.LLM,
+        description="Default way of writing the overall assessment; requests may "
+        "override it",
+    )
+
+
 class ConversationHealthConfig(BaseModel):
     """Complete configuration for conversation health assessment"""
 
@@ -165,6 +321,10 @@ class ConversationHealthConfig(BaseModel):
     confidence_level_weights: Dict[AssessmentConfidence, int] = Field(
         description="Numeric weights for confidence levels"
     )
+    execution: AnalysisExecutionConfig = Field(
+        default_factory=AnalysisExecutionConfig,
+        description="Execution strategy for the analysis graph",
+    )
 
     @field_validator("health_score_ranges")
     def validate_health_score_ranges(cls, v):
@@ -198,10 +358,12 @@ class QualityIndicatorDetectionResult(TypedDict):
 
 
 class ScoringUncertainty(TypedDict):
-    """Information about what was excluded due to low confidence"""
+    """Information about what was excluded due to low confidence or failures"""
 
     excluded_criteria: List[str]
     excluded_indicators: List[str]
+    failed_criteria: List[str]
+    failed_indicators: List[str]
 
 
 class ConversationHealthScore(TypedDict):
@@ -219,8 +381,10 @@ class ConversationHealthScore(TypedDict):
 
 
 # Collections for analysis results
-CriteriaEvaluations = Dict[str, EvaluationCriteriaResult]
-QualityIndicatorDetections = Dict[str, QualityIndicatorResult]
+CriteriaEvaluations = Dict[str, Union[EvaluationCriteriaResult, FailedAnalysisResult]]
+QualityIndicatorDetections = Dict[
+    str, Union[QualityIndicatorResult, FailedAnalysisResult]
+]
 CriteriaAnalysisNodeOutput = Dict[str, CriteriaEvaluations]
 QualityIndicatorNodeOutput = Dict[str, QualityIndicatorDetections]
 
@@ -239,6 +403,8 @@ class ConversationAnalysisState(BaseModel):
     """State object for the conversation analysis workflow"""
 
     transcript: str = ""
+    # Built once per analysis by the transcript index node
+    transcript_index: Optional[TranscriptIndex] = None
     identified_concerns: IdentifiedConcerns = Field(
         default_factory=lambda: IdentifiedConcerns(concerns=[])
     )
@@ -250,3 +416,8 @@ class ConversationAnalysisState(BaseModel):
     )
     health_score: ConversationHealthScore = Field(default_factory=dict)  # type: ignore
     final_assessment: ConversationHealthAssessment = Field(default_factory=dict)  # type: ignore
+    indicator_triage: Optional[IndicatorTriageResult] = None
+    # Per-request override of the configured synthesis mode
+    synthesis_mode: Optional[SynthesisMode] = None
+    # Nodes that failed after retries, mapped to their error
+    failed_nodes: Annotated[Dict[str, str], merge_dicts] = Field(default_factory=dict)
@@ -1,20 +1,149 @@
-from typing import Callable
+import time
+from functools import wraps
+from typing import Any, Callable, Awaitable, Dict, List, Optional, Tuple
 from logging import Logger
 from langchain_core.language_models import BaseLanguageModel
-from llm import call_llm_structured
-from prompts import get_criteria_analysis_prompt, get_quality_indicator_detection_prompt
+from langchain_core.runnables import Runnable, RunnableLambda
+from llm import call_llm_structured, acall_llm_structured
+from request_context import get_current_node_name
+from instrumentation import get_instrumentation
+from tracing import get_current_span, trace_span
+from prompts import (
+    get_criteria_analysis_prompt,
+    get_fused_criteria_analysis_prompt,
+    get_quality_indicator_detection_prompt,
+    get_fused_quality_indicator_detection_prompt,
+    get_quality_indicator_triage_prompt,
+)
 from models import (
     ConversationAnalysisState,
+    FailedAnalysisResult,
+    IndicatorTriageResult,
     QualityIndicatorConfig,
     EvaluationCriteriaConfig,
+    QualityIndicatorDetections,
     QualityIndicatorNodeOutput,
     CriteriaAnalysisNodeOutput,
 )
+from indicator_prefilter import IndicatorPrefilter, build_prefilters
+from transcript_metrics import (
+    compute_transcript_metrics,
+    format_transcript_facts,
+    get_transcript_index,
+)
 from pydantic_model_creators import (
     create_evaluation_criteria_model,
     create_quality_indicator_model,
+    create_fused_quality_indicator_model,
+    create_fused_evaluation_criteria_model,
+    create_indicator_triage_model,
 )
 
+# Builds the state update a node returns in place of its result when it fails
+NodeFallback = Callable[[Any, Exception], Dict[str, Any]]
+
+
+def create_graph_node(
+    sync_node: Callable,
+    async_node: Callable[..., Awaitable],
+    fallback: Optional[NodeFallback] = None,
+    logger: Optional[Logger] = None,
+) -> Runnable:
+    """
+    Combine sync and async implementations of a node into one graph node.
+
+    `invoke` runs the sync function and `ainvoke` awaits the async one, so
+    the same compiled graph serves both the Streamlit app and the API. With a
+    `fallback`, an exception raised by the node (after LLM retries) is logged,
+    recorded in `failed_nodes` and replaced by the fallback's state update,
+    so one failing node does not abort the whole analysis. Every run is
+    timed per node by the instrumentation and traced as a node span.
+    """
+    if fallback is not None:
+        sync_node, async_node = _isolate_failures(
+            sync_node, async_node, fallback, logger
+        )
+    sync_node, async_node = _instrument_node(sync_node, async_node)
+    return RunnableLambda(sync_node, afunc=async_node, name=sync_node.__name__)
+
+
+def _instrument_node(
+    sync_node: Callable, async_node: Callable[..., Awaitable]
+) -> Tuple[Callable, Callable[..., Awaitable]]:
+    @wraps(sync_node)
+    def instrumented_node(state: Any) -> Dict[str, Any]:
+        node_name = get_current_node_name()
+        started_at = time.perf_counter()
+        try:
+            with trace_span(node_name, "node", node=node_name):
+                return sync_node(state)
+        finally:
+            get_instrumentation().record_node(
+                node_name, time.perf_counter() - started_at
+            )
+
+    @wraps(async_node)
+    async def ainstrumented_node(state: Any) -> Dict[str, Any]:
+        node_name = get_current_node_name()
+        started_at = time.perf_counter()
+        try:
+            with trace_span(node_name, "node", node=node_name):
+                return await async_node(state)
+        finally:
+            get_instrumentation().record_node(
+                node_name, time.perf_counter() - started_at
+            )
+
+    return instrumented_node, ainstrumented_node
+
+
+def _isolate_failures(
+    sync_node: Callable,
+    async_node: Callable[..., Awaitable],
+    fallback: NodeFallback,
+    logger: Optional[Logger],
+) -> Tuple[Callable, Callable[..., Awaitable]]:
+    def failed_update(state: Any, error: Exception) -> Dict[str, Any]:
+        node_name = get_current_node_name()
+        get_instrumentation().record_node_failure(node_name)
+        get_current_span().set_error(error)
+        if logger is not None:
+            logger.warning(
+                f"Node '{node_name}' failed, continuing with a partial result: "
+                f"{error!r}"
+            )
+        return {**fallback(state, error), "failed_nodes": {node_name: repr(error)}}
+
+    @wraps(sync_node)
+    def isolated_node(state: Any) -> Dict[str, Any]:
+        try:
+            return sync_node(state)
+        except Exception as error:
+            return failed_update(state, error)
+
+    @wraps(async_node)
+    async def aisolated_node(state: Any) -> Dict[str, Any]:
+        try:
+            return await async_node(state)
+        except Exception as error:
+            return failed_update(state, error)
+
+    return isolated_node, aisolated_node
+
+
+def get_transcript_facts(configs: List[Any], state: ConversationAnalysisState) -> str:
+    """Measured transcript metrics for prompts of configs that ask for them."""
+    if not any(config.uses_transcript_metrics for config in configs):
+        return ""
+    return format_transcript_facts(
+        compute_transcript_metrics(get_transcript_index(state))
+    )
+
+
+def failed_results(names: List[str], error: Exception) -> Dict[str, Any]:
+    """Failure placeholders for every criteria or indicator a node produces."""
+    return {name: FailedAnalysisResult(error=repr(error)) for name in names}
+
 
 class QualityIndicatorNodeBuilder:
     def __init__(self, llm: BaseLanguageModel, logger: Logger):
@@ -25,18 +154,259 @@ class QualityIndicatorNodeBuilder:
         self, indicator_config: QualityIndicatorConfig
     ) -> Callable:
         indicator_model = create_quality_indicator_model(indicator_config.name)
+        prefilters = build_prefilters([indicator_config])
 
         def detect_quality_indicator(
             state: ConversationAnalysisState,
         ) -> QualityIndicatorNodeOutput:
+            _, ruled_out = self._screen_indicators(
+                [indicator_config], prefilters, state
+            )
+            if ruled_out:
+                return {"quality_indicator_detections": ruled_out}
             prompt = get_quality_indicator_detection_prompt(
-                indicator_config, state.transcript
+                indicator_config,
+                state.transcript,
+                get_transcript_facts([indicator_config], state),
             )
             result = call_llm_structured(prompt, indicator_model, self.llm, self.logger)
             return {"quality_indicator_detections": {indicator_config.name: result}}
 
         return detect_quality_indicator
 
+    def create_async_detection_node(
+        self, indicator_config: QualityIndicatorConfig
+    ) -> Callable[..., Awaitable[QualityIndicatorNodeOutput]]:
+        indicator_model = create_quality_indicator_model(indicator_config.name)
+        prefilters = build_prefilters([indicator_config])
+
+        async def adetect_quality_indicator(
+            state: ConversationAnalysisState,
+        ) -> QualityIndicatorNodeOutput:
+            _, ruled_out = self._screen_indicators(
+                [indicator_config], prefilters, state
+            )
+            if ruled_out:
+                return {"quality_indicator_detections": ruled_out}
+            prompt = get_quality_indicator_detection_prompt(
+                indicator_config,
+                state.transcript,
+                get_transcript_facts([indicator_config], state),
+            )
+            result = await acall_llm_structured(
+                prompt, indicator_model, self.llm, self.logger
+            )
+            return {"quality_indicator_detections": {indicator_config.name: result}}
+
+        return adetect_quality_indicator
+
+    def create_graph_node(self, indicator_config: QualityIndicatorConfig) -> Runnable:
+        return create_graph_node(
+            self.create_detection_node(indicator_config),
+            self.create_async_detection_node(indicator_config),
+            fallback=self._failure_fallback([indicator_config]),
+            logger=self.logger,
+        )
+
+    def create_fused_detection_node(
+        self, indicator_configs: List[QualityIndicatorConfig]
+    ) -> Callable:
+        prefilters = build_prefilters(indicator_configs)
+
+        def detect_quality_indicators(
+            state: ConversationAnalysisState,
+        ) -> QualityIndicatorNodeOutput:
+            remaining, ruled_out = self._screen_indicators(
+                indicator_configs, prefilters, state
+            )
+            if not remaining:
+                return {"quality_indicator_detections": ruled_out}
+            prompt = get_fused_quality_indicator_detection_prompt(
+                remaining,
+                state.transcript,
+                get_transcript_facts(remaining, state),
+            )
+            fused_model = create_fused_quality_indicator_model(remaining)
+            result = call_llm_structured(prompt, fused_model, self.llm, self.logger)
+            return self._merge_ruled_out(
+                self._split_fused_result(remaining, result), ruled_out
+            )
+
+        return detect_quality_indicators
+
+    def create_async_fused_detection_node(
+        self, indicator_configs: List[QualityIndicatorConfig]
+    ) -> Callable[..., Awaitable[QualityIndicatorNodeOutput]]:
+        prefilters = build_prefilters(indicator_configs)
+
+        async def adetect_quality_indicators(
+            state: ConversationAnalysisState,
+        ) -> QualityIndicatorNodeOutput:
+            remaining, ruled_out = self._screen_indicators(
+                indicator_configs, prefilters, state
+            )
+            if not remaining:
+                return {"quality_indicator_detections": ruled_out}
+            prompt = get_fused_quality_indicator_detection_prompt(
+                remaining,
+                state.transcript,
+                get_transcript_facts(remaining, state),
+            )
+            fused_model = create_fused_quality_indicator_model(remaining)
+            result = await acall_llm_structured(
+                prompt, fused_model, self.llm, self.logger
+            )
+            return self._merge_ruled_out(
+                self._split_fused_result(remaining, result), ruled_out
+            )
+
+        return adetect_quality_indicators
+
+    def create_fused_graph_node(
+        self, indicator_configs: List[QualityIndicatorConfig]
+    ) -> Runnable:
+        return create_graph_node(
+            self.create_fused_detection_node(indicator_configs),
+            self.create_async_fused_detection_node(indicator_configs),
+            fallback=self._failure_fallback(indicator_configs),
+            logger=self.logger,
+        )
+
+    def create_triage_node(
+        self, indicator_configs: List[QualityIndicatorConfig]
+    ) -> Callable:
+        triage_model = create_indicator_triage_model(indicator_configs)
+
+        def triage_quality_indicators(
+            state: ConversationAnalysisState,
+        ) -> Dict[str, Optional[IndicatorTriageResult]]:
+            prompt = get_quality_indicator_triage_prompt(
+                indicator_configs, state.transcript
+            )
+            try:
+                result = call_llm_structured(
+                    prompt, triage_model, self.llm, self.logger
+                )
+            except Exception as error:
+                return self._triage_failed(error)
+            return self._triage_result(indicator_configs, result)
+
+        return triage_quality_indicators
+
+    def create_async_triage_node(
+        self, indicator_configs: List[QualityIndicatorConfig]
+    ) -> Callable[..., Awaitable[Dict[str, Optional[IndicatorTriageResult]]]]:
+        triage_model = create_indicator_triage_model(indicator_configs)
+
+        async def atriage_quality_indicators(
+            state: ConversationAnalysisState,
+        ) -> Dict[str, Optional[IndicatorTriageResult]]:
+            prompt = get_quality_indicator_triage_prompt(
+                indicator_configs, state.transcript
+            )
+            try:
+                result = await acall_llm_structured(
+                    prompt, triage_model, self.llm, self.logger
+                )
+            except Exception as error:
+                return self._triage_failed(error)
+            return self._triage_result(indicator_configs, result)
+
+        return atriage_quality_indicators
+
+    def create_triage_graph_node(
+        self, indicator_configs: List[QualityIndicatorConfig]
+    ) -> Runnable:
+        return create_graph_node(
+            self.create_triage_node(indicator_configs),
+            self.create_async_triage_node(indicator_configs),
+        )
+
+    @staticmethod
+    def _triage_result(
+        indicator_configs: List[QualityIndicatorConfig], result: Any
+    ) -> Dict[str, Optional[IndicatorTriageResult]]:
+        return {
+            "indicator_triage": IndicatorTriageResult(
+                screened_indicators=[indicator.name for indicator in indicator_configs],
+                plausible_indicators=[
+                    indicator.value for indicator in result.plausible_indicators
+                ],
+                reasoning=result.reasoning,
+                confidence=result.confidence,
+            )
+        }
+
+    def _triage_failed(
+        self, error: Exception
+    ) -> Dict[str, Optional[IndicatorTriageResult]]:
+        # Without a triage every indicator gets its full detection call
+        self.logger.warning(
+            f"Indicator triage failed, detecting all indicators: {error!r}"
+        )
+        return {"indicator_triage": None}
+
+    @staticmethod
+    def _failure_fallback(
+        indicator_configs: List[QualityIndicatorConfig],
+    ) -> NodeFallback:
+        names = [indicator.name for indicator in indicator_configs]
+        return lambda state, error: {
+            "quality_indicator_detections": failed_results(names, error)
+        }
+
+    @staticmethod
+    def _screen_indicators(
+        indicator_configs: List[QualityIndicatorConfig],
+        prefilters: Dict[str, IndicatorPrefilter],
+        state: ConversationAnalysisState,
+    ) -> Tuple[List[QualityIndicatorConfig], QualityIndicatorDetections]:
+        """
+        Split indicators into those still needing a detection call and
+        not-detected results for those ruled out by their lexical prefilter
+        or by the triage call.
+        """
+        triage = getattr(state, "indicator_triage", None)
+        if not isinstance(triage, IndicatorTriageResult):
+            triage = None
+
+        remaining = []
+        ruled_out: QualityIndicatorDetections = {}
+        for indicator in indicator_configs:
+            prefilter = prefilters.get(indicator.name)
+            if prefilter is not None and prefilter.rules_out(state.transcript):
+                ruled_out[indicator.name] = prefilter.absent_result()
+            elif triage is not None and indicator.name in triage.screened_indicators:
+                if indicator.name in triage.plausible_indicators:
+                    remaining.append(indicator)
+                else:
+                    ruled_out[indicator.name] = triage.absent_result()
+            else:
+                remaining.append(indicator)
+        return remaining, ruled_out
+
+    @staticmethod
+    def _merge_ruled_out(
+        output: QualityIndicatorNodeOutput, ruled_out: QualityIndicatorDetections
+    ) -> QualityIndicatorNodeOutput:
+        return {
+            "quality_indicator_detections": {
+                **output["quality_indicator_detections"],
+                **ruled_out,
+            }
+        }
+
+    @staticmethod
+    def _split_fused_result(
+        indicator_configs: List[QualityIndicatorConfig], result: Any
+    ) -> QualityIndicatorNodeOutput:
+        return {
+            "quality_indicator_detections": {
+                indicator.name: getattr(result, indicator.name)
+                for indicator in indicator_configs
+            }
+        }
+
 
 class EvaluationCriteriaNodeBuilder:
     def __init__(self, llm: BaseLanguageModel, logger: Logger):
@@ -51,8 +421,108 @@ class EvaluationCriteriaNodeBuilder:
         def evaluate_conversation_criteria(
             state: ConversationAnalysisState,
         ) -> CriteriaAnalysisNodeOutput:
-            prompt = get_criteria_analysis_prompt(criteria_config, state.transcript)
+            prompt = get_criteria_analysis_prompt(
+                criteria_config,
+                state.transcript,
+                get_transcript_facts([criteria_config], state),
+            )
             result = call_llm_structured(prompt, criteria_model, self.llm, self.logger)
             return {"criteria_evaluations": {criteria_config.name: result}}
 
         return evaluate_conversation_criteria
+
+    def create_async_evaluation_node(
+        self, criteria_config: EvaluationCriteriaConfig
+    ) -> Callable[..., Awaitable[CriteriaAnalysisNodeOutput]]:
+        criteria_model = create_evaluation_criteria_model(criteria_config)
+
+        async def aevaluate_conversation_criteria(
+            state: ConversationAnalysisState,
+        ) -> CriteriaAnalysisNodeOutput:
+            prompt = get_criteria_analysis_prompt(
+                criteria_config,
+                state.transcript,
+                get_transcript_facts([criteria_config], state),
+            )
+            result = await acall_llm_structured(
+                prompt, criteria_model, self.llm, self.logger
+            )
+            return {"criteria_evaluations": {criteria_config.name: result}}
+
+        return aevaluate_conversation_criteria
+
+    def create_graph_node(self, criteria_config: EvaluationCriteriaConfig) -> Runnable:
+        return create_graph_node(
+            self.create_evaluation_node(criteria_config),
+            self.create_async_evaluation_node(criteria_config),
+            fallback=self._failure_fallback([criteria_config]),
+            logger=self.logger,
+        )
+
+    def create_fused_evaluation_node(
+        self, criteria_configs: List[EvaluationCriteriaConfig]
+    ) -> Callable:
+        fused_model = create_fused_evaluation_criteria_model(criteria_configs)
+
+        def evaluate_conversation_criteria_fused(
+            state: ConversationAnalysisState,
+        ) -> CriteriaAnalysisNodeOutput:
+            prompt = get_fused_criteria_analysis_prompt(
+                criteria_configs,
+                state.transcript,
+                get_transcript_facts(criteria_configs, state),
+            )
+            result = call_llm_structured(prompt, fused_model, self.llm, self.logger)
+            return self._split_fused_result(criteria_configs, result)
+
+        return evaluate_conversation_criteria_fused
+
+    def create_async_fused_evaluation_node(
+        self, criteria_configs: List[EvaluationCriteriaConfig]
+    ) -> Callable[..., Awaitable[CriteriaAnalysisNodeOutput]]:
+        fused_model = create_fused_evaluation_criteria_model(criteria_configs)
+
+        async def aevaluate_conversation_criteria_fused(
+            state: ConversationAnalysisState,
+        ) -> CriteriaAnalysisNodeOutput:
+            prompt = get_fused_criteria_analysis_prompt(
+                criteria_configs,
+                state.transcript,
+                get_transcript_facts(criteria_configs, state),
+            )
+            result = await acall_llm_structured(
+                prompt, fused_model, self.llm, self.logger
+            )
+            return self._split_fused_result(criteria_configs, result)
+
+        return aevaluate_conversation_criteria_fused
+
+    def create_fused_graph_node(
+        self, criteria_configs: List[EvaluationCriteriaConfig]
+    ) -> Runnable:
+        return create_graph_node(
+            self.create_fused_evaluation_node(criteria_configs),
+            self.create_async_fused_evaluation_node(criteria_configs),
+            fallback=self._failure_fallback(criteria_configs),
+            logger=self.logger,
+        )
+
+    @staticmethod
+    def _failure_fallback(
+        criteria_configs: List[EvaluationCriteriaConfig],
+    ) -> NodeFallback:
+        names = [criteria_config.name for criteria_config in criteria_configs]
+        return lambda state, error: {
+            "criteria_evaluations": failed_results(names, error)
+        }
+
+    @staticmethod
+    def _split_fused_result(
+        criteria_configs: List[EvaluationCriteriaConfig], result: Any
+    ) -> CriteriaAnalysisNodeOutput:
+        return {
+            "criteria_evaluations": {
+                criteria_config.name: getattr(result, criteria_config.name)
+                for criteria_config in criteria_configs
+            }
+        }
@@ -0,0 +1,140 @@
+"""
+Streamlit debugging page showing exported analysis traces as a waterfall.
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, List
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from tracing import critical_path, load_traces
+
+st.set_page_config(page_title="Analysis Traces", page_icon="⏱️", layout="wide")
+
+KIND_ORDER = ["request", "node", "llm", "llm_attempt"]
+
+
+def trace_label(spans: List[Dict[str, Any]]) -> str:
+    root = next((span for span in spans if span["parent_span_id"] is None), spans[0])
+    started = datetime.fromtimestamp(root["start_time"]).strftime("%Y-%m-%d %H:%M:%S")
+    duration = root["duration_seconds"] or 0.0
+    return f"{started} · {root['name']} · {duration:.2f}s · {root['trace_id'][:8]}"
+
+
+def span_rows(spans: List[Dict[str, Any]]) -> pd.DataFrame:
+    """One waterfall row per span, in start order, with offsets in ms."""
+    trace_start = min(span["start_time"] for span in spans)
+    on_critical_path = {span["span_id"] for span in critical_path(spans)}
+    rows = []
+    for span in sorted(spans, key=lambda span: span["start_time"]):
+        end_time = span["end_time"] or span["start_time"]
+        attributes = span["attributes"]
+        # LLM spans are labelled with the node that made the call
+        label = span["name"]
+        if span["kind"] in ("llm", "llm_attempt"):
+            label = f"{attributes.get('node', '?')} · {span['name']}"
+        rows.append(
+            {
+                "span": f"{label} [{span['span_id'][:6]}]",
+                "kind": span["kind"],
+                "start_ms": (span["start_time"] - trace_start) * 1000,
+                "end_ms": (end_time - trace_start) * 1000,
+                "duration_ms": (end_time - span["start_time"]) * 1000,
+                "status": span["status"],
+                "critical_path": span["span_id"] in on_critical_path,
+                "cache": attributes.get("cache", ""),
+                "retries": attributes.get("retries", ""),
+                "prompt_tokens": attributes.get("prompt_tokens", ""),
+                "completion_tokens": attributes.get("completion_tokens", ""),
+                "model": str(attributes.get("model", "")),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def waterfall_chart(rows: pd.DataFrame) -> alt.Chart:
+    return (
+        alt.Chart(rows)
+        .mark_bar(height=12)
+        .encode(
+            x=alt.X("start_ms:Q", title="Milliseconds since the analysis started"),
+            x2="end_ms:Q",
+            y=alt.Y("span:N", sort=list(rows["span"]), title=None),
+            color=alt.Color("kind:N", scale=alt.Scale(domain=KIND_ORDER)),
+            stroke=alt.condition(
+                "datum.critical_path", alt.value("#ef4444"), alt.value(None)
+            ),
+            strokeWidth=alt.condition(
+                "datum.critical_path", alt.value(2), alt.value(0)
+            ),
+            tooltip=[
+                "span",
+                "kind",
+                alt.Tooltip("duration_ms:Q", format=".1f"),
+                "status",
+                "cache",
+                "retries",
+                "prompt_tokens",
+                "completion_tokens",
+                "model",
+            ],
+        )
+        .properties(height=max(200, 18 * len(rows)))
+    )
+
+
+st.title("⏱️ Analysis Traces")
+st.caption(
+    "Traces are exported when TRACE_EXPORT_PATH is set for the API or the "
+    "Streamlit app. Nodes on the critical path are outlined in red."
+)
+
+trace_path = st.text_input("Trace file", os.getenv("TRACE_EXPORT_PATH", "traces.jsonl"))
+traces = load_traces(trace_path)
+if not traces:
+    st.info(f"No traces found in {trace_path}.")
+    st.stop()
+
+# Most recent first
+trace_ids = sorted(
+    traces, key=lambda trace_id: traces[trace_id][0]["start_time"], reverse=True
+)
+selected = st.selectbox(
+    "Trace", trace_ids, format_func=lambda trace_id: trace_label(traces[trace_id])
+)
+spans = traces[selected]
+rows = span_rows(spans)
+llm_calls = [span for span in spans if span["kind"] == "llm"]
+
+columns = st.columns(5)
+columns[0].metric("Duration", f"{rows['end_ms'].max() / 1000:.2f}s")
+columns[1].metric("LLM calls", len(llm_calls))
+columns[2].metric(
+    "Cache hits",
+    sum(span["attributes"].get("cache") == "hit" for span in llm_calls),
+)
+columns[3].metric(
+    "Retries", sum(span["attributes"].get("retries", 0) for span in llm_calls)
+)
+columns[4].metric(
+    "Tokens",
+    sum(
+        span["attributes"].get("prompt_tokens", 0)
+        + span["attributes"].get("completion_tokens", 0)
+        for span in llm_calls
+    ),
+)
+
+st.altair_chart(waterfall_chart(rows), use_container_width=True)
+
+st.subheader("Critical path")
+path = critical_path(spans)
+st.write(
+    " → ".join(f"{span['name']} ({span['duration_seconds']:.2f}s)" for span in path)
+)
+
+with st.expander("All spans"):
+    st.dataframe(rows, use_container_width=True)
@@ -12,6 +12,15 @@ def get_confidence_level_description() -> str:
 - very_low: Minimal evidence, high uncertainty"""
 
 
+def get_transcript_facts_section(transcript_facts: str) -> str:
+    if not transcript_facts:
+        return ""
+    return f"""
+
+Measured conversation facts (computed exactly from the transcript; rely on these instead of estimating them yourself):
+{transcript_facts}"""
+
+
 def get_health_assessment_synthesis_prompt(
     health_score: ConversationHealthScore,
 ) -> str:
@@ -36,6 +45,28 @@ Provide an overall assessment that:
 CRITICAL: If the conversation was generally effective, respond with ONLY ONE SHORT SENTENCE about the strengths - do not add bullet points or additional recommendations."""
 
 
+def get_outcome_synthesis_prompt(outcome: dict) -> str:
+    """
+    Synthesis prompt for assessments reused across conversations: it holds
+    only the categorical outcome the reuse is keyed on, so the text cannot
+    carry one conversation's details or exact score into another.
+    """
+    return f"""Create a communication health assessment from the categorical outcome of an analysis.
+
+Health Level: {outcome['health_level']}
+Criteria Results (selected response, counted in score{', reasoning' if outcome['include_reasoning'] else ''}): {outcome['criteria']}
+Quality Indicator Results (detected, counted in score{', reasoning' if outcome['include_reasoning'] else ''}): {outcome['indicators']}
+
+Provide an overall assessment that:
+- Highlights key strengths and weaknesses in ONE SHORT SENTENCE ONLY
+- Provides 2-3 actionable recommendation points based on findings (include positive aspects when appropriate)
+- Only includes actions that are clearly relevant to the assessment
+- Does not mention any numeric score
+- For predominantly positive assessments, provide ONLY ONE SHORT SENTENCE highlighting what was done well
+
+CRITICAL: If the conversation was generally effective, respond with ONLY ONE SHORT SENTENCE about the strengths - do not add bullet points or additional recommendations."""
+
+
 def get_concern_identification_prompt(transcript: str) -> str:
     return f"""Analyze this conversation transcript to identify key concerns and questions that were raised.
 
@@ -46,6 +77,7 @@ For each concern or question you identify:
 1. Provide a clear description of what was raised
 2. Assess the addressal level (not_addressed, partially_addressed, mostly_addressed, fully_addressed)
 3. Explain your reasoning for the addressal assessment
+4. Count how many times the concern was raised (1 if raised once)
 
 Focus on substantive concerns that were brought up during the conversation. Look for:
 - Direct questions asked by participants (high confidence when explicitly stated)
@@ -82,8 +114,47 @@ Rate your confidence level in this synthesis using the scale above.
 Focus on patterns you can identify with at least moderate certainty."""
 
 
+def get_single_pass_concern_analysis_prompt(
+    concern_handling_config: EvaluationCriteriaConfig, transcript: str
+) -> str:
+    options = chr(10).join(
+        f"- {response}: {option.description}"
+        for response, option in concern_handling_config.response_options.items()
+    )
+
+    return f"""Analyze this conversation transcript to identify the key concerns and questions that were raised, then assess how well they were handled overall.
+
+Transcript:
+{transcript}
+
+Step 1 - For each substantive concern or question raised:
+1. Provide a clear description of what was raised
+2. Assess the addressal level (not_addressed, partially_addressed, mostly_addressed, fully_addressed)
+3. Explain your reasoning for the addressal assessment
+4. Count how many times the concern was raised (1 if raised once)
+
+Look for direct questions, concerns or problems mentioned, requests for information or help, complaints or feedback, and goals or objectives. Only include items you can support with confident reasoning from the transcript.
+
+Step 2 - Based on the concerns from step 1, evaluate {concern_handling_config.description}:
+{concern_handling_config.prompt}
+
+Available response options:
+{options}
+
+{get_confidence_level_description()}
+
+For the overall assessment provide:
+1. Your selected response from the options above
+2. Brief reasoning for your choice with confidence level (MUST BE ONE SHORT SENTENCE ONLY)
+3. Your confidence level using the scale above
+
+Focus on patterns you can identify with at least moderate certainty."""
+
+
 def get_criteria_analysis_prompt(
-    criteria_config: EvaluationCriteriaConfig, transcript: str
+    criteria_config: EvaluationCriteriaConfig,
+    transcript: str,
+    transcript_facts: str = "",
 ) -> str:
     available_responses = list(criteria_config.response_options.keys())
     response_descriptions = {
@@ -94,7 +165,7 @@ def get_criteria_analysis_prompt(
     return f"""Analyze this conversation transcript for: {criteria_config.description}
 
 Transcript:
-{transcript}
+{transcript}{get_transcript_facts_section(transcript_facts)}
 
 {criteria_config.prompt}
 
@@ -111,8 +182,45 @@ Provide:
 Be thorough in your reasoning, acknowledge limitations honestly, and provide your best assessment."""
 
 
+def get_fused_criteria_analysis_prompt(
+    criteria_configs: List[EvaluationCriteriaConfig],
+    transcript: str,
+    transcript_facts: str = "",
+) -> str:
+    criteria_sections = []
+    for criteria_config in criteria_configs:
+        options = chr(10).join(
+            f"  - {response}: {option.description}"
+            for response, option in criteria_config.response_options.items()
+        )
+        criteria_sections.append(
+            f"""{criteria_config.name}: {criteria_config.description}
+{criteria_config.prompt}
+Available response options:
+{options}"""
+        )
+
+    return f"""Analyze this conversation transcript for each of the following criteria:
+
+Transcript:
+{transcript}{get_transcript_facts_section(transcript_facts)}
+
+{(chr(10) * 2).join(criteria_sections)}
+
+{get_confidence_level_description()}
+
+For EACH criteria above, provide independently:
+1. Your selected response from that criteria's options
+2. Brief reasoning for your choice with confidence assessment (MUST BE ONE SHORT SENTENCE ONLY)
+3. Your confidence level using the scale above
+
+Be thorough in your reasoning, acknowledge limitations honestly, and provide your best assessment."""
+
+
 def get_quality_indicator_detection_prompt(
-    indicator_config: QualityIndicatorConfig, transcript: str
+    indicator_config: QualityIndicatorConfig,
+    transcript: str,
+    transcript_facts: str = "",
 ) -> str:
     return f"""Analyze this conversation transcript to detect the following communication quality indicator:
 
@@ -120,7 +228,7 @@ Indicator: {indicator_config.name}
 Description: {indicator_config.description}
 
 Transcript:
-{transcript}
+{transcript}{get_transcript_facts_section(transcript_facts)}
 
 {get_confidence_level_description()}
 
@@ -132,3 +240,45 @@ Determine:
 Be conservative in detection - only flag instances you can identify with reasonable certainty.
 If evidence is ambiguous or requires significant inference, rate as 'low' or 'very_low' confidence.
 Clear, explicit examples should yield 'high' or 'very_high' confidence ratings."""
+
+
+def get_fused_quality_indicator_detection_prompt(
+    indicator_configs: List[QualityIndicatorConfig],
+    transcript: str,
+    transcript_facts: str = "",
+) -> str:
+    return f"""Analyze this conversation transcript to detect each of the following communication quality indicators:
+
+{chr(10).join(f"- {indicator.name}: {indicator.description}" for indicator in indicator_configs)}
+
+Transcript:
+{transcript}{get_transcript_facts_section(transcript_facts)}
+
+{get_confidence_level_description()}
+
+For EACH indicator above, determine independently:
+1. Whether this quality indicator is present in the conversation (true/false)
+2. Brief reasoning for your choice with confidence assessment (MUST BE ONE SHORT SENTENCE ONLY)
+3. Your confidence level using the scale above
+
+Be conservative in detection - only flag instances you can identify with reasonable certainty.
+If evidence is ambiguous or requires significant inference, rate as 'low' or 'very_low' confidence.
+Clear, explicit examples should yield 'high' or 'very_high' confidence ratings."""
+
+
+def get_quality_indicator_triage_prompt(
+    indicator_configs: List[QualityIndicatorConfig], transcript: str
+) -> str:
+    return f"""Screen this conversation transcript for the communication quality indicators below. A detailed check follows for every indicator you select, so list each one that is plausibly present.
+
+{chr(10).join(f"- {indicator.name}: {indicator.description}" for indicator in indicator_configs)}
+
+Transcript:
+{transcript}
+
+{get_confidence_level_description()}
+
+Provide:
+1. The indicators that are plausibly present (include any indicator with even weak evidence; an empty list is fine when none apply)
+2. Brief reasoning for your choice (MUST BE ONE SHORT SENTENCE ONLY)
+3. Your confidence that the indicators you left out are absent, using the scale above"""
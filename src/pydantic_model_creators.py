@@ -1,9 +1,12 @@
-from typing import Type, cast
-from pydantic import Field, create_model
+from typing import List, Type, cast
+from pydantic import BaseModel, Field, create_model
 from enum import Enum
 from models import (
     EvaluationCriteriaConfig,
+    AssessmentConfidence,
     EvaluationCriteriaResult,
+    IdentifiedConcerns,
+    QualityIndicatorConfig,
     QualityIndicatorResult,
 )
 
@@ -42,3 +45,72 @@ def create_quality_indicator_model(
     )
 
     return cast(Type[QualityIndicatorResult], detection_model)
+
+
+def create_fused_quality_indicator_model(
+    indicator_configs: List[QualityIndicatorConfig],
+) -> Type[BaseModel]:
+
+    indicator_fields = {
+        indicator.name: (
+            create_quality_indicator_model(indicator.name),
+            Field(description=f"Detection result for: {indicator.description}"),
+        )
+        for indicator in indicator_configs
+    }
+
+    return create_model("FusedQualityIndicatorDetection", **indicator_fields)
+
+
+def create_fused_evaluation_criteria_model(
+    criteria_configs: List[EvaluationCriteriaConfig],
+) -> Type[BaseModel]:
+
+    criteria_fields = {
+        criteria_config.name: (
+            create_evaluation_criteria_model(criteria_config),
+            Field(description=f"Evaluation of: {criteria_config.description}"),
+        )
+        for criteria_config in criteria_configs
+    }
+
+    return create_model("FusedEvaluationCriteriaAnalysis", **criteria_fields)
+
+
+def create_single_pass_concern_analysis_model(
+    concern_handling_config: EvaluationCriteriaConfig,
+) -> Type[IdentifiedConcerns]:
+
+    concern_analysis_model = create_model(
+        "SinglePassConcernAnalysis",
+        __base__=IdentifiedConcerns,
+        concern_handling_quality=(
+            create_evaluation_criteria_model(concern_handling_config),
+            Field(description=f"Evaluation of: {concern_handling_config.description}"),
+        ),
+    )
+
+    return cast(Type[IdentifiedConcerns], concern_analysis_model)
+
+
+def create_indicator_triage_model(
+    indicator_configs: List[QualityIndicatorConfig],
+) -> Type[BaseModel]:
+
+    indicator_enum = Enum(  # type: ignore[misc]
+        "TriagedIndicator",
+        {indicator.name: indicator.name for indicator in indicator_configs},
+    )
+
+    return create_model(
+        "QualityIndicatorTriage",
+        plausible_indicators=(
+            List[indicator_enum],
+            Field(description="Indicators that may be present in the conversation"),
+        ),
+        reasoning=(str, Field(description="Brief reasoning for the triage")),
+        confidence=(
+            AssessmentConfidence,
+            Field(description="Confidence that the omitted indicators are absent"),
+        ),
+    )
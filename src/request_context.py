@@ -0,0 +1,73 @@
+import threading
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from langgraph.config import get_config
+
+DEFAULT_REQUEST_ID = "default"
+UNKNOWN_NODE = "unknown"
+
+
+class RequestContext:
+    """Per-analysis bookkeeping shared by every LLM call of one request."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.retry_seconds = 0.0
+        self.retries_by_node: Dict[str, int] = {}
+        # Per-node timing, token and call totals recorded by the instrumentation
+        self.node_stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record_retry(self, node_name: str, delay_seconds: float) -> None:
+        with self._lock:
+            self.retry_seconds += delay_seconds
+            self.retries_by_node[node_name] = self.retries_by_node.get(node_name, 0) + 1
+
+    def add_retry_seconds(self, seconds: float) -> None:
+        with self._lock:
+            self.retry_seconds += seconds
+
+    def add_node_stats(self, node_name: str, **values: float) -> None:
+        with self._lock:
+            stats = self.node_stats.setdefault(node_name, {})
+            for key, value in values.items():
+                stats[key] = stats.get(key, 0) + value
+
+    def timing_breakdown(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                node_name: dict(stats) for node_name, stats in self.node_stats.items()
+            }
+
+
+current_request_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    "llm_request_context", default=None
+)
+
+
+def get_current_request_id() -> str:
+    context = current_request_context.get()
+    return context.request_id if context is not None else DEFAULT_REQUEST_ID
+
+
+def get_current_node_name() -> str:
+    """Name of the graph node the caller is running in, if any."""
+    try:
+        metadata = get_config().get("metadata", {})
+    except RuntimeError:
+        return UNKNOWN_NODE
+    return metadata.get("langgraph_node") or UNKNOWN_NODE
+
+
+@contextmanager
+def llm_request_scope(request_id: Optional[str] = None) -> Iterator[RequestContext]:
+    """Tag every LLM call made inside this scope with one request context."""
+    context = RequestContext(request_id or uuid.uuid4().hex)
+    token = current_request_context.set(context)
+    try:
+        yield context
+    finally:
+        current_request_context.reset(token)
@@ -1,8 +1,9 @@
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from models import (
     ConversationHealthConfig,
     HealthScoreRange,
     AssessmentConfidence,
+    FailedAnalysisResult,
     CriteriaEvaluationResult,
     QualityIndicatorDetectionResult,
     ConversationHealthScore,
@@ -71,6 +72,23 @@ class ConversationHealthScorer:
             "included_in_final_score": included_in_final_score,
         }
 
+    def score_failed_evaluation_criteria(
+        self, criteria_name: str, failure: FailedAnalysisResult
+    ) -> CriteriaEvaluationResult:
+        """Score a criteria whose analysis failed like a low-confidence exclusion"""
+        criteria_config = self.config.evaluation_criteria[criteria_name]
+        score_multiplier = criteria_config.default_score_multiplier
+
+        return {
+            "criteria_name": criteria_name,
+            "selected_response": "",
+            "earned_points": score_multiplier * criteria_config.max_points,
+            "score_multiplier": score_multiplier,
+            "reasoning": failure.reasoning,
+            "confidence": failure.confidence,
+            "included_in_final_score": False,
+        }
+
     def score_quality_indicator(
         self,
         indicator_name: str,
@@ -109,6 +127,11 @@ class ConversationHealthScorer:
 
         all_criteria_scores = {}
         for criteria_name, evaluation in criteria_evaluations.items():
+            if isinstance(evaluation, FailedAnalysisResult):
+                all_criteria_scores[criteria_name] = (
+                    self.score_failed_evaluation_criteria(criteria_name, evaluation)
+                )
+                continue
             all_criteria_scores[criteria_name] = self.score_evaluation_criteria(
                 criteria_name,
                 evaluation.selected_response.value,
@@ -123,6 +146,11 @@ class ConversationHealthScorer:
 
         all_indicator_scores = {}
         for indicator_name, detection in quality_indicator_detections.items():
+            if isinstance(detection, FailedAnalysisResult):
+                all_indicator_scores[indicator_name] = self.score_quality_indicator(
+                    indicator_name, False, detection.confidence, detection.reasoning
+                )
+                continue
             all_indicator_scores[indicator_name] = self.score_quality_indicator(
                 indicator_name,
                 detection.detected,
@@ -151,10 +179,54 @@ class ConversationHealthScorer:
 
         # Calculate raw score and constrain to 0-100 range
         raw_score = total_criteria_points + total_indicator_adjustment
-        final_score = max(0, min(100, int(raw_score)))
+        final_score = _to_final_score(raw_score)
 
         return final_score, raw_score
 
+    def calculate_score_bounds(
+        self,
+        criteria_evaluations: CriteriaEvaluations,
+        quality_indicator_detections: QualityIndicatorDetections,
+    ) -> Tuple[int, int]:
+        """
+        Lowest and highest final score still reachable from partial results.
+        Configured criteria and indicators without a result yet may take any
+        outcome, including exclusion for low confidence.
+        """
+        _, raw_score = self.calculate_final_health_score(
+            self.score_all_evaluation_criteria(criteria_evaluations),
+            self.score_all_quality_indicators(quality_indicator_detections),
+        )
+        low = high = raw_score
+
+        for criteria_name, criteria_config in self.config.evaluation_criteria.items():
+            if criteria_name in criteria_evaluations:
+                continue
+            reachable_points = [0.0] + [
+                option.score_multiplier * criteria_config.max_points
+                for option in criteria_config.response_options.values()
+            ]
+            low += min(reachable_points)
+            high += max(reachable_points)
+
+        for indicator in self.config.quality_indicators:
+            if indicator.name in quality_indicator_detections:
+                continue
+            low += min(0.0, indicator.score_impact)
+            high += max(0.0, indicator.score_impact)
+
+        return _to_final_score(low), _to_final_score(high)
+
+    def determine_settled_health_level(
+        self, score_bounds: Tuple[int, int]
+    ) -> Optional[HealthScoreRange]:
+        """The health level if every score within the bounds shares it."""
+        low, high = score_bounds
+        for health_range in self.config.health_score_ranges.values():
+            if health_range.min_score <= low and high <= health_range.max_score:
+                return health_range
+        return None
+
     def determine_health_level(self, score: int) -> HealthScoreRange:
 
         for health_range in self.config.health_score_ranges.values():
@@ -166,6 +238,8 @@ class ConversationHealthScorer:
         self,
         criteria_results: Dict[str, CriteriaEvaluationResult],
         indicator_results: Dict[str, QualityIndicatorDetectionResult],
+        failed_criteria: Sequence[str] = (),
+        failed_indicators: Sequence[str] = (),
     ) -> ScoringUncertainty:
 
         excluded_criteria = [
@@ -184,6 +258,8 @@ class ConversationHealthScorer:
         return {
             "excluded_criteria": excluded_criteria,
             "excluded_indicators": excluded_indicators,
+            "failed_criteria": list(failed_criteria),
+            "failed_indicators": list(failed_indicators),
         }
 
     def generate_complete_health_score(
@@ -204,7 +280,10 @@ class ConversationHealthScorer:
         health_info = self.determine_health_level(final_score)
 
         uncertainty_info = self.analyze_scoring_uncertainty(
-            criteria_results, indicator_results
+            criteria_results,
+            indicator_results,
+            failed_criteria=_failed_names(criteria_evaluations),
+            failed_indicators=_failed_names(quality_indicator_detections),
         )
 
         total_criteria_points = sum(
@@ -230,3 +309,15 @@ class ConversationHealthScorer:
             "health_color": health_info.color,
             "uncertainty_info": uncertainty_info,
         }
+
+
+def _failed_names(results: Dict[str, object]) -> List[str]:
+    return [
+        name
+        for name, result in results.items()
+        if isinstance(result, FailedAnalysisResult)
+    ]
+
+
+def _to_final_score(raw_score: float) -> int:
+    return max(0, min(100, int(raw_score)))
@@ -3,19 +3,31 @@ Professional Streamlit application for conversation health analysis.
 """
 
 import streamlit as st
+import hashlib
 import json
 import os
 import sys
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 import time
 
 # Add src to path
 
 # Import your modules
-from config_manager import ConversationHealthConfigManager
+from config_manager import ConversationHealthConfigManager, compute_config_hash
 from graph_builder import create_default_conversation_health_system
-from llm import get_llm
+from llm import get_llm, configure_llm_cache, configure_llm_retry_policy
+from llm_cache import LLMResponseCache
+from llm_retry import create_llm_retry_policy_from_env
+from request_context import llm_request_scope
+from tracing import (
+    configure_trace_exporter,
+    create_trace_exporter_from_env,
+    start_trace,
+)
 from logger import get_logger
+from models import FailedAnalysisResult
 from utils import extract_health_score, extract_overall_assessment
 
 # Page config
@@ -152,24 +164,116 @@ def load_test_cases():
         return {}
 
 
+CONFIG_PATH = "config.json"
+RESULT_CACHE_SIZE = 100
+CACHED_RESULT_TIMING = {
+    "build_seconds": 0.0,
+    "analysis_seconds": 0.0,
+    "system_cached": True,
+    "result_cached": True,
+}
+
+
+@st.cache_resource(show_spinner=False)
+def load_analysis_system(config_hash: str) -> Dict[str, Any]:
+    """Build the LLM client and compiled graph once per config.json content"""
+    started = time.perf_counter()
+    logger = get_logger("conversation_health")
+    config_manager = ConversationHealthConfigManager(CONFIG_PATH)
+    config = config_manager.get_configuration()
+    llm = get_llm()
+    configure_llm_cache(
+        LLMResponseCache(
+            os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3"),
+            enabled=os.getenv("LLM_CACHE_BYPASS") is None,
+        )
+    )
+    configure_llm_retry_policy(create_llm_retry_policy_from_env())
+    configure_trace_exporter(create_trace_exporter_from_env())
+    graph = create_default_conversation_health_system(config, llm, logger)
+    return {
+        "compiled_graph": graph.compile(),
+        "build_seconds": time.perf_counter() - started,
+        "runs": 0,
+    }
+
+
+class ResultCache:
+    """
+    Least recently used completed analyses. One instance is shared by every
+    session's script thread, so all access goes through the lock.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._results.get(cache_key)
+            if result is not None:
+                self._results.move_to_end(cache_key)
+            return result
+
+    def set(self, cache_key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._results[cache_key] = result
+            self._results.move_to_end(cache_key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+
+@st.cache_resource(show_spinner=False)
+def get_result_cache() -> ResultCache:
+    """Completed analyses shared across sessions, keyed by config and transcript"""
+    return ResultCache()
+
+
+def get_result_cache_key(transcript: str) -> str:
+    transcript_hash = hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+    return f"{compute_config_hash(CONFIG_PATH)}:{transcript_hash}"
+
+
+def get_cached_result(transcript: str) -> Optional[Dict[str, Any]]:
+    return get_result_cache().get(get_result_cache_key(transcript))
+
+
 def run_analysis(transcript: str) -> Optional[Dict[str, Any]]:
     """Run the conversation health analysis"""
     try:
+        cached = get_cached_result(transcript)
+        if cached is not None:
+            st.session_state.analysis_timing = dict(CACHED_RESULT_TIMING)
+            return cached
+
         with st.spinner("🔧 Initializing Conversation Health Analysis System..."):
-            logger = get_logger("conversation_health")
-            config_manager = ConversationHealthConfigManager("config.json")
-            config = config_manager.get_configuration()
-            llm = get_llm()
-            graph = create_default_conversation_health_system(config, llm, logger)
-            compiled_graph = graph.compile()
+            build_started = time.perf_counter()
+            system = load_analysis_system(compute_config_hash(CONFIG_PATH))
+            build_seconds = time.perf_counter() - build_started
+            system["runs"] += 1
 
         with st.spinner("🔍 Running analysis..."):
-            result = compiled_graph.invoke({"transcript": transcript})
+            analysis_started = time.perf_counter()
+            with llm_request_scope(), start_trace("streamlit_analysis"):
+                result = system["compiled_graph"].invoke({"transcript": transcript})
+            analysis_seconds = time.perf_counter() - analysis_started
 
         if not result or "final_assessment" not in result:
             st.error("Invalid response format - missing final_assessment")
             return None
 
+        st.session_state.analysis_timing = {
+            "build_seconds": build_seconds,
+            "analysis_seconds": analysis_seconds,
+            "system_cached": system["runs"] > 1,
+            "result_cached": False,
+        }
+
+        # Partial results are not cached so a later run can retry failed nodes
+        if not result.get("failed_nodes"):
+            get_result_cache().set(get_result_cache_key(transcript), result)
+
         return result
 
     except Exception as e:
@@ -177,6 +281,28 @@ def run_analysis(transcript: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def display_timing_panel(timing: Dict[str, Any]):
+    """Show how long building the system and running the analysis took"""
+    with st.expander("⏱️ Timing", expanded=False):
+        build_col, analysis_col, total_col = st.columns(3)
+        build_col.metric(
+            "System build",
+            f"{timing['build_seconds']:.2f}s",
+            "cached" if timing["system_cached"] else "built",
+            delta_color="off",
+        )
+        analysis_col.metric(
+            "Analysis",
+            f"{timing['analysis_seconds']:.2f}s",
+            "cached" if timing["result_cached"] else "fresh",
+            delta_color="off",
+        )
+        total_col.metric(
+            "Total",
+            f"{timing['build_seconds'] + timing['analysis_seconds']:.2f}s",
+        )
+
+
 def get_points_info(points: float) -> tuple[str, str, str]:
     """Get points display info (text, badge class, card class)"""
     if points > 0:
@@ -294,7 +420,11 @@ def display_criteria_evaluations(final_assessment: Dict[str, Any]):
     for i, (criteria_name, evaluation) in enumerate(criteria_evaluations.items()):
         with cols[i % 2]:
             # Handle Pydantic model
-            if hasattr(evaluation, "selected_response"):
+            if isinstance(evaluation, FailedAnalysisResult):
+                selected_response = "Failed"
+                reasoning = evaluation.reasoning
+                confidence = evaluation.confidence
+            elif hasattr(evaluation, "selected_response"):
                 selected_response = evaluation.selected_response
                 reasoning = getattr(evaluation, "reasoning", "N/A")
                 confidence = getattr(evaluation, "confidence", "N/A")
@@ -362,7 +492,11 @@ def display_quality_indicators(final_assessment: Dict[str, Any]):
 
     for indicator_name, detection in quality_indicator_detections.items():
         # Handle Pydantic model
-        if hasattr(detection, "detected"):
+        if isinstance(detection, FailedAnalysisResult):
+            detected = False
+            reasoning = detection.reasoning
+            confidence = detection.confidence
+        elif hasattr(detection, "detected"):
             detected = detection.detected
             reasoning = getattr(detection, "reasoning", "No reasoning")
             confidence = getattr(detection, "confidence", "Unknown")
@@ -544,6 +678,8 @@ def main():
         st.session_state.analysis_result = None
     if "analysis_transcript" not in st.session_state:
         st.session_state.analysis_transcript = ""
+    if "analysis_timing" not in st.session_state:
+        st.session_state.analysis_timing = None
 
     # Sidebar
     with st.sidebar:
@@ -580,6 +716,16 @@ def main():
                     )
 
                     transcript = case_data.get("transcript", "")
+
+                    # Re-selecting an analyzed test case shows its cached result
+                    if transcript != st.session_state.analysis_transcript:
+                        cached = get_cached_result(transcript)
+                        if cached is not None:
+                            st.session_state.analysis_result = cached
+                            st.session_state.analysis_transcript = transcript
+                            st.session_state.analysis_timing = dict(
+                                CACHED_RESULT_TIMING
+                            )
             else:
                 st.warning("No test cases available")
 
@@ -639,6 +785,14 @@ def main():
                 "final_assessment", {}
             )
 
+            failed_nodes = st.session_state.analysis_result.get("failed_nodes", {})
+            if failed_nodes:
+                st.warning(
+                    "⚠️ Partial result: "
+                    f"{len(failed_nodes)} analysis step(s) failed and were "
+                    f"excluded from the score ({', '.join(failed_nodes)})"
+                )
+
             # Display results sections
             display_overall_score(final_assessment)
             st.markdown("---")
@@ -650,6 +804,10 @@ def main():
             st.markdown("---")
             display_quality_indicators(final_assessment)
 
+            if st.session_state.analysis_timing:
+                st.markdown("---")
+                display_timing_panel(st.session_state.analysis_timing)
+
         else:
             st.info("👆 Select an input method and click 'Analyze' to see results")
 
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Tuple, List
+from typing import Any, Dict, Optional, Tuple, List
 from logging import Logger
 from langchain_core.language_models import BaseLanguageModel
 from langgraph.graph import StateGraph
@@ -10,18 +10,35 @@ from models import (
     CriteriaAnalysisNodeOutput,
     ConversationHealthScore,
     ConversationHealthAssessment,
+    FailedAnalysisResult,
+    QualityIndicatorNodeOutput,
+    SynthesisMode,
 )
 from prompts import (
     get_concern_identification_prompt,
     get_concern_resolution_prompt,
+    get_single_pass_concern_analysis_prompt,
     get_health_assessment_synthesis_prompt,
 )
-from pydantic_model_creators import create_evaluation_criteria_model
-from llm import call_llm_structured, call_llm
+from pydantic_model_creators import (
+    create_evaluation_criteria_model,
+    create_single_pass_concern_analysis_model,
+)
+from llm import call_llm_structured, call_llm, acall_llm_structured, acall_llm
+from node_builders import create_graph_node, failed_results
 from score_calculator import ConversationHealthScorer
+from synthesis_cache import SynthesisCache
+from template_synthesis import TemplateSynthesizer
+from derived_indicators import get_derived_indicator, get_derived_indicator_reads
+from transcript_metrics import parse_transcript
 
 
 class BaseSubgraphCreator(ABC):
+    # State keys this subgraph consumes and produces; used to wire subgraphs
+    # by their data dependencies instead of a fixed sequence.
+    reads: Tuple[str, ...] = ("transcript",)
+    writes: Tuple[str, ...] = ()
+
     def __init__(
         self, config: ConversationHealthConfig, llm: BaseLanguageModel, logger: Logger
     ):
@@ -35,17 +52,68 @@ class BaseSubgraphCreator(ABC):
         pass
 
 
-class ScoringSynthesisSubgraphCreator(BaseSubgraphCreator):
+class TranscriptIndexSubgraphCreator(BaseSubgraphCreator):
+    """Parses the transcript once into the turn index used by local metrics."""
+
+    reads = ("transcript",)
+    writes = ("transcript_index",)
+
     def create_subgraph(self) -> Tuple[StateGraph, str, List[str]]:
         subgraph = StateGraph(ConversationAnalysisState)
-        entry_node = "calculate_health_score"
-        end_nodes = ["synthesize_final_assessment"]
+        node_name = "index_transcript"
 
-        subgraph.add_node(entry_node, self._calculate_conversation_health_score)
+        subgraph.add_node(node_name, self._index_transcript)
+        subgraph.set_entry_point(node_name)
 
-        subgraph.add_node(end_nodes[0], self._synthesize_health_assessment)
+        return subgraph, node_name, [node_name]
+
+    @staticmethod
+    def _index_transcript(state: ConversationAnalysisState) -> Dict[str, Any]:
+        return {"transcript_index": parse_transcript(state.transcript)}
+
+
+class ScoringSynthesisSubgraphCreator(BaseSubgraphCreator):
+    """
+    Scores the analysis results and writes the overall assessment. Without
+    `include_assessment` the subgraph ends at the score, and the assessment can
+    be written later with `write_assessment`.
+    """
+
+    reads = ("criteria_evaluations", "quality_indicator_detections")
+    writes = ("health_score", "final_assessment")
+
+    def __init__(
+        self,
+        config: ConversationHealthConfig,
+        llm: BaseLanguageModel,
+        logger: Logger,
+        include_assessment: bool = True,
+    ):
+        super().__init__(config, llm, logger)
+        self.include_assessment = include_assessment
+        if not include_assessment:
+            self.writes = ("health_score",)
+        self.synthesis_cache = SynthesisCache(config.execution.synthesis_cache)
+        self.template_synthesizer = TemplateSynthesizer(config)
 
+    def create_subgraph(self) -> Tuple[StateGraph, str, List[str]]:
+        subgraph = StateGraph(ConversationAnalysisState)
+        entry_node = "calculate_health_score"
+        subgraph.add_node(entry_node, self._calculate_conversation_health_score)
         subgraph.set_entry_point(entry_node)
+        if not self.include_assessment:
+            return subgraph, entry_node, [entry_node]
+
+        end_nodes = ["synthesize_final_assessment"]
+        subgraph.add_node(
+            end_nodes[0],
+            create_graph_node(
+                self._synthesize_health_assessment,
+                self._asynthesize_health_assessment,
+                fallback=self._synthesis_fallback,
+                logger=self.logger,
+            ),
+        )
         subgraph.add_edge(entry_node, end_nodes[0])
 
         return subgraph, entry_node, end_nodes
@@ -60,12 +128,80 @@ class ScoringSynthesisSubgraphCreator(BaseSubgraphCreator):
         )
         return {"health_score": health_score}
 
+    def _synthesis_prompt(self, health_score: ConversationHealthScore) -> str:
+        # Reused assessments are written from the cache key's outcome only
+        if self.synthesis_cache.enabled:
+            return self.synthesis_cache.build_prompt(health_score)
+        return get_health_assessment_synthesis_prompt(health_score)
+
+    def resolve_synthesis_mode(
+        self, synthesis_mode: Optional[SynthesisMode] = None
+    ) -> SynthesisMode:
+        """The mode an assessment is written in; the config's by default."""
+        return synthesis_mode or self.config.execution.synthesis_mode
+
+    def write_assessment(
+        self,
+        health_score: ConversationHealthScore,
+        synthesis_mode: Optional[SynthesisMode] = None,
+    ) -> str:
+        """Write the overall assessment text for a calculated health score."""
+        synthesis_mode = self.resolve_synthesis_mode(synthesis_mode)
+        if synthesis_mode == SynthesisMode.TEMPLATE:
+            return self.template_synthesizer.synthesize(health_score)
+        assessment_content = self.synthesis_cache.get(health_score, self.llm)
+        if assessment_content is None:
+            synthesis_prompt = self._synthesis_prompt(health_score)
+            assessment_content = call_llm(synthesis_prompt, self.llm, self.logger)
+            self.synthesis_cache.set(health_score, self.llm, assessment_content)
+        return assessment_content
+
+    async def awrite_assessment(
+        self,
+        health_score: ConversationHealthScore,
+        synthesis_mode: Optional[SynthesisMode] = None,
+    ) -> str:
+        synthesis_mode = self.resolve_synthesis_mode(synthesis_mode)
+        if synthesis_mode == SynthesisMode.TEMPLATE:
+            return self.template_synthesizer.synthesize(health_score)
+        assessment_content = self.synthesis_cache.get(health_score, self.llm)
+        if assessment_content is None:
+            synthesis_prompt = self._synthesis_prompt(health_score)
+            assessment_content = await acall_llm(
+                synthesis_prompt, self.llm, self.logger
+            )
+            self.synthesis_cache.set(health_score, self.llm, assessment_content)
+        return assessment_content
+
     def _synthesize_health_assessment(
         self,
         state: ConversationAnalysisState,
     ) -> Dict[str, ConversationHealthAssessment]:
-        synthesis_prompt = get_health_assessment_synthesis_prompt(state.health_score)
-        assessment_content = call_llm(synthesis_prompt, self.llm, self.logger)
+        return self._build_final_assessment(
+            state, self.write_assessment(state.health_score, state.synthesis_mode)
+        )
+
+    async def _asynthesize_health_assessment(
+        self,
+        state: ConversationAnalysisState,
+    ) -> Dict[str, ConversationHealthAssessment]:
+        assessment_content = await self.awrite_assessment(
+            state.health_score, state.synthesis_mode
+        )
+        return self._build_final_assessment(state, assessment_content)
+
+    def _synthesis_fallback(
+        self, state: ConversationAnalysisState, error: Exception
+    ) -> Dict[str, ConversationHealthAssessment]:
+        return self._build_final_assessment(
+            state,
+            "The written assessment could not be generated; "
+            "the scores above are unaffected.",
+        )
+
+    def _build_final_assessment(
+        self, state: ConversationAnalysisState, assessment_content: str
+    ) -> Dict[str, ConversationHealthAssessment]:
         return {
             "final_assessment": {
                 "criteria_evaluations": state.criteria_evaluations,
@@ -78,13 +214,35 @@ class ScoringSynthesisSubgraphCreator(BaseSubgraphCreator):
 
 
 class ConcernAnalysisSubgraphCreator(BaseSubgraphCreator):
+    reads = ("transcript",)
+    writes = ("identified_concerns", "criteria_evaluations")
+
     def create_subgraph(self) -> Tuple[StateGraph, str, List[str]]:
+        if self.config.execution.single_pass_concern_analysis:
+            return self._create_single_pass_subgraph()
+
         subgraph = StateGraph(ConversationAnalysisState)
         entry_node = "identify_conversation_concerns"
         end_nodes = ["analyze_concern_handling"]
 
-        subgraph.add_node(entry_node, self._identify_concerns)
-        subgraph.add_node(end_nodes[0], self._analyze_concern_handling)
+        subgraph.add_node(
+            entry_node,
+            create_graph_node(
+                self._identify_concerns,
+                self._aidentify_concerns,
+                fallback=self._concern_handling_fallback,
+                logger=self.logger,
+            ),
+        )
+        subgraph.add_node(
+            end_nodes[0],
+            create_graph_node(
+                self._analyze_concern_handling,
+                self._aanalyze_concern_handling,
+                fallback=self._concern_handling_fallback,
+                logger=self.logger,
+            ),
+        )
 
         subgraph.set_entry_point(entry_node)
         subgraph.add_edge(entry_node, end_nodes[0])
@@ -98,9 +256,87 @@ class ConcernAnalysisSubgraphCreator(BaseSubgraphCreator):
         result = call_llm_structured(prompt, IdentifiedConcerns, self.llm, self.logger)
         return {"identified_concerns": result}
 
+    async def _aidentify_concerns(
+        self, state: ConversationAnalysisState
+    ) -> Dict[str, IdentifiedConcerns]:
+        prompt = get_concern_identification_prompt(state.transcript)
+        result = await acall_llm_structured(
+            prompt, IdentifiedConcerns, self.llm, self.logger
+        )
+        return {"identified_concerns": result}
+
+    def _create_single_pass_subgraph(self) -> Tuple[StateGraph, str, List[str]]:
+        subgraph = StateGraph(ConversationAnalysisState)
+        node_name = "analyze_concerns"
+
+        subgraph.add_node(
+            node_name,
+            create_graph_node(
+                self._analyze_concerns_single_pass,
+                self._aanalyze_concerns_single_pass,
+                fallback=self._concern_handling_fallback,
+                logger=self.logger,
+            ),
+        )
+        subgraph.set_entry_point(node_name)
+
+        return subgraph, node_name, [node_name]
+
+    def _analyze_concerns_single_pass(
+        self, state: ConversationAnalysisState
+    ) -> Dict[str, Any]:
+        concern_handling_config = self.config.evaluation_criteria[
+            "concern_handling_quality"
+        ]
+        model = create_single_pass_concern_analysis_model(concern_handling_config)
+        prompt = get_single_pass_concern_analysis_prompt(
+            concern_handling_config, state.transcript
+        )
+        result = call_llm_structured(prompt, model, self.llm, self.logger)
+        return self._split_single_pass_result(result)
+
+    async def _aanalyze_concerns_single_pass(
+        self, state: ConversationAnalysisState
+    ) -> Dict[str, Any]:
+        concern_handling_config = self.config.evaluation_criteria[
+            "concern_handling_quality"
+        ]
+        model = create_single_pass_concern_analysis_model(concern_handling_config)
+        prompt = get_single_pass_concern_analysis_prompt(
+            concern_handling_config, state.transcript
+        )
+        result = await acall_llm_structured(prompt, model, self.llm, self.logger)
+        return self._split_single_pass_result(result)
+
+    @staticmethod
+    def _split_single_pass_result(result: Any) -> Dict[str, Any]:
+        return {
+            "identified_concerns": IdentifiedConcerns(concerns=result.concerns),
+            "criteria_evaluations": {
+                "concern_handling_quality": result.concern_handling_quality
+            },
+        }
+
+    @staticmethod
+    def _concern_handling_fallback(
+        state: ConversationAnalysisState, error: Exception
+    ) -> CriteriaAnalysisNodeOutput:
+        return {
+            "criteria_evaluations": failed_results(["concern_handling_quality"], error)
+        }
+
+    @staticmethod
+    def _concern_identification_failed(state: ConversationAnalysisState) -> bool:
+        return isinstance(
+            state.criteria_evaluations.get("concern_handling_quality"),
+            FailedAnalysisResult,
+        )
+
     def _analyze_concern_handling(
         self, state: ConversationAnalysisState
     ) -> CriteriaAnalysisNodeOutput:
+        if self._concern_identification_failed(state):
+            return {}
         model = create_evaluation_criteria_model(
             self.config.evaluation_criteria["concern_handling_quality"]
         )
@@ -108,8 +344,37 @@ class ConcernAnalysisSubgraphCreator(BaseSubgraphCreator):
         result = call_llm_structured(prompt, model, self.llm, self.logger)
         return {"criteria_evaluations": {"concern_handling_quality": result}}
 
+    async def _aanalyze_concern_handling(
+        self, state: ConversationAnalysisState
+    ) -> CriteriaAnalysisNodeOutput:
+        if self._concern_identification_failed(state):
+            return {}
+        model = create_evaluation_criteria_model(
+            self.config.evaluation_criteria["concern_handling_quality"]
+        )
+        prompt = get_concern_resolution_prompt(state.identified_concerns)
+        result = await acall_llm_structured(prompt, model, self.llm, self.logger)
+        return {"criteria_evaluations": {"concern_handling_quality": result}}
+
 
 class ConfigBasedEvaluationSubgraphCreator(BaseSubgraphCreator):
+    reads = ("transcript",)
+    writes = ("criteria_evaluations", "quality_indicator_detections")
+
+    def __init__(
+        self, config: ConversationHealthConfig, llm: BaseLanguageModel, logger: Logger
+    ):
+        super().__init__(config, llm, logger)
+        uses_transcript_metrics = any(
+            criteria.is_config_based and criteria.uses_transcript_metrics
+            for criteria in config.evaluation_criteria.values()
+        ) or any(
+            indicator.derivation is None and indicator.uses_transcript_metrics
+            for indicator in config.quality_indicators
+        )
+        if uses_transcript_metrics:
+            self.reads = ("transcript", "transcript_index")
+
     def create_subgraph(self) -> Tuple[StateGraph, str, List[str]]:
         from node_builders import (
             EvaluationCriteriaNodeBuilder,
@@ -128,28 +393,160 @@ class ConfigBasedEvaluationSubgraphCreator(BaseSubgraphCreator):
 
         # Add evaluation criteria nodes
         evaluation_nodes = []
-        for name, config in self.config.evaluation_criteria.items():
-            if config.is_config_based:
-                node_name = f"evaluate_{name}"
-                subgraph.add_node(
-                    node_name, criteria_builder.create_evaluation_node(config)
-                )
+        config_based_criteria = [
+            config
+            for config in self.config.evaluation_criteria.values()
+            if config.is_config_based
+        ]
+        if self.config.execution.fuse_evaluation_criteria and config_based_criteria:
+            node_name = "evaluate_criteria"
+            subgraph.add_node(
+                node_name,
+                criteria_builder.create_fused_graph_node(config_based_criteria),
+            )
+            evaluation_nodes.append(node_name)
+            end_nodes.append(node_name)
+        else:
+            for config in config_based_criteria:
+                node_name = f"evaluate_{config.name}"
+                subgraph.add_node(node_name, criteria_builder.create_graph_node(config))
                 evaluation_nodes.append(node_name)
                 end_nodes.append(node_name)
 
-        # Add quality indicator nodes
+        # Add quality indicator nodes; derived indicators need no LLM call
         indicator_nodes = []
-        for indicator in self.config.quality_indicators:
-            node_name = f"detect_{indicator.name}"
+        llm_indicators = [
+            indicator
+            for indicator in self.config.quality_indicators
+            if indicator.derivation is None
+        ]
+        if self.config.execution.fuse_quality_indicators and llm_indicators:
+            node_name = "detect_quality_indicators"
             subgraph.add_node(
-                node_name, indicator_builder.create_detection_node(indicator)
+                node_name,
+                indicator_builder.create_fused_graph_node(llm_indicators),
             )
             indicator_nodes.append(node_name)
             end_nodes.append(node_name)
+        else:
+            for indicator in llm_indicators:
+                node_name = f"detect_{indicator.name}"
+                subgraph.add_node(
+                    node_name, indicator_builder.create_graph_node(indicator)
+                )
+                indicator_nodes.append(node_name)
+                end_nodes.append(node_name)
+
+        # Connect entry node to all evaluation and indicator nodes; in triage
+        # mode the indicator nodes wait for the triage call instead
+        indicator_source = entry_node
+        if self.config.execution.triage_quality_indicators and llm_indicators:
+            indicator_source = "triage_quality_indicators"
+            subgraph.add_node(
+                indicator_source,
+                indicator_builder.create_triage_graph_node(llm_indicators),
+            )
+            subgraph.add_edge(entry_node, indicator_source)
 
-        # Connect entry node to all evaluation and indicator nodes
-        for node in evaluation_nodes + indicator_nodes:
+        for node in evaluation_nodes:
             subgraph.add_edge(entry_node, node)
+        for node in indicator_nodes:
+            subgraph.add_edge(indicator_source, node)
 
         subgraph.set_entry_point(entry_node)
         return subgraph, entry_node, end_nodes
+
+
+class DerivedIndicatorSubgraphCreator(BaseSubgraphCreator):
+    """Computes indicators declared with a `derivation` from earlier results."""
+
+    reads = ("identified_concerns",)
+    writes = ("quality_indicator_detections",)
+
+    def __init__(
+        self, config: ConversationHealthConfig, llm: BaseLanguageModel, logger: Logger
+    ):
+        super().__init__(config, llm, logger)
+        derived_configs = [
+            indicator
+            for indicator in config.quality_indicators
+            if indicator.derivation is not None
+        ]
+        self.derived_indicators = {
+            indicator.name: get_derived_indicator(indicator.derivation)
+            for indicator in derived_configs
+        }
+        self.derivation_reads = {
+            indicator.name: get_derived_indicator_reads(indicator.derivation)
+            for indicator in derived_configs
+        }
+        self.reads = tuple(
+            dict.fromkeys(
+                key for reads in self.derivation_reads.values() for key in reads
+            )
+        )
+
+    def create_subgraph(self) -> Tuple[StateGraph, str, List[str]]:
+        subgraph = StateGraph(ConversationAnalysisState)
+        node_name = "derive_quality_indicators"
+
+        subgraph.add_node(
+            node_name,
+            create_graph_node(
+                self._derive_quality_indicators,
+                self._aderive_quality_indicators,
+                fallback=self._derivation_fallback,
+                logger=self.logger,
+            ),
+        )
+        subgraph.set_entry_point(node_name)
+
+        return subgraph, node_name, [node_name]
+
+    @staticmethod
+    def _failed_reads(state: ConversationAnalysisState) -> List[str]:
+        # Concern handling also fails when only the resolution analysis did;
+        # the identified concerns are intact then
+        concern_handling = state.criteria_evaluations.get("concern_handling_quality")
+        if (
+            isinstance(concern_handling, FailedAnalysisResult)
+            and "analyze_concern_handling" not in state.failed_nodes
+        ):
+            return ["identified_concerns"]
+        return []
+
+    def _derive_quality_indicators(
+        self, state: ConversationAnalysisState
+    ) -> QualityIndicatorNodeOutput:
+        # Without its input data there is nothing to derive an indicator from
+        failed_reads = self._failed_reads(state)
+        failed = [
+            name
+            for name, reads in self.derivation_reads.items()
+            if any(key in failed_reads for key in reads)
+        ]
+
+        return {
+            "quality_indicator_detections": {
+                **failed_results(failed, RuntimeError("concern analysis failed")),
+                **{
+                    name: derive(state)
+                    for name, derive in self.derived_indicators.items()
+                    if name not in failed
+                },
+            }
+        }
+
+    async def _aderive_quality_indicators(
+        self, state: ConversationAnalysisState
+    ) -> QualityIndicatorNodeOutput:
+        return self._derive_quality_indicators(state)
+
+    def _derivation_fallback(
+        self, state: ConversationAnalysisState, error: Exception
+    ) -> QualityIndicatorNodeOutput:
+        return {
+            "quality_indicator_detections": failed_results(
+                list(self.derived_indicators), error
+            )
+        }
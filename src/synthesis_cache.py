@@ -0,0 +1,99 @@
+import json
+from typing import Optional
+from langchain_core.language_models import BaseLanguageModel
+from llm import get_llm_cache
+from models import ConversationHealthScore, SynthesisCachePolicy
+from prompts import get_outcome_synthesis_prompt
+
+# v2: entries are written from the outcome alone; v1 texts may carry the
+# details of the conversation that produced them
+SYNTHESIS_KEY_PREFIX = "synthesis-outcome:v2:"
+
+
+def build_synthesis_outcome(
+    health_score: ConversationHealthScore, include_reasoning: bool = False
+) -> dict:
+    """
+    The categorical outcome of a score: the health level, each criteria's
+    selected response and each indicator's detection, plus whether each
+    counted towards the score. Free-text reasoning is only included when
+    `include_reasoning` is set.
+    """
+
+    def outcome(categorical: list, result: dict) -> list:
+        return categorical + [result["reasoning"]] if include_reasoning else categorical
+
+    return {
+        "health_level": health_score["health_level"],
+        "criteria": {
+            name: outcome(
+                [result["selected_response"], result["included_in_final_score"]],
+                result,
+            )
+            for name, result in health_score["criteria_results"].items()
+        },
+        "indicators": {
+            name: outcome(
+                [result["pattern_detected"], result["included_in_final_score"]],
+                result,
+            )
+            for name, result in health_score["indicator_results"].items()
+        },
+        "include_reasoning": include_reasoning,
+    }
+
+
+def build_synthesis_outcome_key(
+    health_score: ConversationHealthScore, include_reasoning: bool = False
+) -> str:
+    """Canonical encoding of a score's categorical outcome."""
+    return SYNTHESIS_KEY_PREFIX + json.dumps(
+        build_synthesis_outcome(health_score, include_reasoning), sort_keys=True
+    )
+
+
+class SynthesisCache:
+    """
+    Reuses written assessments across conversations with the same outcome.
+    Entries live in the configured LLM response cache under the outcome key
+    instead of the full synthesis prompt. While caching, assessments are
+    written from the outcome alone, so a reused text only states what every
+    conversation sharing the key has in common.
+    """
+
+    def __init__(self, policy: SynthesisCachePolicy):
+        self.policy = policy
+        self.include_reasoning = policy == SynthesisCachePolicy.OUTCOMES_AND_REASONING
+
+    @property
+    def enabled(self) -> bool:
+        return self.policy != SynthesisCachePolicy.DISABLED
+
+    def build_prompt(self, health_score: ConversationHealthScore) -> str:
+        """Synthesis prompt holding only what the cache key holds."""
+        return get_outcome_synthesis_prompt(
+            build_synthesis_outcome(health_score, self.include_reasoning)
+        )
+
+    def _key(self, health_score: ConversationHealthScore) -> Optional[str]:
+        if not self.enabled or get_llm_cache() is None:
+            return None
+        return build_synthesis_outcome_key(health_score, self.include_reasoning)
+
+    def get(
+        self, health_score: ConversationHealthScore, llm: BaseLanguageModel
+    ) -> Optional[str]:
+        key = self._key(health_score)
+        if key is None:
+            return None
+        return get_llm_cache().get(key, llm)
+
+    def set(
+        self,
+        health_score: ConversationHealthScore,
+        llm: BaseLanguageModel,
+        assessment: str,
+    ) -> None:
+        key = self._key(health_score)
+        if key is not None:
+            get_llm_cache().set(key, llm, assessment)
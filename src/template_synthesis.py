@@ -0,0 +1,126 @@
+from typing import List, NamedTuple
+from models import (
+    ConversationHealthConfig,
+    ConversationHealthScore,
+    QualityIndicatorType,
+)
+
+# Recommendations listed for conversations with issues, like the LLM prompt asks
+MAX_RECOMMENDATIONS = 3
+
+SEVERITY_ORDER = {
+    QualityIndicatorType.CRITICAL: 0,
+    QualityIndicatorType.WARNING: 1,
+    QualityIndicatorType.POSITIVE: 2,
+    QualityIndicatorType.INFO: 3,
+}
+
+
+class AssessmentSnippet(NamedTuple):
+    """Config-declared text for one result, with what ranks it"""
+
+    severity: QualityIndicatorType
+    score_impact: float
+    text: str
+
+    @property
+    def is_issue(self) -> bool:
+        return self.severity in (
+            QualityIndicatorType.CRITICAL,
+            QualityIndicatorType.WARNING,
+        )
+
+    def sort_key(self):
+        # Most severe first; within a severity, largest point loss first for
+        # issues and largest gain first for strengths
+        impact = self.score_impact if self.is_issue else -self.score_impact
+        return (SEVERITY_ORDER[self.severity], impact)
+
+
+class TemplateSynthesizer:
+    """
+    Writes the overall assessment from config-declared recommendation
+    snippets instead of an LLM call. Detected indicators contribute their
+    snippet with their configured severity; criteria contribute the snippet of
+    the selected response, as an issue when it cost points.
+    """
+
+    def __init__(self, config: ConversationHealthConfig):
+        self.config = config
+        self.indicators = {
+            indicator.name: indicator for indicator in config.quality_indicators
+        }
+        self.health_ranges = {
+            health_range.label: health_range
+            for health_range in config.health_score_ranges.values()
+        }
+
+    def collect_snippets(
+        self, health_score: ConversationHealthScore
+    ) -> List[AssessmentSnippet]:
+        snippets = []
+        for name, result in health_score["indicator_results"].items():
+            indicator = self.indicators.get(name)
+            if (
+                indicator is None
+                or indicator.recommendation is None
+                or not result["pattern_detected"]
+                or not result["included_in_final_score"]
+            ):
+                continue
+            snippets.append(
+                AssessmentSnippet(
+                    indicator.type, indicator.score_impact, indicator.recommendation
+                )
+            )
+
+        for name, result in health_score["criteria_results"].items():
+            criteria = self.config.evaluation_criteria.get(name)
+            if criteria is None or not result["included_in_final_score"]:
+                continue
+            option = criteria.response_options.get(result["selected_response"])
+            if option is None or option.recommendation is None:
+                continue
+            points_lost = criteria.max_points - result["earned_points"]
+            snippets.append(
+                AssessmentSnippet(
+                    (
+                        QualityIndicatorType.WARNING
+                        if points_lost > 0
+                        else QualityIndicatorType.POSITIVE
+                    ),
+                    -points_lost,
+                    option.recommendation,
+                )
+            )
+        return sorted(snippets, key=AssessmentSnippet.sort_key)
+
+    def synthesize(self, health_score: ConversationHealthScore) -> str:
+        health_range = self.health_ranges.get(health_score["health_level"])
+        summary = (
+            f"{health_score['health_level']} conversation "
+            f"({health_score['final_score']}/100)"
+        )
+        if health_range is not None:
+            summary += f": {health_range.description}."
+        else:
+            summary += "."
+
+        snippets = self.collect_snippets(health_score)
+        issues = [snippet for snippet in snippets if snippet.is_issue]
+        strengths = [snippet for snippet in snippets if not snippet.is_issue]
+
+        # Effective conversations get a single sentence about their strengths
+        if not issues:
+            return f"{summary} {strengths[0].text}" if strengths else summary
+
+        recommendations = (issues + strengths)[:MAX_RECOMMENDATIONS]
+        lines = [summary] + [f"- {snippet.text}" for snippet in recommendations]
+
+        uncertainty = health_score.get("uncertainty_info") or {}
+        failed = uncertainty.get("failed_criteria", []) + uncertainty.get(
+            "failed_indicators", []
+        )
+        if failed:
+            lines.append(f"Not assessed due to analysis failures: {', '.join(failed)}.")
+        return "\n".join(lines)
@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# Tolerance when matching a node's start to the end of the node it waited on
+CRITICAL_PATH_SLACK_SECONDS = 0.005
+
+
+class Span:
+    """
+    One timed operation in an analysis trace, shaped like an OpenTelemetry
+    span: ids, parent, name, kind, start/end times, attributes and status.
+    """
+
+    def __init__(
+        self,
+        trace_id: str,
+        name: str,
+        kind: str,
+        parent_span_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_to_attribute(self, key: str, amount: float) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def set_error(self, error: Any) -> None:
+        self.status = "error"
+        self.attributes["error"] = repr(error)
+
+    def end(self) -> None:
+        if self.end_time is None:
+            self.end_time = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_seconds": (
+                self.end_time - self.start_time if self.end_time is not None else None
+            ),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan(Span):
+    """Stand-in yielded outside a trace so callers need no None checks."""
+
+    def __init__(self):
+        super().__init__("", "noop", "noop")
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_to_attribute(self, key: str, amount: float) -> None:
+        pass
+
+    def set_error(self, error: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """All spans recorded for one analysis."""
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def start_span(
+        self,
+        name: str,
+        kind: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Span:
+        span = Span(
+            self.trace_id,
+            name,
+            kind,
+            parent.span_id if parent is not None else None,
+            attributes,
+        )
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+
+class JsonlTraceExporter:
+    """Appends finished traces to a local JSONL file, one span per line."""
+
+    def __init__(self, path: str = "traces.jsonl"):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        lines = "".join(
+            json.dumps(span.to_dict(), default=str) + "\n" for span in trace.spans
+        )
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(lines)
+
+
+_exporter: Optional[JsonlTraceExporter] = None
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("analysis_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar(
+    "analysis_trace_span", default=None
+)
+
+
+def configure_trace_exporter(exporter: Optional[JsonlTraceExporter]) -> None:
+    """Install (or remove, with None) the exporter; tracing is off without one."""
+    global _exporter
+    _exporter = exporter
+
+
+def get_trace_exporter() -> Optional[JsonlTraceExporter]:
+    return _exporter
+
+
+def create_trace_exporter_from_env() -> Optional[JsonlTraceExporter]:
+    """JSONL exporter writing to TRACE_EXPORT_PATH; None when it is unset."""
+    path = os.getenv("TRACE_EXPORT_PATH")
+    return JsonlTraceExporter(path) if path else None
+
+
+def get_current_span() -> Span:
+    return _current_span.get() or NOOP_SPAN
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Optional[Trace]]:
+    """
+    Trace everything run inside this scope under one root span, exporting
+    the trace when the scope ends. Yields None when no exporter is installed.
+    """
+    if _exporter is None:
+        yield None
+        return
+
+    trace = Trace()
+    trace_token = _current_trace.set(trace)
+    try:
+        with trace_span(name, "request", **attributes):
+            yield trace
+    finally:
+        _current_trace.reset(trace_token)
+        _exporter.export(trace)
+
+
+@contextmanager
+def trace_span(name: str, kind: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Record a child of the current span. Outside a trace nothing is recorded
+    and a no-op span is yielded.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield NOOP_SPAN
+        return
+
+    span = trace.start_span(name, kind, _current_span.get(), attributes)
+    span_token = _current_span.set(span)
+    try:
+        yield span
+    except Exception as error:
+        span.set_error(error)
+        raise
+    finally:
+        _current_span.reset(span_token)
+        span.end()
+
+
+def load_traces(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Spans from a JSONL export grouped by trace id, in file order."""
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    if not os.path.exists(path):
+        return traces
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces.setdefault(span["trace_id"], []).append(span)
+    return traces
+
+
+def critical_path(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Node spans that determined the trace's duration. Starting from the node
+    that finished last, repeatedly step to the node that finished last before
+    the current one started: the dependency it was waiting on.
+    """
+    nodes = [
+        span
+        for span in spans
+        if span["kind"] == "node" and span["end_time"] is not None
+    ]
+    if not nodes:
+        return []
+
+    path = [max(nodes, key=lambda span: span["end_time"])]
+    while True:
+        current = path[-1]
+        started_at = current["start_time"]
+        # A dependency started clearly earlier; nodes of the same step start
+        # together, so near-instant siblings are not mistaken for one
+        predecessors = [
+            span
+            for span in nodes
+            if span["end_time"] <= started_at + CRITICAL_PATH_SLACK_SECONDS
+            and span["start_time"] < started_at - CRITICAL_PATH_SLACK_SECONDS
+        ]
+        if not predecessors:
+            break
+        path.append(max(predecessors, key=lambda span: span["end_time"]))
+    return list(reversed(path))
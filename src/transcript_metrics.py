@@ -0,0 +1,170 @@
+import re
+from typing import Dict, List, Optional
+from typing_extensions import TypedDict
+from models import ConversationAnalysisState, TranscriptIndex
+
+# "Label: text" at the start of a line, with a name-like label (so times and
+# URLs never match); every speaker label starts a turn, other lines continue
+# the current one
+TURN_PATTERN = re.compile(
+    r"^[ \t]*([^\W\d_][\w .'()-]{0,39}?)[ \t]*:(?!//)[ \t]*(.*)$", re.MULTILINE
+)
+WORD_PATTERN = re.compile(r"\S+")
+
+# Line labels that annotate a transcript rather than name a speaker
+NON_SPEAKER_LABEL_PATTERN = re.compile(
+    r"^(note|notes|nb|n\.b\.|ps|p\.s\.|fyi|edit|update|summary|subject|"
+    r"example|tip|warning|important|step \d+)$",
+    re.IGNORECASE,
+)
+
+
+class TranscriptMetrics(TypedDict):
+    """Deterministic conversation metrics measured from a transcript index"""
+
+    turn_counts: Dict[str, int]
+    word_share: Dict[str, float]
+    questions_asked: Dict[str, int]
+    unanswered_questions: Dict[str, int]
+    length_trend: Dict[str, Optional[float]]
+
+
+def is_speaker_label(label: str) -> bool:
+    return not NON_SPEAKER_LABEL_PATTERN.match(label)
+
+
+def parse_transcript(transcript: str) -> TranscriptIndex:
+    """Split a "Speaker: text" transcript into a turn index."""
+    matches = [
+        match
+        for match in TURN_PATTERN.finditer(transcript)
+        if is_speaker_label(match.group(1).strip())
+    ]
+    index = TranscriptIndex()
+    for position, match in enumerate(matches):
+        start = match.start(2)
+        end = (
+            matches[position + 1].start()
+            if position + 1 < len(matches)
+            else len(transcript)
+        )
+        text = transcript[start:end].rstrip()
+        index.speakers.append(match.group(1).strip())
+        index.starts.append(start)
+        index.ends.append(start + len(text))
+        index.word_counts.append(len(WORD_PATTERN.findall(text)))
+        index.is_question.append("?" in text)
+    return index
+
+
+def get_transcript_index(state: ConversationAnalysisState) -> TranscriptIndex:
+    """The index built by the graph, or a fresh one when running outside it."""
+    if state.transcript_index is not None:
+        return state.transcript_index
+    return parse_transcript(state.transcript)
+
+
+def turn_counts(index: TranscriptIndex) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for speaker in index.speakers:
+        counts[speaker] = counts.get(speaker, 0) + 1
+    return counts
+
+
+def word_share(index: TranscriptIndex) -> Dict[str, float]:
+    """Fraction of all words spoken by each speaker."""
+    total_words = sum(index.word_counts)
+    words: Dict[str, int] = {}
+    for speaker, count in zip(index.speakers, index.word_counts):
+        words[speaker] = words.get(speaker, 0) + count
+    return {
+        speaker: count / total_words if total_words else 0.0
+        for speaker, count in words.items()
+    }
+
+
+def questions_asked(index: TranscriptIndex) -> Dict[str, int]:
+    counts = {speaker: 0 for speaker in index.speakers}
+    for speaker, is_question in zip(index.speakers, index.is_question):
+        counts[speaker] += is_question
+    return counts
+
+
+def unanswered_questions(index: TranscriptIndex) -> Dict[str, int]:
+    """
+    Questions per speaker that got no reply from someone else: the next turn
+    is by the same speaker, or the conversation ends.
+    """
+    counts = {speaker: 0 for speaker in index.speakers}
+    next_speakers = index.speakers[1:] + [None]
+    for speaker, next_speaker, is_question in zip(
+        index.speakers, next_speakers, index.is_question
+    ):
+        if is_question and next_speaker in (None, speaker):
+            counts[speaker] += 1
+    return counts
+
+
+def length_trend(index: TranscriptIndex) -> Dict[str, Optional[float]]:
+    """
+    Average words per turn in the second half of each speaker's turns divided
+    by the first half; None for speakers with a single turn.
+    """
+    lengths: Dict[str, List[int]] = {}
+    for speaker, count in zip(index.speakers, index.word_counts):
+        lengths.setdefault(speaker, []).append(count)
+
+    trends: Dict[str, Optional[float]] = {}
+    for speaker, counts in lengths.items():
+        half = len(counts) // 2
+        if half == 0:
+            trends[speaker] = None
+            continue
+        first_half = sum(counts[:half]) / half
+        second_half = sum(counts[-half:]) / half
+        trends[speaker] = second_half / first_half if first_half else None
+    return trends
+
+
+def compute_transcript_metrics(index: TranscriptIndex) -> TranscriptMetrics:
+    return {
+        "turn_counts": turn_counts(index),
+        "word_share": word_share(index),
+        "questions_asked": questions_asked(index),
+        "unanswered_questions": unanswered_questions(index),
+        "length_trend": length_trend(index),
+    }
+
+
+def format_transcript_facts(metrics: TranscriptMetrics) -> str:
+    """Render metrics as prompt lines the LLM can rely on instead of counting."""
+    if not metrics["turn_counts"]:
+        return ""
+
+    def per_speaker(values: Dict, render) -> str:
+        return ", ".join(
+            f"{speaker}: {render(value)}" for speaker, value in values.items()
+        )
+
+    trends = {
+        speaker: trend
+        for speaker, trend in metrics["length_trend"].items()
+        if trend is not None
+    }
+    lines = [
+        f"- Turns: {per_speaker(metrics['turn_counts'], str)}",
+        "- Share of words: "
+        + per_speaker(metrics["word_share"], lambda share: f"{share:.0%}"),
+        "- Questions asked: "
+        + ", ".join(
+            f"{speaker}: {asked} ({metrics['unanswered_questions'][speaker]} "
+            "unanswered)"
+            for speaker, asked in metrics["questions_asked"].items()
+        ),
+    ]
+    if trends:
+        lines.append(
+            "- Words per turn, second half vs first half: "
+            + per_speaker(trends, lambda trend: f"{trend:.2f}x")
+        )
+    return "\n".join(lines)
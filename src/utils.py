@@ -6,6 +6,13 @@ def merge_dicts(left: dict, right: dict) -> dict:
     return {**left, **right}
 
 
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
 def extract_health_score(result: dict) -> dict:
     if not result:
         return {}
@@ -0,0 +1,113 @@
+import pytest
+from analysis_store import AnalysisStore
+from models import SynthesisMode
+
+
+@pytest.fixture
+def analysis_store(tmp_path):
+    return AnalysisStore(str(tmp_path / "analyses.sqlite3"))
+
+
+def test_health_score_round_trip(analysis_store, sample_health_score):
+    """Test stored health scores are returned unchanged"""
+    analysis_id = analysis_store.save(sample_health_score)
+
+    assert analysis_store.get_health_score(analysis_id) == sample_health_score
+    assert analysis_store.get_assessment(analysis_id) is None
+
+
+def test_assessment_stored_later(analysis_store, sample_health_score):
+    """Test an assessment can be added after the analysis was saved"""
+    analysis_id = analysis_store.save(sample_health_score)
+
+    analysis_store.set_assessment(analysis_id, "Written later")
+
+    assert analysis_store.get_assessment(analysis_id) == "Written later"
+
+
+def test_assessment_saved_with_analysis(analysis_store, sample_health_score):
+    """Test analyses run with the assessment store it immediately"""
+    analysis_id = analysis_store.save(sample_health_score, "Written now")
+
+    assert analysis_store.get_assessment(analysis_id) == "Written now"
+
+
+def test_unknown_analysis(analysis_store):
+    """Test unknown ids return nothing"""
+    assert analysis_store.get_health_score("missing") is None
+    assert analysis_store.get_assessment("missing") is None
+
+
+def test_entries_persist_across_instances(tmp_path, sample_health_score):
+    """Test analyses survive reopening the store"""
+    db_path = str(tmp_path / "analyses.sqlite3")
+    analysis_id = AnalysisStore(db_path).save(sample_health_score)
+
+    assert AnalysisStore(db_path).get_health_score(analysis_id) == sample_health_score
+
+
+def test_records_config_hash(analysis_store, sample_health_score):
+    """Test analyses remember the config version that produced them"""
+    analysis_id = analysis_store.save(sample_health_score, config_hash="abc123")
+
+    assert analysis_store.get_config_hash(analysis_id) == "abc123"
+    assert analysis_store.get_config_hash("missing") is None
+
+
+def test_assessments_are_kept_per_synthesis_mode(analysis_store, sample_health_score):
+    """Test an assessment written in one mode is not returned for another"""
+    analysis_id = analysis_store.save(
+        sample_health_score, "LLM narrative", synthesis_mode=SynthesisMode.LLM
+    )
+
+    assert analysis_store.get_assessment(analysis_id, SynthesisMode.LLM) == (
+        "LLM narrative"
+    )
+    assert analysis_store.get_assessment(analysis_id, SynthesisMode.TEMPLATE) is None
+
+    analysis_store.set_assessment(analysis_id, "Template", SynthesisMode.TEMPLATE)
+
+    assert analysis_store.get_assessment(analysis_id, SynthesisMode.TEMPLATE) == (
+        "Template"
+    )
+    assert analysis_store.get_assessment(analysis_id, SynthesisMode.LLM) == (
+        "LLM narrative"
+    )
+
+
+def test_oldest_analyses_are_evicted(tmp_path, sample_health_score):
+    """Test the store keeps at most max_entries analyses"""
+    store = AnalysisStore(str(tmp_path / "analyses.sqlite3"), max_entries=2)
+    oldest = store.save(sample_health_score, "Oldest")
+    newer = [store.save(sample_health_score) for _ in range(2)]
+
+    assert store.get_health_score(oldest) is None
+    assert store.get_assessment(oldest) is None
+    assert all(store.get_health_score(analysis_id) for analysis_id in newer)
+
+
+def test_expired_analyses_are_not_returned(tmp_path, sample_health_score):
+    """Test analyses older than the TTL are treated as gone"""
+    store = AnalysisStore(str(tmp_path / "analyses.sqlite3"), ttl_seconds=0)
+    analysis_id = store.save(sample_health_score)
+
+    assert store.get_health_score(analysis_id) is None
+
+
+def test_expired_analyses_are_deleted_with_their_assessments(
+    tmp_path, sample_health_score, monkeypatch
+):
+    """Test eviction removes only the evicted analyses' assessments"""
+    clock = iter([100.0, 200.0])
+    monkeypatch.setattr("analysis_store.time.time", lambda: next(clock))
+    store = AnalysisStore(str(tmp_path / "analyses.sqlite3"), ttl_seconds=50)
+    store.save(sample_health_score, "Old")
+    kept = store.save(sample_health_score, "New")
+
+    rows = store._connection.execute(
+        "SELECT analysis_id, assessment FROM assessments"
+    ).fetchall()
+    assert rows == [(kept, "New")]
+    assert store._connection.execute("SELECT analysis_id FROM analyses").fetchall() == [
+        (kept,)
+    ]
@@ -0,0 +1,175 @@
+import asyncio
+import pytest
+from contextlib import aclosing
+from batch_analysis import (
+    AnalysisLimiter,
+    cap_batch_concurrency,
+    configure_analysis_limiter,
+    get_analysis_limiter,
+    get_batch_concurrency,
+    run_batch,
+)
+
+
+@pytest.mark.asyncio
+async def test_results_arrive_in_completion_order():
+    """Test fast items are yielded before slower ones submitted earlier"""
+
+    async def analyze(delay):
+        await asyncio.sleep(delay)
+        return delay
+
+    results = [item async for item in run_batch([0.05, 0.0, 0.02], analyze, 3)]
+
+    assert [item.index for item in results] == [1, 2, 0]
+    assert [item.result for item in results] == [0.0, 0.02, 0.05]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    """Test no more than max_concurrency items run at once"""
+    running = 0
+    peak = 0
+
+    async def analyze(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return item
+
+    results = [item async for item in run_batch(list(range(10)), analyze, 3)]
+
+    assert sorted(item.result for item in results) == list(range(10))
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_failures_are_isolated():
+    """Test a failing item yields its error and the rest still complete"""
+
+    async def analyze(item):
+        if item == "bad":
+            raise ValueError("invalid transcript")
+        return item.upper()
+
+    results = {
+        item.index: item async for item in run_batch(["a", "bad", "c"], analyze, 2)
+    }
+
+    assert results[0].result == "A"
+    assert results[2].result == "C"
+    assert results[1].result is None
+    assert isinstance(results[1].error, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_closing_early_cancels_running_items():
+    """Test abandoning the stream (client disconnect) stops the analyses"""
+    started = []
+    cancelled = []
+
+    async def analyze(item):
+        started.append(item)
+        try:
+            await asyncio.sleep(0 if item == 0 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+        return item
+
+    async with aclosing(run_batch(list(range(5)), analyze, 2)) as results:
+        first = await results.__anext__()
+
+    assert first.index == 0
+    assert sorted(cancelled) == [1, 2]
+    assert started == [0, 1, 2]
+
+
+def test_batch_concurrency_from_env(monkeypatch):
+    """Test the default concurrency can be overridden"""
+    monkeypatch.setenv("BATCH_MAX_CONCURRENT_ANALYSES", "32")
+
+    assert get_batch_concurrency() == 32
+
+
+def test_requested_batch_concurrency_is_capped(monkeypatch):
+    """Test a batch cannot ask for more than the configured concurrency"""
+    monkeypatch.setenv("BATCH_MAX_CONCURRENT_ANALYSES", "4")
+
+    assert cap_batch_concurrency(None) == 4
+    assert cap_batch_concurrency(2) == 2
+    assert cap_batch_concurrency(1000) == 4
+
+
+@pytest.mark.asyncio
+async def test_analysis_limiter_is_shared_across_batches():
+    """Test concurrent batches together stay within the process-wide cap"""
+    limiter = AnalysisLimiter(max_concurrent=3)
+    running = []
+    peak = []
+
+    async def analyze(item):
+        async with limiter.slot():
+            running.append(item)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(item)
+
+    async def drain(items):
+        return [item async for item in run_batch(items, analyze, 4)]
+
+    await asyncio.gather(drain(range(8)), drain(range(8, 16)))
+
+    assert max(peak) == 3
+    assert limiter.metrics() == {"running": 0, "waiting": 0, "max_concurrent": 3}
+
+
+def test_analysis_limiter_from_env(monkeypatch):
+    """Test the process-wide cap comes from MAX_CONCURRENT_ANALYSES"""
+    monkeypatch.setenv("MAX_CONCURRENT_ANALYSES", "5")
+    configure_analysis_limiter(None)
+    try:
+        assert get_analysis_limiter().max_concurrent == 5
+    finally:
+        configure_analysis_limiter(None)
+
+
+@pytest.mark.asyncio
+async def test_items_are_pulled_lazily():
+    """Test a generator is only read as far as the running workers need"""
+    pulled = []
+
+    def items():
+        for item in range(20):
+            pulled.append(item)
+            yield item
+
+    async def analyze(item):
+        # Never more than one item per worker taken ahead of completion
+        assert len(pulled) - len(done) <= 3
+        await asyncio.sleep(0.001)
+        done.append(item)
+        return item
+
+    done = []
+    results = [item async for item in run_batch(items(), analyze, 3)]
+
+    assert [item.error for item in results] == [None] * 20
+    assert sorted(item.result for item in results) == list(range(20))
+
+
+@pytest.mark.asyncio
+async def test_failing_item_source_ends_batch():
+    """Test an error reading the next item is raised to the consumer"""
+
+    def items():
+        yield 1
+        raise ValueError("malformed line")
+
+    async def analyze(item):
+        return item
+
+    with pytest.raises(ValueError, match="malformed line"):
+        [item async for item in run_batch(items(), analyze, 2)]
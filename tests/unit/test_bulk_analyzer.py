@@ -0,0 +1,229 @@
+import io
+import json
+import pytest
+from bulk_analyzer import (
+    ProgressReporter,
+    analyze_file,
+    format_duration,
+    load_completed_ids,
+    read_transcripts,
+)
+
+
+class FakeGraph:
+    """Compiled graph stand-in scoring transcripts by length"""
+
+    def __init__(self, failing=(), failing_nodes=()):
+        self.failing = set(failing)
+        self.failing_nodes = set(failing_nodes)
+        self.transcripts = []
+
+    async def ainvoke(self, state):
+        self.transcripts.append(state["transcript"])
+        if state["transcript"] in self.failing:
+            raise ValueError("provider error")
+        health_score = {"final_score": len(state["transcript"]), "health_level": "OK"}
+        failed_nodes = (
+            {"detect_x": "timeout"} if state["transcript"] in self.failing_nodes else {}
+        )
+        return {
+            "failed_nodes": failed_nodes,
+            "health_score": health_score,
+            "final_assessment": {
+                "health_score": health_score,
+                "overall_assessment": "Fine",
+            },
+        }
+
+
+def write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_read_jsonl_and_csv(tmp_path):
+    """Test both input formats, with ids defaulting to the line number"""
+    jsonl = tmp_path / "in.jsonl"
+    jsonl.write_text('{"id": "a", "transcript": "hi"}\n\n{"transcript": "yo"}\n')
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text("conversation_id,text\nc1,hello\n,bye\n")
+
+    assert list(read_transcripts(str(jsonl))) == [
+        ("a", "hi", None),
+        ("line-3", "yo", None),
+    ]
+    assert list(
+        read_transcripts(
+            str(csv_file), id_field="conversation_id", transcript_field="text"
+        )
+    ) == [("c1", "hello", None), ("line-2", "bye", None)]
+
+
+def test_malformed_records_are_yielded_with_their_error(tmp_path):
+    """Test a bad line or row is reported in place and reading continues"""
+    jsonl = tmp_path / "in.jsonl"
+    jsonl.write_text('{"id": "a", "transcript": "hi"}\n{"id": "b", "trans\n[1]\n')
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text("id,text\nc1,hello\nc2\n")
+
+    records = list(read_transcripts(str(jsonl)))
+    rows = list(read_transcripts(str(csv_file), transcript_field="text"))
+
+    assert [(r.record_id, r.transcript) for r in records] == [
+        ("a", "hi"),
+        ("line-2", None),
+        ("line-3", None),
+    ]
+    assert isinstance(records[1].error, json.JSONDecodeError)
+    assert isinstance(records[2].error, AttributeError)
+    assert rows[0] == ("c1", "hello", None)
+    assert rows[1].record_id == "c2" and isinstance(rows[1].error, ValueError)
+
+
+def test_completed_ids_ignore_errors_and_cut_lines(tmp_path):
+    """Test only successful, complete lines count as done"""
+    output = tmp_path / "out.jsonl"
+    output.write_text(
+        '{"id": "a", "status": "ok"}\n'
+        '{"id": "b", "status": "error"}\n'
+        '{"id": "c", "status": "o'
+    )
+
+    assert load_completed_ids(str(output)) == {"a"}
+    assert load_completed_ids(str(tmp_path / "missing.jsonl")) == set()
+
+
+@pytest.mark.asyncio
+async def test_results_are_written_with_failures_isolated(tmp_path):
+    """Test every transcript gets a line and a failure does not stop the run"""
+    source = tmp_path / "in.jsonl"
+    output = tmp_path / "out.jsonl"
+    write_jsonl(
+        source,
+        [
+            {"id": "a", "transcript": "one"},
+            {"id": "b", "transcript": "broken"},
+            {"id": "c", "transcript": "three"},
+        ],
+    )
+
+    summary = await analyze_file(
+        FakeGraph(failing={"broken"}),
+        str(source),
+        str(output),
+        concurrency=2,
+        progress_stream=io.StringIO(),
+    )
+
+    records = {record["id"]: record for record in read_jsonl(output)}
+    assert records["a"]["status"] == "ok"
+    assert records["a"]["final_score"] == 3
+    assert records["a"]["overall_assessment"] == "Fine"
+    assert records["b"]["status"] == "error"
+    assert "provider error" in records["b"]["error"]
+    assert (summary.succeeded, summary.failed, summary.skipped) == (2, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_bad_record_gets_an_error_line_and_the_run_continues(tmp_path):
+    """Test one malformed line between good ones does not abort the file"""
+    source = tmp_path / "in.jsonl"
+    output = tmp_path / "out.jsonl"
+    source.write_text(
+        '{"id": "a", "transcript": "one"}\n'
+        "not json\n"
+        '{"id": "c", "text": "no transcript"}\n'
+        '{"id": "d", "transcript": "four"}\n'
+    )
+    graph = FakeGraph()
+
+    summary = await analyze_file(
+        graph, str(source), str(output), progress_stream=io.StringIO()
+    )
+
+    lines = {line["id"]: line for line in read_jsonl(output)}
+    assert sorted(graph.transcripts) == ["four", "one"]
+    assert (summary.total, summary.succeeded, summary.failed) == (4, 2, 2)
+    assert lines["a"]["status"] == lines["d"]["status"] == "ok"
+    assert lines["line-2"]["status"] == "error"
+    assert "JSONDecodeError" in lines["line-2"]["error"]
+    assert lines["c"] == {
+        "id": "c",
+        "status": "error",
+        "error": "KeyError('transcript')",
+    }
+
+
+@pytest.mark.asyncio
+async def test_rerun_resumes_after_completed_results(tmp_path):
+    """Test a rerun only analyzes transcripts without a successful result"""
+    source = tmp_path / "in.jsonl"
+    output = tmp_path / "out.jsonl"
+    write_jsonl(
+        source,
+        [
+            {"id": "a", "transcript": "one"},
+            {"id": "b", "transcript": "two"},
+            {"id": "c", "transcript": "three"},
+        ],
+    )
+    # A crashed run finished "a", failed "b" and was cut off writing "c"
+    output.write_text(
+        '{"id": "a", "status": "ok"}\n'
+        '{"id": "b", "status": "error", "error": "timeout"}\n'
+        '{"id": "c", "sta'
+    )
+    graph = FakeGraph()
+
+    summary = await analyze_file(
+        graph, str(source), str(output), progress_stream=io.StringIO()
+    )
+
+    assert sorted(graph.transcripts) == ["three", "two"]
+    assert (summary.total, summary.skipped, summary.succeeded) == (3, 1, 2)
+    assert load_completed_ids(str(output)) == {"a", "b", "c"}
+
+
+@pytest.mark.asyncio
+async def test_partial_results_are_retried_on_resume(tmp_path):
+    """Test a result with failed nodes is written as partial and rerun"""
+    source = tmp_path / "in.jsonl"
+    output = tmp_path / "out.jsonl"
+    write_jsonl(
+        source,
+        [{"id": "a", "transcript": "one"}, {"id": "b", "transcript": "flaky"}],
+    )
+
+    first = await analyze_file(
+        FakeGraph(failing_nodes={"flaky"}),
+        str(source),
+        str(output),
+        progress_stream=io.StringIO(),
+    )
+    graph = FakeGraph()
+    second = await analyze_file(
+        graph, str(source), str(output), progress_stream=io.StringIO()
+    )
+
+    assert (first.succeeded, first.partial) == (1, 1)
+    assert read_jsonl(output)[1]["failed_nodes"] == {"detect_x": "timeout"}
+    assert graph.transcripts == ["flaky"]
+    assert (second.skipped, second.succeeded) == (1, 1)
+    assert [record["status"] for record in read_jsonl(output)] == [
+        "ok",
+        "partial",
+        "ok",
+    ]
+
+
+def test_progress_reports_rate_and_eta():
+    """Test progress lines show counts, throughput and remaining time"""
+    progress = ProgressReporter(total=100, stream=io.StringIO())
+    progress.done = 25
+    progress.failed = 1
+
+    assert progress.format(50.0) == "25/100 analyzed (1 failed) · 0.50/s · ETA 2m30s"
+    assert format_duration(7325) == "2h02m"
@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import patch, mock_open
-from config_manager import ConversationHealthConfigManager
+from config_manager import ConversationHealthConfigManager, compute_config_hash
 
 
 def test_valid_config_loading(valid_config_json):
@@ -21,3 +21,15 @@ def test_invalid_json_handling(invalid_config_json):
             with pytest.raises(Exception):  # Should raise JSON decode error
                 manager = ConversationHealthConfigManager("test_config.json")
                 manager.get_configuration()
+
+
+def test_config_hash_tracks_content(tmp_path, valid_config_json):
+    """Test the config hash changes only when the file content changes"""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(valid_config_json)
+    first_hash = compute_config_hash(str(config_path))
+
+    assert compute_config_hash(str(config_path)) == first_hash
+
+    config_path.write_text(valid_config_json + "\n")
+    assert compute_config_hash(str(config_path)) != first_hash
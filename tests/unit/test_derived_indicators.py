@@ -0,0 +1,114 @@
+import pytest
+from derived_indicators import (
+    detect_constructive_concern_handling,
+    detect_one_sided_effort,
+    detect_repetitive_unaddressed_concerns,
+    get_derived_indicator,
+    get_derived_indicator_reads,
+    register_derived_indicator,
+)
+from models import (
+    AssessmentConfidence,
+    ConversationAnalysisState,
+    ConversationConcern,
+    IdentifiedConcerns,
+    QualityIndicatorResult,
+)
+
+
+def _state(*concerns):
+    return ConversationAnalysisState(
+        transcript="Test transcript",
+        identified_concerns=IdentifiedConcerns(
+            concerns=[
+                ConversationConcern(
+                    description=description,
+                    addressal_level=level,
+                    reasoning="Test",
+                    times_raised=times_raised,
+                )
+                for description, level, times_raised in concerns
+            ]
+        ),
+    )
+
+
+def test_registry_lookup():
+    """Test registered functions are found and unknown names rejected"""
+
+    @register_derived_indicator("test_indicator")
+    def derive(state):
+        return QualityIndicatorResult(
+            detected=True, reasoning="Test", confidence=AssessmentConfidence.HIGH
+        )
+
+    assert get_derived_indicator("test_indicator") is derive
+    assert get_derived_indicator_reads("test_indicator") == ("identified_concerns",)
+    assert get_derived_indicator_reads("one_sided_effort") == ("transcript_index",)
+    with pytest.raises(ValueError, match="not registered"):
+        get_derived_indicator("missing_indicator")
+
+
+def test_repetitive_unaddressed_concerns():
+    """Test repeated open concerns are detected with mapped confidence"""
+    ignored = detect_repetitive_unaddressed_concerns(
+        _state(("Refund", "not_addressed", 3), ("Login", "fully_addressed", 4))
+    )
+    assert ignored.detected
+    assert ignored.confidence == AssessmentConfidence.HIGH
+    assert "Refund (3x" in ignored.reasoning
+
+    partial = detect_repetitive_unaddressed_concerns(
+        _state(("Refund", "partially_addressed", 3))
+    )
+    assert partial.detected
+    assert partial.confidence == AssessmentConfidence.MODERATE
+
+    raised_twice = detect_repetitive_unaddressed_concerns(
+        _state(("Refund", "not_addressed", 2))
+    )
+    assert not raised_twice.detected
+
+
+def test_constructive_concern_handling():
+    """Test constructive handling needs most concerns resolved"""
+    resolved = detect_constructive_concern_handling(
+        _state(("Refund", "fully_addressed", 1), ("Login", "mostly_addressed", 1))
+    )
+    assert resolved.detected
+    assert resolved.confidence == AssessmentConfidence.VERY_HIGH
+
+    unresolved = detect_constructive_concern_handling(
+        _state(("Refund", "not_addressed", 1), ("Login", "partially_addressed", 1))
+    )
+    assert not unresolved.detected
+    assert unresolved.confidence == AssessmentConfidence.HIGH
+
+    no_concerns = detect_constructive_concern_handling(_state())
+    assert not no_concerns.detected
+    assert no_concerns.confidence == AssessmentConfidence.LOW
+
+
+def test_one_sided_effort():
+    """Test one-sided effort is measured from the word share"""
+    dominated = detect_one_sided_effort(
+        ConversationAnalysisState(
+            transcript="Agent: " + "word " * 50 + "\nCustomer: ok"
+        )
+    )
+    assert dominated.detected
+    assert dominated.confidence == AssessmentConfidence.HIGH
+
+    balanced = detect_one_sided_effort(
+        ConversationAnalysisState(
+            transcript="Agent: How can I help today?\nCustomer: My card was declined."
+        )
+    )
+    assert not balanced.detected
+    assert balanced.confidence == AssessmentConfidence.HIGH
+
+    monologue = detect_one_sided_effort(
+        ConversationAnalysisState(transcript="Agent: Hello?")
+    )
+    assert not monologue.detected
+    assert monologue.confidence == AssessmentConfidence.LOW
@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import Mock
+from early_termination import (
+    HealthLevelTracker,
+    arun_until_level_settled,
+    run_until_level_settled,
+)
+from models import FailedAnalysisResult, QualityIndicatorResult
+from pydantic_model_creators import create_evaluation_criteria_model
+
+
+@pytest.fixture
+def node_updates(sample_criteria_config, sample_concern_handling_criteria):
+    """Node updates of a clearly-critical conversation, in completion order"""
+    return [
+        {"start_conversation_analysis": None},
+        {
+            "evaluate_conversation_sentiment": {
+                "criteria_evaluations": {
+                    "conversation_sentiment": create_evaluation_criteria_model(
+                        sample_criteria_config
+                    )(selected_response="negative", confidence="high", reasoning="")
+                }
+            }
+        },
+        {
+            "analyze_concern_handling": {
+                "criteria_evaluations": {
+                    "concern_handling_quality": FailedAnalysisResult(error="Boom")
+                }
+            }
+        },
+        {
+            "detect_escalation_language": {
+                "quality_indicator_detections": {
+                    "escalation_language": QualityIndicatorResult(
+                        detected=True, reasoning="", confidence="high"
+                    )
+                }
+            }
+        },
+        {"detect_mutual_collaboration": {}},
+    ]
+
+
+def test_run_stops_once_level_settles(sample_health_config, node_updates):
+    """Test the graph stream is abandoned as soon as the level is known"""
+    consumed = []
+
+    def stream(graph_input, stream_mode):
+        for update in node_updates:
+            consumed.append(update)
+            yield update
+
+    compiled_graph = Mock(stream=stream)
+
+    result = run_until_level_settled(compiled_graph, sample_health_config, "text")
+
+    assert result["health_level"] == "Critical"
+    assert result["terminated_early"]
+    assert (result["min_score"], result["max_score"]) == (0, 18)
+    # Settled by the failed concern analysis; the indicators never ran
+    assert len(consumed) == 3
+    assert "detect_escalation_language" not in result["completed_nodes"]
+
+
+@pytest.mark.asyncio
+async def test_async_run_stops_once_level_settles(sample_health_config, node_updates):
+    """Test the async stream is closed once the level is known"""
+    closed = []
+
+    async def astream(graph_input, stream_mode):
+        try:
+            for update in node_updates:
+                yield update
+        finally:
+            closed.append(True)
+
+    compiled_graph = Mock(astream=astream)
+
+    result = await arun_until_level_settled(
+        compiled_graph, sample_health_config, "text"
+    )
+
+    assert result["health_level"] == "Critical"
+    assert closed == [True]
+
+
+def test_unsettled_run_reports_final_bounds(sample_health_config):
+    """Test a run that never settles reports the remaining bounds"""
+    compiled_graph = Mock(
+        stream=lambda graph_input, stream_mode: (update for update in [])
+    )
+
+    result = run_until_level_settled(compiled_graph, sample_health_config, "text")
+
+    assert not result["terminated_early"]
+    assert (result["min_score"], result["max_score"]) == (0, 85)
+
+
+def test_tracker_ignores_empty_updates(sample_health_config):
+    """Test pass-through nodes are recorded without results"""
+    tracker = HealthLevelTracker(sample_health_config)
+
+    tracker.record({"start_evaluations": None})
+
+    assert tracker.completed_nodes == ["start_evaluations"]
+    assert tracker.score_bounds() == (0, 85)
@@ -5,7 +5,11 @@ Tests for the graph builder that assembles the complete conversation analysis wo
 import pytest
 from unittest.mock import Mock, patch
 from langgraph.graph import StateGraph, END
-from graph_builder import GraphBuilder, create_default_conversation_health_system
+from graph_builder import (
+    GraphBuilder,
+    create_default_conversation_health_system,
+    get_critical_path_depth,
+)
 from models import ConversationAnalysisState
 
 
@@ -238,7 +242,7 @@ class TestCreateDefaultSystem:
                         sample_health_config, mock_llm, mock_logger
                     )
                     mock_scoring.assert_called_once_with(
-                        sample_health_config, mock_llm, mock_logger
+                        sample_health_config, mock_llm, mock_logger, True
                     )
 
     def test_default_system_node_structure(
@@ -309,6 +313,38 @@ class TestCreateDefaultSystem:
                     sample_health_config, mock_llm, mock_logger
                 )
 
+    def test_concern_analysis_runs_parallel_to_evaluations(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test concern analysis no longer gates the config-based evaluations."""
+        graph = create_default_conversation_health_system(
+            sample_health_config, mock_llm, mock_logger
+        )
+
+        assert ("start_conversation_analysis", "identify_conversation_concerns") in (
+            graph.edges
+        )
+        assert ("start_conversation_analysis", "start_evaluations") in graph.edges
+        assert ("analyze_concern_handling", "start_evaluations") not in graph.edges
+
+        # Scoring waits once for every branch instead of firing per branch
+        assert len(graph.waiting_edges) == 1
+        sources, target = next(iter(graph.waiting_edges))
+        assert target == "calculate_health_score"
+        assert "analyze_concern_handling" in sources
+        assert "detect_escalation_language" in sources
+        assert "evaluate_conversation_sentiment" in sources
+
+    def test_critical_path_depth(self, sample_health_config, mock_llm, mock_logger):
+        """Test the compiled default graph has the expected critical path."""
+        graph = create_default_conversation_health_system(
+            sample_health_config, mock_llm, mock_logger
+        )
+
+        # start -> identify -> analyze -> calculate -> synthesize, with the
+        # evaluation branch (start -> start_evaluations -> node) alongside it
+        assert get_critical_path_depth(graph.compile()) == 5
+
     def _setup_mock_creators(self, mock_concern, mock_config, mock_scoring):
         """Helper to setup mock creators with proper return values."""
         # Mock concern analysis subgraph
@@ -320,6 +356,11 @@ class TestCreateDefaultSystem:
             "identify_conversation_concerns",
             ["analyze_concern_handling"],
         )
+        mock_concern.return_value.reads = ("transcript",)
+        mock_concern.return_value.writes = (
+            "identified_concerns",
+            "criteria_evaluations",
+        )
 
         # Mock config-based evaluation subgraph
         mock_config_subgraph = StateGraph(ConversationAnalysisState)
@@ -330,6 +371,11 @@ class TestCreateDefaultSystem:
             "start_evaluations",
             ["eval_node"],
         )
+        mock_config.return_value.reads = ("transcript",)
+        mock_config.return_value.writes = (
+            "criteria_evaluations",
+            "quality_indicator_detections",
+        )
 
         # Mock scoring synthesis subgraph
         mock_scoring_subgraph = StateGraph(ConversationAnalysisState)
@@ -340,6 +386,117 @@ class TestCreateDefaultSystem:
             "calculate_health_score",
             ["synthesize_final_assessment"],
         )
+        mock_scoring.return_value.reads = (
+            "criteria_evaluations",
+            "quality_indicator_detections",
+        )
+        mock_scoring.return_value.writes = ("health_score", "final_assessment")
+
+
+class TestDependentSubgraphs:
+    """Tests for wiring subgraphs by their declared state dependencies."""
+
+    def _creator(self, name, reads, writes, exits=None):
+        subgraph = StateGraph(ConversationAnalysisState)
+        exits = exits or [name]
+        for node in {name, *exits}:
+            subgraph.add_node(node, lambda s: {})
+        for node in exits:
+            if node != name:
+                subgraph.add_edge(name, node)
+        creator = Mock(reads=reads, writes=writes)
+        creator.create_subgraph.return_value = (subgraph, name, exits)
+        return creator
+
+    def test_independent_subgraphs_start_in_parallel(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test subgraphs without producers connect to the initial entry node."""
+        builder = GraphBuilder(
+            ConversationAnalysisState, sample_health_config, mock_llm, mock_logger
+        )
+        builder.add_dependent_subgraphs(
+            [
+                self._creator("a", ("transcript",), ("x",)),
+                self._creator("b", ("transcript",), ("y",)),
+            ]
+        )
+
+        edges = builder.main_graph.edges
+        assert ("start_conversation_analysis", "a") in edges
+        assert ("start_conversation_analysis", "b") in edges
+        assert ("a", END) in edges
+        assert ("b", END) in edges
+
+    def test_consumer_waits_for_all_producer_exits(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test a consumer entry joins on every exit of its producers."""
+        builder = GraphBuilder(
+            ConversationAnalysisState, sample_health_config, mock_llm, mock_logger
+        )
+        builder.add_dependent_subgraphs(
+            [
+                self._creator("consumer", ("x", "y"), ("z",)),
+                self._creator("a", ("transcript",), ("x",), exits=["a1", "a2"]),
+                self._creator("b", ("transcript",), ("y",)),
+            ]
+        )
+
+        assert builder.main_graph.waiting_edges == {(("a1", "a2", "b"), "consumer")}
+        assert ("consumer", END) in builder.main_graph.edges
+        assert ("a1", END) not in builder.main_graph.edges
+
+    def test_cyclic_dependencies_rejected(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test mutually dependent subgraphs raise an error."""
+        builder = GraphBuilder(
+            ConversationAnalysisState, sample_health_config, mock_llm, mock_logger
+        )
+
+        with pytest.raises(ValueError, match="cycle"):
+            builder.add_dependent_subgraphs(
+                [
+                    self._creator("a", ("y",), ("x",)),
+                    self._creator("b", ("x",), ("y",)),
+                ]
+            )
+
+    def test_derived_indicators_wait_for_concerns(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test the default system runs derived indicators after concern analysis."""
+        sample_health_config.quality_indicators[0].derivation = (
+            "repetitive_unaddressed_concerns"
+        )
+
+        graph = create_default_conversation_health_system(
+            sample_health_config, mock_llm, mock_logger
+        )
+
+        assert (("analyze_concern_handling",), "derive_quality_indicators") in {
+            (tuple(sources), target) for sources, target in graph.waiting_edges
+        }
+        assert "detect_escalation_language" not in graph.nodes
+
+    def test_transcript_index_built_once_for_metric_consumers(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test the index node runs before subgraphs that read the index."""
+        graph = create_default_conversation_health_system(
+            sample_health_config, mock_llm, mock_logger
+        )
+        assert "index_transcript" not in graph.nodes
+
+        sample_health_config.quality_indicators[0].uses_transcript_metrics = True
+        graph = create_default_conversation_health_system(
+            sample_health_config, mock_llm, mock_logger
+        )
+
+        edges = {(tuple(sources), target) for sources, target in graph.waiting_edges}
+        assert (("index_transcript",), "start_evaluations") in edges
+        assert ("start_conversation_analysis", "index_transcript") in graph.edges
 
 
 class TestGraphBuilderEdgeCases:
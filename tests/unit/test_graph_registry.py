@@ -0,0 +1,101 @@
+import json
+import time
+import pytest
+from config_manager import compute_config_hash
+from graph_registry import GraphRegistry
+
+
+@pytest.fixture
+def config_path(tmp_path, valid_config_json):
+    path = tmp_path / "config.json"
+    path.write_text(valid_config_json)
+    return path
+
+
+def change_indicator_impact(config_path, score_impact):
+    config = json.loads(config_path.read_text())
+    config["quality_indicators"][0]["score_impact"] = score_impact
+    config_path.write_text(json.dumps(config))
+
+
+def test_compiles_current_config(config_path, mock_llm, mock_logger):
+    """Test the registry compiles the config file at startup"""
+    registry = GraphRegistry(str(config_path), mock_llm, mock_logger)
+
+    system = registry.current()
+    assert system.config_hash == compute_config_hash(str(config_path))
+    assert "sentiment" in system.config.evaluation_criteria
+    assert "synthesize_final_assessment" in system.compiled_graph.get_graph().nodes
+    assert "synthesize_final_assessment" not in system.scoring_graph.get_graph().nodes
+
+
+def test_invalid_config_at_startup(tmp_path, mock_llm, mock_logger):
+    """Test a broken config fails startup instead of being skipped"""
+    config_path = tmp_path / "config.json"
+    config_path.write_text("{")
+
+    with pytest.raises(json.JSONDecodeError):
+        GraphRegistry(str(config_path), mock_llm, mock_logger)
+
+
+def test_reload_only_on_content_change(config_path, mock_llm, mock_logger):
+    """Test unchanged contents keep the compiled version"""
+    registry = GraphRegistry(str(config_path), mock_llm, mock_logger)
+    first = registry.current()
+
+    assert registry.reload() is False
+    assert registry.current() is first
+
+    change_indicator_impact(config_path, -20)
+
+    assert registry.reload() is True
+    assert registry.current().config_hash != first.config_hash
+    assert registry.current().config.quality_indicators[0].score_impact == -20
+
+
+def test_in_flight_requests_keep_their_version(config_path, mock_llm, mock_logger):
+    """Test a reload does not swap the version under a running request"""
+    registry = GraphRegistry(str(config_path), mock_llm, mock_logger)
+
+    with registry.acquire() as pinned:
+        change_indicator_impact(config_path, -20)
+        registry.reload()
+
+        assert registry.current() is not pinned
+        assert registry.get(pinned.config_hash) is pinned
+
+    # Dropped once its last request finished
+    assert registry.get(pinned.config_hash) is None
+    assert list(registry.metrics()["loaded_versions"]) == [
+        registry.current().config_hash
+    ]
+
+
+def test_invalid_reload_keeps_current_version(config_path, mock_llm, mock_logger):
+    """Test an invalid config is rejected once and the current version kept"""
+    registry = GraphRegistry(str(config_path), mock_llm, mock_logger)
+    current = registry.current()
+    config_path.write_text('{"evaluation_criteria": {}}')
+
+    assert registry.reload() is False
+    assert registry.reload() is False
+
+    assert registry.current() is current
+    assert registry.metrics()["failed_reloads"] == 1
+    mock_logger.warning.assert_called_once()
+
+
+def test_watcher_picks_up_changes(config_path, mock_llm, mock_logger):
+    """Test the background watcher reloads a changed file"""
+    registry = GraphRegistry(str(config_path), mock_llm, mock_logger)
+    registry.start_watching(interval_seconds=0.01)
+    try:
+        change_indicator_impact(config_path, -20)
+        deadline = time.monotonic() + 5
+        while registry.metrics()["reloads"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        registry.stop_watching()
+
+    assert registry.current().config.quality_indicators[0].score_impact == -20
+    assert registry.metrics()["watching"] is False
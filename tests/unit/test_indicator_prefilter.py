@@ -0,0 +1,61 @@
+import pytest
+from pydantic import ValidationError
+from indicator_prefilter import IndicatorPrefilter, PrefilterStats, get_prefilter_stats
+from models import AssessmentConfidence, IndicatorPrefilterConfig
+
+
+@pytest.fixture
+def prefiltered_indicator(sample_indicator_config):
+    sample_indicator_config.prefilter = IndicatorPrefilterConfig(
+        keywords=["manager", "fed up"],
+        patterns=[r"escalat\w*"],
+        absent_confidence=AssessmentConfidence.HIGH,
+    )
+    return sample_indicator_config
+
+
+def test_keywords_and_patterns_match(prefiltered_indicator):
+    """Test keywords match whole words and patterns match case-insensitively"""
+    prefilter = IndicatorPrefilter(prefiltered_indicator)
+
+    assert not prefilter.rules_out("Customer: Get me your MANAGER now")
+    assert not prefilter.rules_out("Customer: I am fed up with this")
+    assert not prefilter.rules_out("Agent: I will Escalate it")
+    assert prefilter.rules_out("Customer: The management team was helpful")
+
+
+def test_absent_result(prefiltered_indicator):
+    """Test ruled-out indicators report not detected with configured confidence"""
+    result = IndicatorPrefilter(prefiltered_indicator).absent_result()
+
+    assert not result.detected
+    assert result.confidence == AssessmentConfidence.HIGH
+
+
+def test_prefilter_requires_terms():
+    """Test a prefilter without keywords or patterns is rejected"""
+    with pytest.raises(ValidationError):
+        IndicatorPrefilterConfig()
+
+
+def test_skip_counters(prefiltered_indicator):
+    """Test checks and skips are counted per indicator"""
+    get_prefilter_stats().reset()
+    prefilter = IndicatorPrefilter(prefiltered_indicator)
+
+    prefilter.rules_out("Customer: Thanks!")
+    prefilter.rules_out("Customer: Thanks again!")
+    prefilter.rules_out("Customer: Manager please")
+
+    metrics = get_prefilter_stats().metrics()
+    assert metrics["by_indicator"]["escalation_language"] == {
+        "checked": 3,
+        "skipped": 2,
+        "skip_rate": pytest.approx(2 / 3),
+    }
+    assert metrics["skipped_total"] == 2
+
+
+def test_empty_stats():
+    """Test metrics are well defined before any check"""
+    assert PrefilterStats().metrics()["skip_rate"] == 0.0
@@ -0,0 +1,139 @@
+import pytest
+from typing import Optional
+from unittest.mock import Mock
+from pydantic import BaseModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, StateGraph
+from instrumentation import (
+    Histogram,
+    NodeInstrumentation,
+    configure_instrumentation,
+    get_instrumentation,
+)
+from llm import call_llm, acall_llm
+from node_builders import create_graph_node
+from request_context import llm_request_scope
+
+
+class AnswerState(BaseModel):
+    answer: Optional[str] = None
+
+
+@pytest.fixture
+def instrumentation():
+    previous = get_instrumentation()
+    instrumentation = NodeInstrumentation(
+        prompt_cost_per_1k_tokens=0.01, completion_cost_per_1k_tokens=0.03
+    )
+    configure_instrumentation(instrumentation)
+    yield instrumentation
+    configure_instrumentation(previous)
+
+
+def usage_llm(count=2):
+    """Chat model reporting 100 prompt and 20 completion tokens per call"""
+    message = AIMessage(
+        content="Answer",
+        usage_metadata={"input_tokens": 100, "output_tokens": 20, "total_tokens": 120},
+    )
+    return GenericFakeChatModel(messages=iter([message] * count))
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test observations count towards every bucket at or above them"""
+    histogram = Histogram((1, 5, 10))
+
+    histogram.observe(0.5)
+    histogram.observe(7)
+
+    assert histogram.bucket_counts == [1, 1, 2]
+    assert histogram.count == 2
+    assert histogram.sum == 7.5
+
+
+def test_llm_calls_record_tokens_and_cost(instrumentation, mock_logger):
+    """Test token usage is captured from the model and priced"""
+    llm = usage_llm()
+
+    with llm_request_scope() as request_context:
+        call_llm("Question", llm, mock_logger)
+
+    stats = request_context.timing_breakdown()["unknown"]
+    assert stats["llm_calls"] == 1
+    assert stats["prompt_tokens"] == 100
+    assert stats["completion_tokens"] == 20
+    assert stats["cost"] == pytest.approx(0.0016)
+
+
+@pytest.mark.asyncio
+async def test_graph_nodes_are_labelled(instrumentation, mock_logger):
+    """Test node wall time and LLM calls are attributed to the graph node"""
+    llm = usage_llm()
+
+    def ask(state):
+        return {"answer": call_llm("Question", llm, mock_logger)}
+
+    async def aask(state):
+        return {"answer": await acall_llm("Question", llm, mock_logger)}
+
+    graph = StateGraph(AnswerState)
+    graph.add_node("ask_question", create_graph_node(ask, aask))
+    graph.set_entry_point("ask_question")
+    graph.add_edge("ask_question", END)
+
+    with llm_request_scope() as request_context:
+        await graph.compile().ainvoke({})
+
+    stats = request_context.timing_breakdown()["ask_question"]
+    assert stats["llm_calls"] == 1
+    assert stats["prompt_tokens"] == 100
+    assert stats["wall_seconds"] >= stats["llm_seconds"] > 0
+
+    metrics = instrumentation.render_prometheus()
+    assert (
+        'conversation_health_llm_calls_total{node="ask_question"} 1'
+        in metrics.splitlines()
+    )
+    assert (
+        'conversation_health_node_duration_seconds_count{node="ask_question"} 1'
+        in metrics.splitlines()
+    )
+
+
+def test_failed_calls_are_counted(instrumentation, mock_logger):
+    """Test calls that raise are recorded as errors"""
+    llm = Mock()
+    llm.invoke.side_effect = ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        call_llm("Question", llm, mock_logger)
+
+    metrics = instrumentation.render_prometheus().splitlines()
+    assert 'conversation_health_llm_calls_total{node="unknown"} 1' in metrics
+    assert 'conversation_health_llm_errors_total{node="unknown"} 1' in metrics
+
+
+def test_prometheus_histogram_format(instrumentation):
+    """Test histograms render buckets, sum and count per node"""
+    instrumentation.record_node("detect_escalation_language", 0.3)
+    instrumentation.record_node("detect_escalation_language", 2.0)
+
+    lines = instrumentation.render_prometheus().splitlines()
+    name = "conversation_health_node_duration_seconds"
+    label = 'node="detect_escalation_language"'
+    assert f"# TYPE {name} histogram" in lines
+    assert f'{name}_bucket{{{label},le="0.25"}} 0' in lines
+    assert f'{name}_bucket{{{label},le="0.5"}} 1' in lines
+    assert f'{name}_bucket{{{label},le="+Inf"}} 2' in lines
+    assert f"{name}_sum{{{label}}} 2.3" in lines
+    assert f"{name}_count{{{label}}} 2" in lines
+
+
+def test_reset(instrumentation):
+    """Test reset clears every series"""
+    instrumentation.record_cache_hit("detect_escalation_language")
+
+    instrumentation.reset()
+
+    assert "detect_escalation_language" not in instrumentation.render_prometheus()
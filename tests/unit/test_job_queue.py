@@ -0,0 +1,193 @@
+import pytest
+from job_queue import JobQueue, JobStatus, create_job_queue_from_env
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def job_queue(tmp_path, clock):
+    queue = JobQueue(
+        str(tmp_path / "jobs.sqlite3"),
+        max_attempts=2,
+        visibility_timeout_seconds=60,
+        retry_delay_seconds=10,
+        clock=clock,
+    )
+    yield queue
+    queue.close()
+
+
+def test_jobs_are_claimed_oldest_first(job_queue, clock):
+    """Test workers get the oldest job and each job goes to one worker"""
+    first = job_queue.enqueue({"transcript": "first"}, webhook_url="http://hook")
+    clock.now += 1
+    second = job_queue.enqueue({"transcript": "second"})
+
+    claimed = job_queue.claim("worker-a")
+
+    assert claimed.job_id == first
+    assert claimed.status == JobStatus.RUNNING
+    assert claimed.attempts == 1
+    assert claimed.payload == {"transcript": "first"}
+    assert claimed.webhook_url == "http://hook"
+    assert job_queue.claim("worker-b").job_id == second
+    assert job_queue.claim("worker-c") is None
+
+
+def test_completed_job_stores_result(job_queue, clock):
+    """Test the leasing worker can complete the job with its result"""
+    job_id = job_queue.enqueue({"transcript": "hi"})
+    job_queue.claim("worker-a")
+    clock.now += 5
+
+    assert job_queue.complete(job_id, "worker-a", {"finalScore": 80})
+
+    job = job_queue.get(job_id)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result == {"finalScore": 80}
+    assert job.finished_at == 1005.0
+    assert job_queue.get("missing") is None
+
+
+def test_failed_attempt_is_retried_after_backoff(job_queue, clock):
+    """Test a failure requeues the job until it runs out of attempts"""
+    job_id = job_queue.enqueue({"transcript": "hi"})
+    job_queue.claim("worker-a")
+
+    assert job_queue.fail(job_id, "worker-a", "timeout") == JobStatus.QUEUED
+    assert job_queue.claim("worker-a") is None
+
+    clock.now += 10
+    assert job_queue.claim("worker-b").attempts == 2
+    assert job_queue.fail(job_id, "worker-b", "timeout again") == JobStatus.FAILED
+
+    job = job_queue.get(job_id)
+    assert job.status == JobStatus.FAILED
+    assert job.error == "timeout again"
+
+
+def test_expired_lease_makes_job_visible_again(job_queue, clock):
+    """Test a job whose worker stopped extending its lease is redelivered"""
+    job_id = job_queue.enqueue({"transcript": "hi"})
+    job_queue.claim("crashed-worker")
+
+    clock.now += 30
+    assert job_queue.claim("worker-b") is None
+    clock.now += 31
+    redelivered = job_queue.claim("worker-b")
+
+    assert redelivered.job_id == job_id
+    assert redelivered.attempts == 2
+    # The original worker lost the job
+    assert not job_queue.complete(job_id, "crashed-worker", {})
+    assert job_queue.complete(job_id, "worker-b", {"finalScore": 1})
+
+
+def test_extended_lease_is_not_redelivered(job_queue, clock):
+    """Test heartbeats keep a long-running job with its worker"""
+    job_queue.enqueue({"transcript": "hi"})
+    job = job_queue.claim("worker-a")
+
+    clock.now += 50
+    assert job_queue.extend_lease(job.job_id, "worker-a")
+    clock.now += 50
+
+    assert job_queue.claim("worker-b") is None
+
+
+def test_expired_final_attempt_fails_job(job_queue, clock):
+    """Test a job is not redelivered once its last lease expired"""
+    job_id = job_queue.enqueue({"transcript": "hi"})
+    job_queue.claim("worker-a")
+    clock.now += 61
+    job_queue.claim("worker-b")
+    clock.now += 61
+
+    assert job_queue.claim("worker-c") is None
+    assert job_queue.get(job_id).status == JobStatus.FAILED
+
+
+def test_metrics(job_queue, clock):
+    """Test queue depth, delayed retries and status counts"""
+    done = job_queue.enqueue({"transcript": "done"})
+    retried = job_queue.enqueue({"transcript": "retried"})
+    job_queue.enqueue({"transcript": "waiting"})
+    job_queue.claim("worker-a")
+    job_queue.complete(done, "worker-a", {})
+    job_queue.claim("worker-a")
+    job_queue.fail(retried, "worker-a", "error")
+    clock.now += 4
+
+    metrics = job_queue.metrics()
+
+    assert metrics["queue_depth"] == 1
+    assert metrics["delayed_retries"] == 1
+    assert metrics["oldest_queued_seconds"] == 4.0
+    assert metrics["succeeded"] == 1
+    assert metrics["running"] == 0
+
+
+def test_jobs_persist_across_instances(tmp_path):
+    """Test queued jobs survive a restart"""
+    path = str(tmp_path / "jobs.sqlite3")
+    job_id = JobQueue(path).enqueue({"transcript": "hi"})
+
+    assert JobQueue(path).claim("worker-a").job_id == job_id
+
+
+def test_queue_from_env(tmp_path, monkeypatch):
+    """Test attempts and visibility timeout can be configured"""
+    monkeypatch.setenv("JOB_QUEUE_PATH", str(tmp_path / "env.sqlite3"))
+    monkeypatch.setenv("JOB_MAX_ATTEMPTS", "5")
+    monkeypatch.setenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "30")
+
+    queue = create_job_queue_from_env()
+
+    assert queue.max_attempts == 5
+    assert queue.visibility_timeout_seconds == 30.0
+
+
+def test_expired_final_attempt_still_notifies_webhook(job_queue, clock):
+    """Test a job failed by lease expiry is queued for webhook delivery"""
+    job_id = job_queue.enqueue({"transcript": "hi"}, webhook_url="http://hook")
+    job_queue.enqueue({"transcript": "no hook"})
+    for _ in range(2):
+        job_queue.claim("worker-a")
+        job_queue.claim("worker-a")
+        clock.now += 61
+    job_queue.claim("worker-b")
+
+    assert job_queue.metrics()["pending_webhooks"] == 1
+    notification = job_queue.claim_webhook("worker-b")
+    assert notification.job_id == job_id
+    assert notification.status == JobStatus.FAILED
+    # Leased to worker-b until it records the delivery
+    assert job_queue.claim_webhook("worker-c") is None
+
+    job_queue.record_webhook_error(job_id, None)
+    clock.now += 61
+    assert job_queue.claim_webhook("worker-c") is None
+    assert job_queue.metrics()["pending_webhooks"] == 0
+
+
+def test_undelivered_webhook_is_released_after_lease(job_queue, clock):
+    """Test another worker delivers a webhook whose worker died"""
+    job_id = job_queue.enqueue({"transcript": "hi"}, webhook_url="http://hook")
+    job_queue.claim("worker-a")
+    job_queue.complete(job_id, "worker-a", {})
+    assert job_queue.claim_webhook("worker-a", job_id).job_id == job_id
+
+    clock.now += 61
+
+    assert job_queue.claim_webhook("worker-b").job_id == job_id
@@ -0,0 +1,216 @@
+import asyncio
+import pytest
+from contextlib import nullcontext
+from unittest.mock import Mock
+from analysis_store import AnalysisStore
+from job_queue import JobQueue, JobStatus
+from job_worker import create_job_analyzer, process_job, run_worker, webhook_url_error
+from models import SynthesisMode
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    queue = JobQueue(
+        str(tmp_path / "jobs.sqlite3"),
+        max_attempts=2,
+        visibility_timeout_seconds=0.06,
+        retry_delay_seconds=0,
+    )
+    yield queue
+    queue.close()
+
+
+class RecordingWebhook:
+    def __init__(self, error=None):
+        self.error = error
+        self.deliveries = []
+
+    async def __call__(self, url, payload):
+        self.deliveries.append((url, payload))
+        return self.error
+
+
+@pytest.mark.asyncio
+async def test_successful_job_notifies_webhook(job_queue):
+    """Test the result is stored and POSTed to the job's webhook"""
+
+    async def analyze(payload):
+        return {"finalScore": len(payload["transcript"])}
+
+    job_id = job_queue.enqueue({"transcript": "hello"}, webhook_url="http://hook")
+    webhook = RecordingWebhook()
+
+    status = await process_job(
+        job_queue, job_queue.claim("worker"), "worker", analyze, webhook
+    )
+
+    assert status == JobStatus.SUCCEEDED
+    assert job_queue.get(job_id).result == {"finalScore": 5}
+    assert webhook.deliveries == [
+        (
+            "http://hook",
+            {
+                "jobId": job_id,
+                "status": "succeeded",
+                "result": {"finalScore": 5},
+                "error": None,
+            },
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_before_webhook(job_queue):
+    """Test the webhook only fires once the job has failed for good"""
+
+    async def analyze(payload):
+        raise RuntimeError("provider down")
+
+    job_id = job_queue.enqueue({"transcript": "hello"}, webhook_url="http://hook")
+    webhook = RecordingWebhook(error="ConnectError()")
+
+    first = await process_job(
+        job_queue, job_queue.claim("worker"), "worker", analyze, webhook
+    )
+    assert first == JobStatus.QUEUED
+    assert webhook.deliveries == []
+
+    second = await process_job(
+        job_queue, job_queue.claim("worker"), "worker", analyze, webhook
+    )
+    job = job_queue.get(job_id)
+    assert second == JobStatus.FAILED
+    assert "provider down" in job.error
+    assert webhook.deliveries[0][1]["status"] == "failed"
+    assert job.webhook_error == "ConnectError()"
+
+
+@pytest.mark.asyncio
+async def test_lease_is_extended_while_running(job_queue):
+    """Test a job running past the visibility timeout is not redelivered"""
+    redelivered = []
+
+    async def analyze(payload):
+        await asyncio.sleep(0.15)
+        redelivered.append(job_queue.claim("other-worker"))
+        return {}
+
+    job_id = job_queue.enqueue({"transcript": "long"})
+
+    status = await process_job(job_queue, job_queue.claim("worker"), "worker", analyze)
+
+    assert status == JobStatus.SUCCEEDED
+    assert redelivered == [None]
+    assert job_queue.get(job_id).attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_jobs_until_stopped(job_queue):
+    """Test the worker loop drains the queue and exits when asked"""
+    analyzed = []
+
+    async def analyze(payload):
+        analyzed.append(payload["transcript"])
+        return {}
+
+    for transcript in ("a", "b", "c"):
+        job_queue.enqueue({"transcript": transcript})
+
+    await run_worker(
+        job_queue,
+        analyze,
+        "worker",
+        should_stop=lambda: len(analyzed) == 3,
+        poll_interval_seconds=0.01,
+    )
+
+    assert analyzed == ["a", "b", "c"]
+    assert job_queue.metrics()["succeeded"] == 3
+
+
+@pytest.mark.asyncio
+async def test_worker_delivers_webhooks_of_abandoned_jobs(job_queue):
+    """Test an idle worker notifies the webhook of a job whose worker died"""
+    job_id = job_queue.enqueue({"transcript": "hello"}, webhook_url="http://hook")
+    for _ in range(2):
+        job_queue.claim("crashed-worker")
+        await asyncio.sleep(0.07)
+    webhook = RecordingWebhook()
+
+    async def analyze(payload):
+        return {}
+
+    await run_worker(
+        job_queue,
+        analyze,
+        "worker",
+        should_stop=lambda: bool(webhook.deliveries),
+        poll_interval_seconds=0.01,
+        deliver=webhook,
+    )
+
+    assert webhook.deliveries[0][1]["jobId"] == job_id
+    assert webhook.deliveries[0][1]["status"] == "failed"
+    assert job_queue.metrics()["pending_webhooks"] == 0
+
+
+def test_webhook_url_validation(monkeypatch):
+    """Test webhooks must be http(s) and on an allowed host when configured"""
+    assert webhook_url_error("https://hooks.example.com/done") is None
+    assert webhook_url_error("file:///etc/passwd") is not None
+    assert webhook_url_error("gopher://hooks.example.com") is not None
+
+    monkeypatch.setenv("JOB_WEBHOOK_ALLOWED_HOSTS", "hooks.example.com")
+    assert webhook_url_error("https://HOOKS.example.com/done") is None
+    assert webhook_url_error("http://169.254.169.254/latest") is not None
+
+
+class FakeAnalysisSystem:
+    """Analysis system stand-in recording the state each graph run gets"""
+
+    def __init__(self, health_score):
+        self.config_hash = "abc123"
+        self.states = []
+        self.assessment_writer = Mock(
+            resolve_synthesis_mode=lambda mode: mode or SynthesisMode.LLM
+        )
+
+        async def ainvoke(state):
+            self.states.append(state)
+            return {
+                "health_score": health_score,
+                "final_assessment": {
+                    "health_score": health_score,
+                    "overall_assessment": "Template assessment",
+                },
+            }
+
+        self.compiled_graph = Mock(ainvoke=ainvoke)
+
+
+@pytest.mark.asyncio
+async def test_queued_synthesis_mode_reaches_analysis(
+    job_queue, tmp_path, sample_health_score
+):
+    """Test a job's stored synthesis mode is analyzed and stored as the enum"""
+    system = FakeAnalysisSystem(sample_health_score)
+    registry = Mock()
+    registry.acquire.return_value = nullcontext(system)
+    analysis_store = AnalysisStore(str(tmp_path / "analyses.sqlite3"))
+    job_id = job_queue.enqueue(
+        {"transcript": "Agent: hi", "synthesis_mode": "template"}
+    )
+
+    status = await process_job(
+        job_queue,
+        job_queue.claim("worker"),
+        "worker",
+        create_job_analyzer(registry, analysis_store),
+    )
+
+    assert status == JobStatus.SUCCEEDED
+    assert system.states[0]["synthesis_mode"] == SynthesisMode.TEMPLATE
+    analysis_id = job_queue.get(job_id).result["analysisId"]
+    assert analysis_store.get_assessment(analysis_id, SynthesisMode.TEMPLATE) == (
+        "Template assessment"
+    )
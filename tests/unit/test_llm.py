@@ -1,6 +1,12 @@
 import pytest
-from unittest.mock import patch, Mock
-from llm import get_llm, call_llm, call_llm_structured
+from unittest.mock import patch, Mock, AsyncMock
+from llm import (
+    get_llm,
+    call_llm,
+    call_llm_structured,
+    acall_llm,
+    acall_llm_structured,
+)
 from pydantic import BaseModel
 
 
@@ -61,3 +67,40 @@ def test_call_llm_error_handling(mock_llm, mock_logger):
 
     with pytest.raises(Exception, match="API Error"):
         call_llm("test prompt", mock_llm, mock_logger)
+
+
+@pytest.mark.asyncio
+async def test_acall_llm_string_output(mock_llm, mock_logger):
+    """Test async LLM call awaits ainvoke"""
+    mock_llm.ainvoke = AsyncMock(return_value=Mock(content="Async response"))
+
+    result = await acall_llm("test prompt", mock_llm, mock_logger)
+
+    assert result == "Async response"
+    mock_llm.ainvoke.assert_awaited_once_with("test prompt")
+    mock_llm.invoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_acall_llm_structured_convenience(
+    mock_llm, mock_logger, mock_structured_response
+):
+    """Test async convenience wrapper for structured calls"""
+    mock_llm.with_structured_output.return_value.ainvoke = AsyncMock(
+        return_value=mock_structured_response
+    )
+
+    result = await acall_llm_structured("test prompt", TestModel, mock_llm, mock_logger)
+
+    assert result == mock_structured_response
+    mock_llm.with_structured_output.assert_called_once_with(TestModel)
+
+
+@pytest.mark.asyncio
+async def test_acall_llm_error_handling(mock_llm, mock_logger):
+    """Test async LLM call logs and re-raises errors"""
+    mock_llm.ainvoke = AsyncMock(side_effect=Exception("API Error"))
+
+    with pytest.raises(Exception, match="API Error"):
+        await acall_llm("test prompt", mock_llm, mock_logger)
+    mock_logger.error.assert_called_once()
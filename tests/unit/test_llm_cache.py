@@ -0,0 +1,120 @@
+import pytest
+from unittest.mock import patch, Mock
+from pydantic import BaseModel
+from llm import call_llm, configure_llm_cache
+from llm_cache import LLMResponseCache, build_cache_key
+from pydantic_model_creators import create_quality_indicator_model
+
+
+class CachedModel(BaseModel):
+    response: str
+
+
+class OtherModel(BaseModel):
+    response: str
+    extra: int = 0
+
+
+@pytest.fixture
+def cache_llm():
+    """LLM stand-in with a stable model identity"""
+    llm = Mock()
+    llm.model_name = "test-model"
+    llm.temperature = 0
+    return llm
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"))
+    configure_llm_cache(cache)
+    yield cache
+    configure_llm_cache(None)
+
+
+def test_structured_round_trip(response_cache, cache_llm):
+    """Test structured responses are restored as model instances"""
+    indicator_model = create_quality_indicator_model("escalation_language")
+    detection = indicator_model(detected=True, reasoning="Test", confidence="high")
+
+    response_cache.set("prompt", cache_llm, detection, indicator_model)
+    restored = response_cache.get("prompt", cache_llm, indicator_model)
+
+    assert isinstance(restored, indicator_model)
+    assert restored == detection
+
+
+def test_key_includes_schema_and_model(cache_llm):
+    """Test cache keys differ per output schema and model identity"""
+    other_llm = Mock(model_name="other-model", temperature=0)
+
+    base_key = build_cache_key("prompt", cache_llm, CachedModel)
+    assert base_key == build_cache_key("prompt", cache_llm, CachedModel)
+    assert base_key != build_cache_key("prompt", cache_llm, OtherModel)
+    assert base_key != build_cache_key("prompt", other_llm, CachedModel)
+    assert base_key != build_cache_key("prompt", cache_llm, None)
+
+
+def test_hit_and_miss_counters(response_cache, cache_llm):
+    """Test hit/miss counters track lookups"""
+    assert response_cache.get("prompt", cache_llm) is None
+    response_cache.set("prompt", cache_llm, "cached text")
+    assert response_cache.get("prompt", cache_llm) == "cached text"
+
+    stats = response_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_ttl_expiry(tmp_path, cache_llm):
+    """Test entries older than the TTL are not returned"""
+    cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=10)
+
+    with patch("llm_cache.time.time", return_value=1000.0):
+        cache.set("prompt", cache_llm, "cached text")
+    with patch("llm_cache.time.time", return_value=1011.0):
+        assert cache.get("prompt", cache_llm) is None
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_size_eviction_keeps_recently_used(tmp_path, cache_llm):
+    """Test least recently used entries are evicted past max_entries"""
+    cache = LLMResponseCache(
+        str(tmp_path / "cache.sqlite3"), max_entries=2, ttl_seconds=None
+    )
+
+    with patch("llm_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+        cache.set("first", cache_llm, "1")
+        cache.set("second", cache_llm, "2")
+        cache.get("first", cache_llm)
+        cache.set("third", cache_llm, "3")
+
+    assert cache.get("first", cache_llm) == "1"
+    assert cache.get("second", cache_llm) is None
+    assert cache.get("third", cache_llm) == "3"
+
+
+def test_call_llm_uses_cache(response_cache, cache_llm, mock_logger):
+    """Test repeated calls are served from the cache"""
+    cache_llm.invoke.return_value = Mock(content="Fresh response")
+
+    first = call_llm("test prompt", cache_llm, mock_logger)
+    second = call_llm("test prompt", cache_llm, mock_logger)
+
+    assert first == second == "Fresh response"
+    cache_llm.invoke.assert_called_once_with("test prompt")
+
+
+def test_call_llm_bypass(response_cache, cache_llm, mock_logger):
+    """Test the bypass switches skip the cache"""
+    cache_llm.invoke.return_value = Mock(content="Fresh response")
+
+    call_llm("test prompt", cache_llm, mock_logger, use_cache=False)
+    call_llm("test prompt", cache_llm, mock_logger, use_cache=False)
+    response_cache.enabled = False
+    call_llm("test prompt", cache_llm, mock_logger)
+
+    assert cache_llm.invoke.call_count == 3
+    assert response_cache.stats()["entries"] == 0
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import time
+import pytest
+from llm import call_llm, configure_llm_governor
+from llm_governor import LLMGovernor, TokenBucket, create_llm_governor_from_env
+from request_context import llm_request_scope
+
+
+def _wait_for_queue_depth(governor, depth, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while governor.metrics()["queue_depth"] < depth:
+        if time.monotonic() > deadline:
+            raise AssertionError(f"queue never reached depth {depth}")
+        time.sleep(0.005)
+
+
+def test_token_bucket_refill():
+    """Test bucket refills at the configured per-minute rate"""
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])
+
+    bucket.consume(60)
+    assert bucket.seconds_until_available(1) == pytest.approx(1.0)
+
+    now[0] = 0.5
+    bucket.refill()
+    assert bucket.seconds_until_available(1) == pytest.approx(0.5)
+
+
+def test_max_in_flight_cap():
+    """Test no more than max_in_flight calls run at once"""
+    governor = LLMGovernor(max_in_flight=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def worker():
+        with governor.acquire():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+    assert governor.metrics()["granted_total"] == 6
+    assert governor.metrics()["in_flight"] == 0
+
+
+def test_round_robin_across_requests():
+    """Test queued calls are admitted fairly across request ids"""
+    governor = LLMGovernor(max_in_flight=1)
+    order = []
+
+    def worker(request_id, label):
+        with llm_request_scope(request_id):
+            with governor.acquire():
+                order.append(label)
+
+    with governor.acquire():
+        threads = []
+        for request_id, label in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1")]:
+            thread = threading.Thread(target=worker, args=(request_id, label))
+            thread.start()
+            threads.append(thread)
+            _wait_for_queue_depth(governor, len(threads))
+
+        assert governor.metrics()["queued_requests"] == 2
+
+    for thread in threads:
+        thread.join()
+
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+def test_token_budget_delays_calls():
+    """Test calls wait once the estimated token budget is spent"""
+    governor = LLMGovernor(tokens_per_minute=600)
+
+    with governor.acquire(estimated_tokens=600):
+        pass
+
+    start = time.monotonic()
+    with governor.acquire(estimated_tokens=5):
+        pass
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.4
+    assert governor.metrics()["wait_seconds"]["max"] >= 0.4
+
+
+@pytest.mark.asyncio
+async def test_async_acquire_and_cancellation():
+    """Test async waiters are admitted and cancelled waiters leave the queue"""
+    governor = LLMGovernor(max_in_flight=1)
+
+    async def hold():
+        async with governor.aacquire():
+            await asyncio.sleep(0.05)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    cancelled = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    assert governor.metrics()["queue_depth"] == 1
+
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert governor.metrics()["queue_depth"] == 0
+
+    await holder
+    await hold()
+    assert governor.metrics()["in_flight"] == 0
+    assert governor.metrics()["granted_total"] == 2
+
+
+def test_call_llm_goes_through_governor(mock_llm, mock_logger):
+    """Test call_llm acquires a governor slot for provider calls"""
+    governor = LLMGovernor(max_in_flight=1)
+    configure_llm_governor(governor)
+    try:
+        call_llm("test prompt", mock_llm, mock_logger)
+    finally:
+        configure_llm_governor(None)
+
+    assert governor.metrics()["granted_total"] == 1
+    assert governor.metrics()["in_flight"] == 0
+
+
+def test_try_acquire_never_waits():
+    """Test try_acquire only admits a call when a slot is free right now"""
+    governor = LLMGovernor(max_in_flight=1)
+
+    assert governor.try_acquire()
+    assert not governor.try_acquire()
+
+    governor.release()
+    assert governor.try_acquire()
+    assert governor.metrics()["in_flight"] == 1
+
+
+def test_governor_from_env_splits_limits_between_processes(monkeypatch):
+    """Test each process gets an even share of the account-wide limits"""
+    monkeypatch.setenv("LLM_REQUESTS_PER_MINUTE", "600")
+    monkeypatch.setenv("LLM_TOKENS_PER_MINUTE", "90000")
+    monkeypatch.setenv("LLM_MAX_IN_FLIGHT", "8")
+
+    governor = create_llm_governor_from_env(processes=3)
+
+    assert governor._request_bucket.rate_per_second == pytest.approx(600 / 3 / 60)
+    assert governor._token_bucket.capacity == pytest.approx(30000)
+    assert governor.max_in_flight == 2
+    assert create_llm_governor_from_env(processes=16).max_in_flight == 1
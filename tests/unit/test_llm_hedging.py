@@ -0,0 +1,163 @@
+import asyncio
+import pytest
+from unittest.mock import Mock
+from llm import acall_llm, configure_llm_governor, configure_llm_hedging
+from llm_governor import LLMGovernor
+from llm_hedging import LLMHedgingPolicy
+
+
+def _warm(policy, node_name="unknown", latency=0.01, samples=200):
+    for _ in range(samples):
+        policy.record_latency(node_name, latency)
+
+
+@pytest.fixture
+def hedging_policy():
+    policy = LLMHedgingPolicy(latency_percentile=0.95, max_extra_call_ratio=1.0)
+    configure_llm_hedging(policy)
+    yield policy
+    configure_llm_hedging(None)
+
+
+def test_hedge_delay_needs_samples():
+    """Test no hedge delay until enough latencies are observed"""
+    policy = LLMHedgingPolicy(latency_percentile=0.5, min_samples=3)
+    policy.record_latency("detect_x", 0.1)
+    assert policy.hedge_delay("detect_x") is None
+
+    policy.record_latency("detect_x", 0.2)
+    policy.record_latency("detect_x", 0.3)
+    assert policy.hedge_delay("detect_x") == 0.2
+    assert policy.hedge_delay("detect_y") is None
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged(hedging_policy, mock_llm, mock_logger):
+    """Test a duplicate call wins when the first one is slow"""
+    _warm(hedging_policy)
+    calls = []
+    cancelled = []
+
+    async def ainvoke(prompt):
+        calls.append(prompt)
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        return Mock(content=f"response {len(calls)}")
+
+    mock_llm.ainvoke = ainvoke
+
+    result = await asyncio.wait_for(acall_llm("test prompt", mock_llm, mock_logger), 1)
+
+    assert result == "response 2"
+    await asyncio.sleep(0)
+    assert cancelled == [True]
+    metrics = hedging_policy.metrics()
+    assert metrics["hedges"] == 1
+    assert metrics["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_budget_cap(mock_llm, mock_logger):
+    """Test hedges stop once the extra call budget is spent"""
+    policy = LLMHedgingPolicy(max_extra_call_ratio=0.5)
+    _warm(policy, latency=0.001)
+
+    async def ainvoke(prompt):
+        await asyncio.sleep(0.02)
+        return Mock(content="slow response")
+
+    mock_llm.ainvoke = ainvoke
+    configure_llm_hedging(policy)
+    try:
+        for _ in range(4):
+            await acall_llm("test prompt", mock_llm, mock_logger)
+    finally:
+        configure_llm_hedging(None)
+
+    metrics = policy.metrics()
+    assert metrics["hedges"] == 2
+    assert metrics["budget_denied"] == 2
+    assert metrics["extra_call_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_falls_back_to_primary(
+    hedging_policy, mock_llm, mock_logger
+):
+    """Test the slower call is still used when the hedge fails"""
+    _warm(hedging_policy)
+    calls = []
+
+    async def ainvoke(prompt):
+        calls.append(prompt)
+        if len(calls) == 2:
+            raise ValueError("hedge failed")
+        await asyncio.sleep(0.05)
+        return Mock(content="primary response")
+
+    mock_llm.ainvoke = ainvoke
+
+    result = await acall_llm("test prompt", mock_llm, mock_logger)
+
+    assert result == "primary response"
+    assert hedging_policy.metrics()["hedge_wins"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_skipped_without_governor_capacity(
+    hedging_policy, mock_llm, mock_logger
+):
+    """Test a hedge never queues behind the governor for a free slot"""
+    _warm(hedging_policy)
+    calls = []
+
+    async def ainvoke(prompt):
+        calls.append(prompt)
+        await asyncio.sleep(0.05)
+        return Mock(content="primary response")
+
+    mock_llm.ainvoke = ainvoke
+    configure_llm_governor(LLMGovernor(max_in_flight=1))
+    try:
+        result = await acall_llm("test prompt", mock_llm, mock_logger)
+    finally:
+        configure_llm_governor(None)
+
+    assert result == "primary response"
+    assert len(calls) == 1
+    metrics = hedging_policy.metrics()
+    assert metrics["hedges"] == 0
+    assert metrics["capacity_denied"] == 1
+
+
+@pytest.mark.asyncio
+async def test_governor_queue_time_is_not_hedged(mock_llm, mock_logger):
+    """Test latency samples and hedge timers start once the call is admitted"""
+    policy = LLMHedgingPolicy(min_samples=1, max_extra_call_ratio=1.0)
+    governor = LLMGovernor(max_in_flight=1)
+    calls = []
+
+    async def ainvoke(prompt):
+        calls.append(prompt)
+        await asyncio.sleep(0.02)
+        return Mock(content="response")
+
+    mock_llm.ainvoke = ainvoke
+    configure_llm_hedging(policy)
+    configure_llm_governor(governor)
+    try:
+        await asyncio.gather(
+            *(acall_llm(f"prompt {i}", mock_llm, mock_logger) for i in range(4))
+        )
+    finally:
+        configure_llm_hedging(None)
+        configure_llm_governor(None)
+
+    # Later calls queued for up to ~60ms but only their ~20ms calls count
+    assert len(calls) == 4
+    assert policy.hedge_delay("unknown") < 0.05
+    assert governor.metrics()["in_flight"] == 0
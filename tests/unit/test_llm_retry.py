@@ -0,0 +1,183 @@
+import asyncio
+import pytest
+from unittest.mock import Mock
+from llm import call_llm, acall_llm, configure_llm_governor, configure_llm_retry_policy
+from llm_governor import LLMGovernor
+from llm_retry import LLMRetryPolicy, is_retryable_error
+from request_context import llm_request_scope
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def retry_policy(sleeps):
+    async def async_sleep(seconds):
+        sleeps.append(seconds)
+
+    policy = LLMRetryPolicy(
+        max_attempts=3,
+        initial_backoff_seconds=1.0,
+        max_total_retry_seconds=10.0,
+        sleep=sleeps.append,
+        async_sleep=async_sleep,
+        jitter=lambda: 1.0,
+        # Failed attempts take no time unless a test says otherwise
+        clock=lambda: 0.0,
+    )
+    configure_llm_retry_policy(policy)
+    yield policy
+    configure_llm_retry_policy(LLMRetryPolicy())
+
+
+def test_is_retryable_error():
+    """Test rate limits, 5xx and timeouts are retryable, client errors are not"""
+    assert is_retryable_error(ProviderError(429))
+    assert is_retryable_error(ProviderError(503))
+    assert is_retryable_error(TimeoutError())
+    assert not is_retryable_error(ProviderError(400))
+    assert not is_retryable_error(ValueError("bad output"))
+
+
+def test_backoff_is_exponential_and_capped():
+    """Test backoff doubles per attempt up to the max, scaled by jitter"""
+    policy = LLMRetryPolicy(
+        initial_backoff_seconds=1.0, max_backoff_seconds=5.0, jitter=lambda: 0.5
+    )
+
+    assert [policy.backoff_seconds(n) for n in range(1, 5)] == [0.5, 1.0, 2.0, 2.5]
+
+
+def test_call_llm_retries_transient_errors(retry_policy, sleeps, mock_llm, mock_logger):
+    """Test transient errors are retried in place with backoff"""
+    mock_llm.invoke.side_effect = [
+        ProviderError(429),
+        ProviderError(503),
+        Mock(content="Recovered"),
+    ]
+
+    result = call_llm("test prompt", mock_llm, mock_logger)
+
+    assert result == "Recovered"
+    assert mock_llm.invoke.call_count == 3
+    assert sleeps == [1.0, 2.0]
+    assert retry_policy.metrics()["retries_by_node"] == {"unknown": 2}
+
+
+def test_call_llm_does_not_retry_other_errors(retry_policy, mock_llm, mock_logger):
+    """Test non-retryable errors are raised immediately"""
+    mock_llm.invoke.side_effect = ValueError("bad output")
+
+    with pytest.raises(ValueError):
+        call_llm("test prompt", mock_llm, mock_logger)
+
+    assert mock_llm.invoke.call_count == 1
+    assert retry_policy.metrics()["retries_total"] == 0
+
+
+def test_call_llm_gives_up_after_max_attempts(retry_policy, mock_llm, mock_logger):
+    """Test the last error is raised once attempts are exhausted"""
+    mock_llm.invoke.side_effect = ProviderError(429)
+
+    with pytest.raises(ProviderError):
+        call_llm("test prompt", mock_llm, mock_logger)
+
+    assert mock_llm.invoke.call_count == 3
+    assert retry_policy.metrics()["exhausted_by_node"] == {"unknown": 1}
+
+
+def test_total_retry_time_is_capped_per_request(
+    retry_policy, sleeps, mock_llm, mock_logger
+):
+    """Test calls in one request share the total retry time budget"""
+    retry_policy.max_total_retry_seconds = 4.0
+    mock_llm.invoke.side_effect = ProviderError(503)
+
+    with llm_request_scope() as context:
+        for _ in range(2):
+            with pytest.raises(ProviderError):
+                call_llm("test prompt", mock_llm, mock_logger)
+
+    # First call backs off 1s + 2s; the second call only fits another 1s
+    assert sleeps == [1.0, 2.0, 1.0]
+    assert context.retry_seconds == 4.0
+
+
+@pytest.mark.asyncio
+async def test_acall_llm_times_out_and_retries(
+    retry_policy, sleeps, mock_llm, mock_logger
+):
+    """Test slow async calls hit the per-call timeout and are retried"""
+    retry_policy.timeout_seconds = 0.01
+    responses = iter(["slow", "fast"])
+
+    async def ainvoke(prompt):
+        if next(responses) == "slow":
+            await asyncio.sleep(1)
+        return Mock(content="Async response")
+
+    mock_llm.ainvoke = ainvoke
+
+    result = await acall_llm("test prompt", mock_llm, mock_logger)
+
+    assert result == "Async response"
+    assert sleeps == [1.0]
+
+
+def test_failed_attempt_time_counts_towards_budget(
+    retry_policy, sleeps, mock_llm, mock_logger
+):
+    """Test time burnt in failing attempts is charged like backoff"""
+    now = [0.0]
+    retry_policy._clock = lambda: now[0]
+    retry_policy.max_total_retry_seconds = 10.0
+
+    def slow_failure(prompt):
+        now[0] += 4.0
+        raise ProviderError(503)
+
+    mock_llm.invoke.side_effect = slow_failure
+
+    with llm_request_scope() as context:
+        with pytest.raises(ProviderError):
+            call_llm("test prompt", mock_llm, mock_logger)
+
+    # 4s attempt + 1s backoff + 4s attempt leaves no room for the 2s backoff
+    assert sleeps == [1.0]
+    assert mock_llm.invoke.call_count == 2
+    assert context.retry_seconds == 9.0
+
+
+@pytest.mark.asyncio
+async def test_governor_queue_time_does_not_time_out(
+    retry_policy, sleeps, mock_llm, mock_logger
+):
+    """Test waiting for a rate limiter slot is not part of the call timeout"""
+    retry_policy.timeout_seconds = 0.05
+    governor = LLMGovernor(max_in_flight=1)
+    configure_llm_governor(governor)
+
+    async def ainvoke(prompt):
+        await asyncio.sleep(0.03)
+        return Mock(content="Async response")
+
+    mock_llm.ainvoke = ainvoke
+
+    try:
+        # Each call queues behind the others for longer than the timeout
+        results = await asyncio.gather(
+            *(acall_llm(f"prompt {n}", mock_llm, mock_logger) for n in range(4))
+        )
+    finally:
+        configure_llm_governor(None)
+
+    assert results == ["Async response"] * 4
+    assert sleeps == []
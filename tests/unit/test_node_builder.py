@@ -1,7 +1,13 @@
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from node_builders import QualityIndicatorNodeBuilder, EvaluationCriteriaNodeBuilder
-from models import ConversationAnalysisState
+from models import (
+    AssessmentConfidence,
+    ConversationAnalysisState,
+    FailedAnalysisResult,
+    IndicatorPrefilterConfig,
+    IndicatorTriageResult,
+)
 
 
 def test_quality_indicator_node_creation(
@@ -88,5 +94,256 @@ def test_prompt_generation_integration(mock_llm, mock_logger, sample_criteria_co
 
             # Verify prompt generation was called
             mock_prompt.assert_called_once_with(
-                sample_criteria_config, "Test transcript"
+                sample_criteria_config, "Test transcript", ""
             )
+
+
+def test_transcript_facts_in_prompt(mock_llm, mock_logger, sample_indicator_config):
+    """Test measured transcript metrics are added for configs that use them"""
+    builder = QualityIndicatorNodeBuilder(mock_llm, mock_logger)
+    sample_indicator_config.uses_transcript_metrics = True
+    state = ConversationAnalysisState(
+        transcript="Customer: Is it fixed?\nAgent: Yes, it is fixed now."
+    )
+
+    with patch("node_builders.call_llm_structured", return_value=Mock()) as mock_call:
+        builder.create_detection_node(sample_indicator_config)(state)
+
+    prompt = mock_call.call_args[0][0]
+    assert "Measured conversation facts" in prompt
+    assert "- Turns: Customer: 1, Agent: 1" in prompt
+
+
+def test_prefilter_skips_llm_call(mock_llm, mock_logger, sample_indicator_config):
+    """Test a confident prefilter negative returns without an LLM call"""
+    builder = QualityIndicatorNodeBuilder(mock_llm, mock_logger)
+    sample_indicator_config.prefilter = IndicatorPrefilterConfig(keywords=["manager"])
+    node_func = builder.create_detection_node(sample_indicator_config)
+
+    with patch("node_builders.call_llm_structured") as mock_call:
+        result = node_func(ConversationAnalysisState(transcript="Customer: Thanks!"))
+        mock_call.assert_not_called()
+
+        node_func(ConversationAnalysisState(transcript="Customer: Get the manager"))
+        mock_call.assert_called_once()
+
+    assert not result["quality_indicator_detections"]["escalation_language"].detected
+
+
+def test_fused_prefilter_narrows_call(
+    mock_llm, mock_logger, sample_indicator_config, sample_positive_indicator_config
+):
+    """Test fused detection only asks the LLM about indicators not ruled out"""
+    builder = QualityIndicatorNodeBuilder(mock_llm, mock_logger)
+    sample_indicator_config.prefilter = IndicatorPrefilterConfig(keywords=["manager"])
+    node_func = builder.create_fused_detection_node(
+        [sample_indicator_config, sample_positive_indicator_config]
+    )
+    llm_result = Mock(mutual_collaboration=Mock(detected=True))
+
+    with patch(
+        "node_builders.call_llm_structured", return_value=llm_result
+    ) as mock_call:
+        result = node_func(ConversationAnalysisState(transcript="Customer: Thanks!"))
+
+    prompt, fused_model = mock_call.call_args[0][:2]
+    assert "escalation_language" not in prompt
+    assert list(fused_model.model_fields) == ["mutual_collaboration"]
+    detections = result["quality_indicator_detections"]
+    assert not detections["escalation_language"].detected
+    assert detections["mutual_collaboration"].detected
+
+
+def test_triage_node(
+    mock_llm, mock_logger, sample_indicator_config, sample_positive_indicator_config
+):
+    """Test triage records which screened indicators need detection"""
+    builder = QualityIndicatorNodeBuilder(mock_llm, mock_logger)
+    configs = [sample_indicator_config, sample_positive_indicator_config]
+    node_func = builder.create_triage_node(configs)
+    llm_result = Mock(
+        plausible_indicators=[Mock(value="mutual_collaboration")],
+        reasoning="Collaborative",
+        confidence="high",
+    )
+
+    with patch("node_builders.call_llm_structured", return_value=llm_result):
+        triage = node_func(ConversationAnalysisState(transcript="Test"))[
+            "indicator_triage"
+        ]
+
+    assert triage.screened_indicators == ["escalation_language", "mutual_collaboration"]
+    assert triage.plausible_indicators == ["mutual_collaboration"]
+
+
+def test_triage_failure_detects_everything(
+    mock_llm, mock_logger, sample_indicator_config
+):
+    """Test a failed triage call leaves every indicator to its detection node"""
+    builder = QualityIndicatorNodeBuilder(mock_llm, mock_logger)
+    node_func = builder.create_triage_node([sample_indicator_config])
+
+    with patch("node_builders.call_llm_structured", side_effect=RuntimeError("down")):
+        result = node_func(ConversationAnalysisState(transcript="Test"))
+
+    assert result == {"indicator_triage": None}
+    mock_logger.warning.assert_called_once()
+
+
+def test_detection_skipped_after_triage(
+    mock_llm, mock_logger, sample_indicator_config, sample_positive_indicator_config
+):
+    """Test indicators left out by triage get its confidence and no LLM call"""
+    builder = QualityIndicatorNodeBuilder(mock_llm, mock_logger)
+    state = ConversationAnalysisState(
+        transcript="Test",
+        indicator_triage=IndicatorTriageResult(
+            screened_indicators=["escalation_language", "mutual_collaboration"],
+            plausible_indicators=["mutual_collaboration"],
+            reasoning="Calm conversation",
+            confidence="very_high",
+        ),
+    )
+
+    with patch("node_builders.call_llm_structured") as mock_call:
+        result = builder.create_detection_node(sample_indicator_config)(state)
+        mock_call.assert_not_called()
+
+        builder.create_detection_node(sample_positive_indicator_config)(state)
+        mock_call.assert_called_once()
+
+    detection = result["quality_indicator_detections"]["escalation_language"]
+    assert not detection.detected
+    assert detection.confidence == AssessmentConfidence.VERY_HIGH
+    assert "Calm conversation" in detection.reasoning
+
+
+@pytest.mark.asyncio
+async def test_async_detection_node(
+    mock_llm, mock_logger, sample_indicator_config, mock_structured_response
+):
+    """Test async quality indicator node awaits the async LLM call"""
+    builder = QualityIndicatorNodeBuilder(mock_llm, mock_logger)
+
+    with patch(
+        "node_builders.acall_llm_structured",
+        new=AsyncMock(return_value=mock_structured_response),
+    ) as mock_call:
+        node_func = builder.create_async_detection_node(sample_indicator_config)
+        result = await node_func(Mock(transcript="Test transcript"))
+
+        mock_call.assert_awaited_once()
+        assert result == {
+            "quality_indicator_detections": {
+                sample_indicator_config.name: mock_structured_response
+            }
+        }
+
+
+@pytest.mark.asyncio
+async def test_graph_node_dispatches_sync_and_async(
+    mock_llm, mock_logger, sample_criteria_config, mock_structured_response
+):
+    """Test graph nodes use the sync path for invoke and async for ainvoke"""
+    builder = EvaluationCriteriaNodeBuilder(mock_llm, mock_logger)
+    node = builder.create_graph_node(sample_criteria_config)
+    state = Mock(transcript="Test transcript")
+
+    with patch(
+        "node_builders.call_llm_structured", return_value=mock_structured_response
+    ) as sync_call:
+        with patch(
+            "node_builders.acall_llm_structured",
+            new=AsyncMock(return_value=mock_structured_response),
+        ) as async_call:
+            node.invoke(state)
+            sync_call.assert_called_once()
+            async_call.assert_not_called()
+
+            await node.ainvoke(state)
+            async_call.assert_awaited_once()
+            sync_call.assert_called_once()
+
+
+def test_fused_detection_node_splits_results(
+    mock_llm, mock_logger, sample_indicator_config, sample_positive_indicator_config
+):
+    """Test one fused call is split back into per-indicator detections"""
+    builder = QualityIndicatorNodeBuilder(mock_llm, mock_logger)
+    indicators = [sample_indicator_config, sample_positive_indicator_config]
+    escalation = Mock(detected=True)
+    collaboration = Mock(detected=False)
+
+    with patch(
+        "node_builders.call_llm_structured",
+        return_value=Mock(
+            escalation_language=escalation, mutual_collaboration=collaboration
+        ),
+    ) as mock_call:
+        node_func = builder.create_fused_detection_node(indicators)
+        result = node_func(Mock(transcript="Test transcript"))
+
+        mock_call.assert_called_once()
+        prompt = mock_call.call_args[0][0]
+        assert prompt.count("Test transcript") == 1
+        assert "escalation_language" in prompt
+        assert "mutual_collaboration" in prompt
+        assert result == {
+            "quality_indicator_detections": {
+                "escalation_language": escalation,
+                "mutual_collaboration": collaboration,
+            }
+        }
+
+
+def test_fused_evaluation_node_splits_results(
+    mock_llm, mock_logger, sample_criteria_config, sample_concern_handling_criteria
+):
+    """Test one fused criteria call fans out into criteria_evaluations"""
+    builder = EvaluationCriteriaNodeBuilder(mock_llm, mock_logger)
+    criteria = [sample_criteria_config, sample_concern_handling_criteria]
+    sentiment = Mock(selected_response="positive")
+    concern = Mock(selected_response="good")
+
+    with patch(
+        "node_builders.call_llm_structured",
+        return_value=Mock(
+            conversation_sentiment=sentiment, concern_handling_quality=concern
+        ),
+    ) as mock_call:
+        node_func = builder.create_fused_evaluation_node(criteria)
+        result = node_func(Mock(transcript="Test transcript"))
+
+        mock_call.assert_called_once()
+        assert result == {
+            "criteria_evaluations": {
+                "conversation_sentiment": sentiment,
+                "concern_handling_quality": concern,
+            }
+        }
+
+
+@pytest.mark.asyncio
+async def test_failing_node_returns_placeholder(
+    mock_llm, mock_logger, sample_indicator_config
+):
+    """Test a failing node yields a failure placeholder instead of raising"""
+    builder = QualityIndicatorNodeBuilder(mock_llm, mock_logger)
+    node = builder.create_graph_node(sample_indicator_config)
+    state = Mock(transcript="Test transcript")
+
+    with patch(
+        "node_builders.call_llm_structured", side_effect=RuntimeError("API down")
+    ):
+        result = node.invoke(state)
+    with patch(
+        "node_builders.acall_llm_structured",
+        new=AsyncMock(side_effect=RuntimeError("API down")),
+    ):
+        async_result = await node.ainvoke(state)
+
+    for output in (result, async_result):
+        placeholder = output["quality_indicator_detections"]["escalation_language"]
+        assert isinstance(placeholder, FailedAnalysisResult)
+        assert "API down" in placeholder.error
+        assert output["failed_nodes"] == {"unknown": "RuntimeError('API down')"}
@@ -2,8 +2,12 @@ import pytest
 from pydantic_model_creators import (
     create_evaluation_criteria_model,
     create_quality_indicator_model,
+    create_fused_quality_indicator_model,
+    create_fused_evaluation_criteria_model,
+    create_single_pass_concern_analysis_model,
+    create_indicator_triage_model,
 )
-from models import EvaluationCriteriaResult, QualityIndicatorResult
+from models import EvaluationCriteriaResult, IdentifiedConcerns, QualityIndicatorResult
 
 
 def test_create_evaluation_criteria_model(sample_criteria_config):
@@ -60,3 +64,124 @@ def test_model_inheritance(sample_criteria_config):
     # Should be subclasses of base result types
     assert issubclass(criteria_model, EvaluationCriteriaResult)
     assert issubclass(indicator_model, QualityIndicatorResult)
+
+
+def test_create_fused_quality_indicator_model(
+    sample_indicator_config, sample_positive_indicator_config
+):
+    """Test fused model has one detection field per indicator"""
+    model_class = create_fused_quality_indicator_model(
+        [sample_indicator_config, sample_positive_indicator_config]
+    )
+
+    assert set(model_class.model_fields) == {
+        "escalation_language",
+        "mutual_collaboration",
+    }
+
+    instance = model_class(
+        escalation_language={
+            "detected": True,
+            "reasoning": "Escalation",
+            "confidence": "high",
+        },
+        mutual_collaboration={
+            "detected": False,
+            "reasoning": "None",
+            "confidence": "moderate",
+        },
+    )
+
+    assert isinstance(instance.escalation_language, QualityIndicatorResult)
+    assert instance.escalation_language.detected is True
+    assert instance.mutual_collaboration.detected is False
+
+
+def test_create_fused_evaluation_criteria_model(
+    sample_criteria_config, sample_concern_handling_criteria
+):
+    """Test fused criteria model keeps each criteria's own response enum"""
+    model_class = create_fused_evaluation_criteria_model(
+        [sample_criteria_config, sample_concern_handling_criteria]
+    )
+
+    instance = model_class(
+        conversation_sentiment={
+            "selected_response": "positive",
+            "reasoning": "Upbeat",
+            "confidence": "high",
+        },
+        concern_handling_quality={
+            "selected_response": "good",
+            "reasoning": "Handled",
+            "confidence": "moderate",
+        },
+    )
+
+    assert isinstance(instance.conversation_sentiment, EvaluationCriteriaResult)
+    assert instance.conversation_sentiment.selected_response.value == "positive"
+    assert instance.concern_handling_quality.selected_response.value == "good"
+
+    with pytest.raises(ValueError):
+        model_class(
+            conversation_sentiment={
+                "selected_response": "good",
+                "reasoning": "Wrong enum",
+                "confidence": "high",
+            },
+            concern_handling_quality={
+                "selected_response": "good",
+                "reasoning": "Handled",
+                "confidence": "moderate",
+            },
+        )
+
+
+def test_create_single_pass_concern_analysis_model(sample_concern_handling_criteria):
+    """Test composite model carries concerns and the handling rating"""
+    model_class = create_single_pass_concern_analysis_model(
+        sample_concern_handling_criteria
+    )
+
+    instance = model_class(
+        concerns=[
+            {
+                "description": "Billing question",
+                "addressal_level": "fully_addressed",
+                "reasoning": "Answered directly",
+            }
+        ],
+        concern_handling_quality={
+            "selected_response": "good",
+            "reasoning": "Handled",
+            "confidence": "high",
+        },
+    )
+
+    assert isinstance(instance, IdentifiedConcerns)
+    assert instance.concerns[0].addressal_level.value == "fully_addressed"
+    assert isinstance(instance.concern_handling_quality, EvaluationCriteriaResult)
+    assert instance.concern_handling_quality.selected_response.value == "good"
+
+
+def test_create_indicator_triage_model(
+    sample_indicator_config, sample_positive_indicator_config
+):
+    """Test triage model only accepts the screened indicator names"""
+    model_class = create_indicator_triage_model(
+        [sample_indicator_config, sample_positive_indicator_config]
+    )
+
+    instance = model_class(
+        plausible_indicators=["mutual_collaboration"],
+        reasoning="Collaborative tone",
+        confidence="high",
+    )
+    assert instance.plausible_indicators[0].value == "mutual_collaboration"
+
+    with pytest.raises(ValueError):
+        model_class(
+            plausible_indicators=["unknown_indicator"],
+            reasoning="Test",
+            confidence="high",
+        )
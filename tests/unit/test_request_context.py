@@ -0,0 +1,42 @@
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph, START, END
+from typing_extensions import TypedDict
+from request_context import (
+    get_current_node_name,
+    get_current_request_id,
+    llm_request_scope,
+)
+
+
+def test_request_scope_resets():
+    """Test request scope tags calls and restores the previous id"""
+    with llm_request_scope("analysis-1") as context:
+        assert get_current_request_id() == context.request_id == "analysis-1"
+    assert get_current_request_id() == "default"
+
+
+def test_record_retry():
+    """Test retries are accumulated on the request context"""
+    with llm_request_scope() as context:
+        context.record_retry("detect_escalation_language", 0.5)
+        context.record_retry("detect_escalation_language", 1.0)
+
+    assert context.retry_seconds == 1.5
+    assert context.retries_by_node == {"detect_escalation_language": 2}
+
+
+def test_current_node_name():
+    """Test node name resolves inside graph nodes only"""
+
+    class State(TypedDict):
+        node: str
+
+    graph = StateGraph(State)
+    graph.add_node(
+        "named_node", RunnableLambda(lambda state: {"node": get_current_node_name()})
+    )
+    graph.add_edge(START, "named_node")
+    graph.add_edge("named_node", END)
+
+    assert graph.compile().invoke({"node": ""})["node"] == "named_node"
+    assert get_current_node_name() == "unknown"
@@ -1,6 +1,6 @@
 import pytest
 from score_calculator import ConversationHealthScorer
-from models import AssessmentConfidence
+from models import AssessmentConfidence, FailedAnalysisResult
 from pydantic_model_creators import (
     create_evaluation_criteria_model,
     create_quality_indicator_model,
@@ -109,3 +109,60 @@ def test_edge_case_empty_results(sample_health_config):
 
     assert 0 <= result["final_score"] <= 100
     assert "health_level" in result
+
+
+def test_failed_analyses_are_excluded(
+    sample_health_config, sample_criteria_config, sample_indicator_config
+):
+    """Test failed nodes are scored like low-confidence exclusions"""
+    scorer = ConversationHealthScorer(sample_health_config)
+
+    result = scorer.generate_complete_health_score(
+        {"conversation_sentiment": FailedAnalysisResult(error="RateLimitError()")},
+        {"escalation_language": FailedAnalysisResult(error="RateLimitError()")},
+    )
+
+    criteria_result = result["criteria_results"]["conversation_sentiment"]
+    assert not criteria_result["included_in_final_score"]
+    assert criteria_result["confidence"] == AssessmentConfidence.VERY_LOW
+    assert result["indicator_results"]["escalation_language"]["score_impact"] == 0.0
+    assert result["total_criteria_points"] == 0
+    assert result["uncertainty_info"]["excluded_criteria"] == ["conversation_sentiment"]
+    assert result["uncertainty_info"]["failed_criteria"] == ["conversation_sentiment"]
+    assert result["uncertainty_info"]["failed_indicators"] == ["escalation_language"]
+
+
+def test_score_bounds_narrow_as_results_arrive(
+    sample_health_config,
+    sample_criteria_config,
+    sample_concern_handling_criteria,
+    sample_indicator_config,
+):
+    """Test bounds cover pending outcomes and settle the level once narrow"""
+    scorer = ConversationHealthScorer(sample_health_config)
+
+    # Nothing known: 0 up to 40 + 35 points plus the positive indicator
+    assert scorer.calculate_score_bounds({}, {}) == (0, 85)
+    assert scorer.determine_settled_health_level((0, 85)) is None
+
+    criteria_evaluations = {
+        "conversation_sentiment": create_evaluation_criteria_model(
+            sample_criteria_config
+        )(selected_response="negative", confidence="high", reasoning="Hostile"),
+        "concern_handling_quality": create_evaluation_criteria_model(
+            sample_concern_handling_criteria
+        )(selected_response="poor", confidence="moderate", reasoning="Ignored"),
+    }
+    # 8 + 10.5 points known; indicators can still move it by -15..+10
+    bounds = scorer.calculate_score_bounds(criteria_evaluations, {})
+    assert bounds == (3, 28)
+    assert scorer.determine_settled_health_level(bounds) is None
+
+    indicator_detections = {
+        "escalation_language": create_quality_indicator_model(
+            sample_indicator_config.name
+        )(detected=True, confidence="high", reasoning="Shouting")
+    }
+    bounds = scorer.calculate_score_bounds(criteria_evaluations, indicator_detections)
+    assert bounds == (3, 13)
+    assert scorer.determine_settled_health_level(bounds).label == "Critical"
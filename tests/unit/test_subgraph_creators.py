@@ -4,10 +4,19 @@ Tests for subgraph creator classes that build different parts of the conversatio
 
 import pytest
 from unittest.mock import Mock, patch
+from langgraph.graph import END
+from models import (
+    ConversationAnalysisState,
+    FailedAnalysisResult,
+    SynthesisCachePolicy,
+    SynthesisMode,
+)
 from subgraph_creators import (
     ConcernAnalysisSubgraphCreator,
     ConfigBasedEvaluationSubgraphCreator,
+    DerivedIndicatorSubgraphCreator,
     ScoringSynthesisSubgraphCreator,
+    TranscriptIndexSubgraphCreator,
 )
 
 
@@ -42,6 +51,69 @@ class TestConcernAnalysisSubgraphCreator:
         # Should have edge from identify to analyze
         assert len(subgraph.edges) >= 1
 
+    def test_single_pass_mode(self, sample_health_config, mock_llm, mock_logger):
+        """Test single-pass mode fills concerns and handling in one call."""
+        sample_health_config.execution.single_pass_concern_analysis = True
+        creator = ConcernAnalysisSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        subgraph, entry_node, end_nodes = creator.create_subgraph()
+
+        assert list(subgraph.nodes) == ["analyze_concerns"]
+        assert entry_node == "analyze_concerns"
+        assert end_nodes == ["analyze_concerns"]
+
+        def respond(prompt, model, llm, logger):
+            return model(
+                concerns=[
+                    {
+                        "description": "Refund request",
+                        "addressal_level": "partially_addressed",
+                        "reasoning": "Only acknowledged",
+                    }
+                ],
+                concern_handling_quality={
+                    "selected_response": "poor",
+                    "reasoning": "Left open",
+                    "confidence": "high",
+                },
+            )
+
+        subgraph.add_edge("analyze_concerns", END)
+        with patch(
+            "subgraph_creators.call_llm_structured", side_effect=respond
+        ) as mock_call:
+            result = subgraph.compile().invoke({"transcript": "Test transcript"})
+
+        mock_call.assert_called_once()
+        concerns = result["identified_concerns"].concerns
+        assert [concern.description for concern in concerns] == ["Refund request"]
+        handling = result["criteria_evaluations"]["concern_handling_quality"]
+        assert handling.selected_response.value == "poor"
+
+    def test_concern_identification_failure(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test a failed identification marks concern handling as failed."""
+        creator = ConcernAnalysisSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        subgraph, entry_node, end_nodes = creator.create_subgraph()
+        subgraph.add_edge(end_nodes[0], END)
+
+        with patch(
+            "subgraph_creators.call_llm_structured",
+            side_effect=RuntimeError("API down"),
+        ) as mock_call:
+            result = subgraph.compile().invoke({"transcript": "Test transcript"})
+
+        mock_call.assert_called_once()
+        assert isinstance(
+            result["criteria_evaluations"]["concern_handling_quality"],
+            FailedAnalysisResult,
+        )
+        assert list(result["failed_nodes"]) == ["identify_conversation_concerns"]
+
 
 class TestConfigBasedEvaluationSubgraphCreator:
     """Tests for the config-based evaluation subgraph creator."""
@@ -117,6 +189,90 @@ class TestConfigBasedEvaluationSubgraphCreator:
         criteria_builder.assert_called_once_with(mock_llm, mock_logger)
         indicator_builder.assert_called_once_with(mock_llm, mock_logger)
 
+    def test_fused_indicator_mode(
+        self, sample_health_config, mock_llm, mock_logger, mock_node_builders
+    ):
+        """Test fused mode replaces per-indicator nodes with a single node."""
+        criteria_builder, indicator_builder = mock_node_builders
+        sample_health_config.execution.fuse_quality_indicators = True
+
+        creator = ConfigBasedEvaluationSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        subgraph, entry_node, end_nodes = creator.create_subgraph()
+
+        assert "detect_quality_indicators" in end_nodes
+        assert not any(
+            f"detect_{indicator.name}" in subgraph.nodes
+            for indicator in sample_health_config.quality_indicators
+        )
+        indicator_builder.return_value.create_fused_graph_node.assert_called_once_with(
+            sample_health_config.quality_indicators
+        )
+
+    def test_triage_mode(
+        self, sample_health_config, mock_llm, mock_logger, mock_node_builders
+    ):
+        """Test indicator nodes wait for one triage node in triage mode."""
+        criteria_builder, indicator_builder = mock_node_builders
+        sample_health_config.execution.triage_quality_indicators = True
+
+        creator = ConfigBasedEvaluationSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        subgraph, entry_node, end_nodes = creator.create_subgraph()
+
+        assert ("start_evaluations", "triage_quality_indicators") in subgraph.edges
+        assert ("triage_quality_indicators", "detect_escalation_language") in (
+            subgraph.edges
+        )
+        assert ("start_evaluations", "detect_escalation_language") not in (
+            subgraph.edges
+        )
+        assert ("start_evaluations", "evaluate_conversation_sentiment") in (
+            subgraph.edges
+        )
+        assert "triage_quality_indicators" not in end_nodes
+        indicator_builder.return_value.create_triage_graph_node.assert_called_once_with(
+            sample_health_config.quality_indicators
+        )
+
+    def test_derived_indicators_skip_llm_nodes(
+        self, sample_health_config, mock_llm, mock_logger, mock_node_builders
+    ):
+        """Test derived indicators get no LLM detection node."""
+        criteria_builder, indicator_builder = mock_node_builders
+        sample_health_config.quality_indicators[0].derivation = (
+            "repetitive_unaddressed_concerns"
+        )
+
+        creator = ConfigBasedEvaluationSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        subgraph, _, _ = creator.create_subgraph()
+
+        assert "detect_escalation_language" not in subgraph.nodes
+        assert "detect_mutual_collaboration" in subgraph.nodes
+
+    def test_fused_criteria_mode(
+        self, sample_health_config, mock_llm, mock_logger, mock_node_builders
+    ):
+        """Test fused mode evaluates config-based criteria in a single node."""
+        criteria_builder, indicator_builder = mock_node_builders
+        sample_health_config.execution.fuse_evaluation_criteria = True
+
+        creator = ConfigBasedEvaluationSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        subgraph, entry_node, end_nodes = creator.create_subgraph()
+
+        assert "evaluate_criteria" in end_nodes
+        assert "evaluate_conversation_sentiment" not in subgraph.nodes
+        fused_criteria = (
+            criteria_builder.return_value.create_fused_graph_node.call_args[0][0]
+        )
+        assert [c.name for c in fused_criteria] == ["conversation_sentiment"]
+
 
 class TestScoringSynthesisSubgraphCreator:
     """Tests for the scoring and synthesis subgraph creator."""
@@ -173,6 +329,54 @@ class TestScoringSynthesisSubgraphCreator:
                 assert "quality_indicator_detections" in final_assessment
                 assert "health_score" in final_assessment
 
+    def test_synthesis_reuses_cached_assessment(
+        self, sample_health_config, mock_llm, mock_logger, sample_health_score
+    ):
+        """Test a cached assessment for the same outcome skips the LLM call."""
+        sample_health_config.execution.synthesis_cache = SynthesisCachePolicy.OUTCOMES
+        creator = ScoringSynthesisSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        state = Mock(
+            health_score=sample_health_score,
+            criteria_evaluations={},
+            quality_indicator_detections={},
+        )
+
+        with patch("subgraph_creators.call_llm") as mock_call:
+            with patch.object(
+                creator.synthesis_cache, "get", return_value="Cached assessment"
+            ):
+                result = creator._synthesize_health_assessment(state)
+
+        mock_call.assert_not_called()
+        assert result["final_assessment"]["overall_assessment"] == "Cached assessment"
+
+    def test_template_synthesis_requested_per_analysis(
+        self, sample_health_config, mock_llm, mock_logger, sample_health_score
+    ):
+        """Test a template synthesis request skips the LLM call."""
+        creator = ScoringSynthesisSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        state = Mock(
+            health_score=sample_health_score,
+            criteria_evaluations={},
+            quality_indicator_detections={},
+            synthesis_mode=SynthesisMode.TEMPLATE,
+        )
+
+        with patch("subgraph_creators.call_llm") as mock_call:
+            with patch.object(
+                creator.template_synthesizer,
+                "synthesize",
+                return_value="Template assessment",
+            ):
+                result = creator._synthesize_health_assessment(state)
+
+        mock_call.assert_not_called()
+        assert result["final_assessment"]["overall_assessment"] == "Template assessment"
+
     def test_subgraph_edge_structure(self, sample_health_config, mock_llm, mock_logger):
         """Test that scoring subgraph has correct edge structure."""
         creator = ScoringSynthesisSubgraphCreator(
@@ -189,3 +393,212 @@ class TestScoringSynthesisSubgraphCreator:
             and edge[1] == "synthesize_final_assessment"
         ]
         assert len(scoring_to_synthesis_edges) == 1
+
+    def test_subgraph_without_assessment(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test the scoring subgraph can end at the health score."""
+        creator = ScoringSynthesisSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger, include_assessment=False
+        )
+
+        subgraph, entry_node, end_nodes = creator.create_subgraph()
+
+        assert creator.writes == ("health_score",)
+        assert entry_node == "calculate_health_score"
+        assert end_nodes == ["calculate_health_score"]
+        assert "synthesize_final_assessment" not in subgraph.nodes
+
+    @pytest.mark.asyncio
+    async def test_write_assessment_later(
+        self, sample_health_config, mock_llm, mock_logger, sample_health_score
+    ):
+        """Test an assessment can be written for a stored health score."""
+        creator = ScoringSynthesisSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger, include_assessment=False
+        )
+
+        with patch(
+            "subgraph_creators.acall_llm", return_value="Deferred assessment"
+        ) as mock_call:
+            assessment = await creator.awrite_assessment(sample_health_score)
+
+        mock_call.assert_called_once()
+        assert assessment == "Deferred assessment"
+
+
+class TestDerivedIndicatorSubgraphCreator:
+    """Tests for the derived indicator subgraph creator."""
+
+    def test_derives_indicators_from_concerns(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test registered derivations run without LLM calls."""
+        sample_health_config.quality_indicators[0].derivation = (
+            "repetitive_unaddressed_concerns"
+        )
+        creator = DerivedIndicatorSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        subgraph, entry_node, end_nodes = creator.create_subgraph()
+        assert entry_node == end_nodes[0] == "derive_quality_indicators"
+
+        result = creator._derive_quality_indicators(
+            ConversationAnalysisState(
+                transcript="Test transcript",
+                identified_concerns={
+                    "concerns": [
+                        {
+                            "description": "Refund",
+                            "addressal_level": "not_addressed",
+                            "reasoning": "Ignored",
+                            "times_raised": 4,
+                        }
+                    ]
+                },
+            )
+        )
+
+        detections = result["quality_indicator_detections"]
+        assert list(detections) == ["escalation_language"]
+        assert detections["escalation_language"].detected
+        mock_llm.invoke.assert_not_called()
+
+    def test_failed_concern_analysis(self, sample_health_config, mock_llm, mock_logger):
+        """Test derived indicators fail when concern analysis failed."""
+        sample_health_config.quality_indicators[0].derivation = (
+            "repetitive_unaddressed_concerns"
+        )
+        creator = DerivedIndicatorSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+
+        result = creator._derive_quality_indicators(
+            ConversationAnalysisState(
+                criteria_evaluations={
+                    "concern_handling_quality": FailedAnalysisResult(error="Boom")
+                }
+            )
+        )
+
+        assert isinstance(
+            result["quality_indicator_detections"]["escalation_language"],
+            FailedAnalysisResult,
+        )
+
+    def test_transcript_derivations_survive_concern_failure(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test only concern-based derivations fail with concern analysis."""
+        sample_health_config.quality_indicators[0].derivation = (
+            "repetitive_unaddressed_concerns"
+        )
+        sample_health_config.quality_indicators[1].derivation = "one_sided_effort"
+        creator = DerivedIndicatorSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        assert creator.reads == ("identified_concerns", "transcript_index")
+
+        result = creator._derive_quality_indicators(
+            ConversationAnalysisState(
+                transcript="Agent: Hello there.\nCustomer: Hi.",
+                criteria_evaluations={
+                    "concern_handling_quality": FailedAnalysisResult(error="Boom")
+                },
+            )
+        )
+
+        detections = result["quality_indicator_detections"]
+        assert isinstance(detections["escalation_language"], FailedAnalysisResult)
+        assert not isinstance(detections["mutual_collaboration"], FailedAnalysisResult)
+
+    def test_resolution_failure_keeps_concern_derivations(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test identified concerns are still used when only their resolution
+        analysis failed."""
+        sample_health_config.quality_indicators[0].derivation = (
+            "repetitive_unaddressed_concerns"
+        )
+        creator = DerivedIndicatorSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+
+        result = creator._derive_quality_indicators(
+            ConversationAnalysisState(
+                criteria_evaluations={
+                    "concern_handling_quality": FailedAnalysisResult(error="Boom")
+                },
+                failed_nodes={"analyze_concern_handling": "Boom"},
+            )
+        )
+
+        detection = result["quality_indicator_detections"]["escalation_language"]
+        assert not isinstance(detection, FailedAnalysisResult)
+        assert not detection.detected
+
+    def test_failing_derivation_is_isolated(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test the derive node records its failure instead of aborting."""
+        sample_health_config.quality_indicators[0].derivation = (
+            "repetitive_unaddressed_concerns"
+        )
+        creator = DerivedIndicatorSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        creator.derived_indicators["escalation_language"] = Mock(
+            side_effect=ValueError("bad concern data")
+        )
+        subgraph, _, _ = creator.create_subgraph()
+
+        result = subgraph.compile().invoke({"transcript": "Test transcript"})
+
+        assert "derive_quality_indicators" in result["failed_nodes"]
+        assert isinstance(
+            result["quality_indicator_detections"]["escalation_language"],
+            FailedAnalysisResult,
+        )
+
+    def test_unknown_derivation_rejected(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test configs naming an unregistered derivation fail fast."""
+        sample_health_config.quality_indicators[0].derivation = "missing"
+
+        with pytest.raises(ValueError, match="not registered"):
+            DerivedIndicatorSubgraphCreator(sample_health_config, mock_llm, mock_logger)
+
+
+class TestTranscriptIndexSubgraphCreator:
+    """Tests for the transcript index subgraph creator."""
+
+    def test_indexes_transcript(self, sample_health_config, mock_llm, mock_logger):
+        """Test the index node parses the transcript into turns."""
+        creator = TranscriptIndexSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        subgraph, entry_node, end_nodes = creator.create_subgraph()
+        assert entry_node == end_nodes[0] == "index_transcript"
+
+        result = creator._index_transcript(
+            ConversationAnalysisState(transcript="Agent: Hi?\nCustomer: Hello.")
+        )
+
+        assert result["transcript_index"].speakers == ["Agent", "Customer"]
+        assert result["transcript_index"].is_question == [True, False]
+
+    def test_metric_prompts_read_the_index(
+        self, sample_health_config, mock_llm, mock_logger
+    ):
+        """Test evaluations wait for the index only when prompts use metrics."""
+        creator = ConfigBasedEvaluationSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        assert "transcript_index" not in creator.reads
+
+        sample_health_config.quality_indicators[0].uses_transcript_metrics = True
+        creator = ConfigBasedEvaluationSubgraphCreator(
+            sample_health_config, mock_llm, mock_logger
+        )
+        assert "transcript_index" in creator.reads
@@ -0,0 +1,133 @@
+import pytest
+from unittest.mock import Mock
+from llm import configure_llm_cache
+from llm_cache import LLMResponseCache
+from models import SynthesisCachePolicy
+from synthesis_cache import SynthesisCache, build_synthesis_outcome_key
+
+
+def make_health_score(
+    sentiment="positive", reasoning="Warm tone", detected=False, level="good"
+):
+    return {
+        "criteria_results": {
+            "conversation_sentiment": {
+                "selected_response": sentiment,
+                "reasoning": reasoning,
+                "included_in_final_score": True,
+            }
+        },
+        "indicator_results": {
+            "escalation_language": {
+                "pattern_detected": detected,
+                "reasoning": reasoning,
+                "included_in_final_score": True,
+            }
+        },
+        "final_score": 80,
+        "health_level": level,
+    }
+
+
+@pytest.fixture
+def cache_llm():
+    """LLM stand-in with a stable model identity"""
+    llm = Mock()
+    llm.model_name = "test-model"
+    llm.temperature = 0
+    return llm
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"))
+    configure_llm_cache(cache)
+    yield cache
+    configure_llm_cache(None)
+
+
+def test_outcome_key_ignores_reasoning_and_scores():
+    """Test conversations with the same outcomes share a key"""
+    first = make_health_score(reasoning="Warm tone")
+    second = make_health_score(reasoning="Friendly throughout")
+    second["final_score"] = 77
+
+    assert build_synthesis_outcome_key(first) == build_synthesis_outcome_key(second)
+
+
+def test_outcome_key_includes_reasoning_when_requested():
+    """Test reasoning is part of the key only when requested"""
+    first = make_health_score(reasoning="Warm tone")
+    second = make_health_score(reasoning="Friendly throughout")
+
+    assert build_synthesis_outcome_key(
+        first, include_reasoning=True
+    ) != build_synthesis_outcome_key(second, include_reasoning=True)
+
+
+@pytest.mark.parametrize(
+    "changed",
+    [
+        {"sentiment": "negative"},
+        {"detected": True},
+        {"level": "fair"},
+    ],
+)
+def test_outcome_key_changes_with_outcomes(changed):
+    """Test any categorical change produces a different key"""
+    assert build_synthesis_outcome_key(
+        make_health_score()
+    ) != build_synthesis_outcome_key(make_health_score(**changed))
+
+
+def test_cache_round_trip(response_cache, cache_llm):
+    """Test an assessment is reused for the same outcome only"""
+    synthesis_cache = SynthesisCache(SynthesisCachePolicy.OUTCOMES)
+    synthesis_cache.set(make_health_score(), cache_llm, "Good conversation")
+
+    assert (
+        synthesis_cache.get(make_health_score(reasoning="Other"), cache_llm)
+        == "Good conversation"
+    )
+    assert synthesis_cache.get(make_health_score(level="fair"), cache_llm) is None
+
+
+def test_disabled_policy_never_caches(response_cache, cache_llm):
+    """Test the disabled policy neither stores nor reads entries"""
+    synthesis_cache = SynthesisCache(SynthesisCachePolicy.DISABLED)
+    synthesis_cache.set(make_health_score(), cache_llm, "Good conversation")
+
+    assert synthesis_cache.get(make_health_score(), cache_llm) is None
+    assert response_cache.stats()["entries"] == 0
+
+
+def test_no_configured_cache(cache_llm):
+    """Test the synthesis cache is a no-op without a response cache"""
+    configure_llm_cache(None)
+    synthesis_cache = SynthesisCache(SynthesisCachePolicy.OUTCOMES)
+    synthesis_cache.set(make_health_score(), cache_llm, "Good conversation")
+
+    assert synthesis_cache.get(make_health_score(), cache_llm) is None
+
+
+def test_caching_prompt_holds_only_the_outcome():
+    """Test a reusable assessment is not written from one conversation's details"""
+    health_score = make_health_score(reasoning="Customer Jane mentioned order 4411")
+    health_score["final_score"] = 83
+
+    prompt = SynthesisCache(SynthesisCachePolicy.OUTCOMES).build_prompt(health_score)
+
+    assert "order 4411" not in prompt
+    assert "83" not in prompt
+    assert "positive" in prompt
+    assert "good" in prompt
+
+
+def test_reasoning_policy_prompt_includes_keyed_reasoning():
+    """Test reasoning is given to the LLM only when it is part of the key"""
+    policy = SynthesisCachePolicy.OUTCOMES_AND_REASONING
+
+    prompt = SynthesisCache(policy).build_prompt(make_health_score())
+
+    assert "Warm tone" in prompt
+    assert "80" not in prompt
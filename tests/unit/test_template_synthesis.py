@@ -0,0 +1,116 @@
+import pytest
+from template_synthesis import TemplateSynthesizer
+
+
+@pytest.fixture
+def template_config(sample_health_config):
+    """Sample config with recommendation snippets"""
+    criteria = sample_health_config.evaluation_criteria
+    sentiment_options = criteria["conversation_sentiment"].response_options
+    sentiment_options["positive"].recommendation = "The tone stayed positive."
+    sentiment_options["negative"].recommendation = "Reset the tone early."
+    handling_options = criteria["concern_handling_quality"].response_options
+    handling_options["poor"].recommendation = "Answer each concern directly."
+    escalation, collaboration = sample_health_config.quality_indicators
+    escalation.recommendation = "De-escalate before problem-solving."
+    collaboration.recommendation = "Both parties collaborated well."
+    return sample_health_config
+
+
+def make_health_score(
+    sentiment="positive",
+    handling="excellent",
+    escalation=False,
+    collaboration=False,
+    level="Excellent",
+):
+    earned = {"positive": 40, "negative": 8, "excellent": 35, "poor": 10.5}
+    return {
+        "criteria_results": {
+            "conversation_sentiment": {
+                "selected_response": sentiment,
+                "earned_points": earned[sentiment],
+                "included_in_final_score": True,
+            },
+            "concern_handling_quality": {
+                "selected_response": handling,
+                "earned_points": earned[handling],
+                "included_in_final_score": True,
+            },
+        },
+        "indicator_results": {
+            "escalation_language": {
+                "pattern_detected": escalation,
+                "included_in_final_score": True,
+            },
+            "mutual_collaboration": {
+                "pattern_detected": collaboration,
+                "included_in_final_score": True,
+            },
+        },
+        "final_score": 90,
+        "health_level": level,
+        "uncertainty_info": {"failed_criteria": [], "failed_indicators": []},
+    }
+
+
+def test_effective_conversation_gets_one_sentence(template_config):
+    """Test a conversation without issues is summarised by its top strength"""
+    synthesizer = TemplateSynthesizer(template_config)
+
+    assessment = synthesizer.synthesize(make_health_score(collaboration=True))
+
+    assert assessment == (
+        "Excellent conversation (90/100): Outstanding conversation quality. "
+        "Both parties collaborated well."
+    )
+
+
+def test_issues_ordered_by_severity_and_impact(template_config):
+    """Test critical indicators come first, then criteria by points lost"""
+    synthesizer = TemplateSynthesizer(template_config)
+
+    assessment = synthesizer.synthesize(
+        make_health_score(
+            sentiment="negative", handling="poor", escalation=True, level="Poor"
+        )
+    )
+
+    assert assessment.splitlines()[1:] == [
+        "- De-escalate before problem-solving.",
+        "- Reset the tone early.",
+        "- Answer each concern directly.",
+    ]
+
+
+def test_strengths_fill_remaining_recommendations(template_config):
+    """Test strengths are listed after issues when there is room"""
+    synthesizer = TemplateSynthesizer(template_config)
+
+    assessment = synthesizer.synthesize(
+        make_health_score(escalation=True, collaboration=True, level="Good")
+    )
+
+    assert assessment.splitlines()[1:] == [
+        "- De-escalate before problem-solving.",
+        "- Both parties collaborated well.",
+        "- The tone stayed positive.",
+    ]
+
+
+def test_excluded_results_and_failures(template_config):
+    """Test excluded results add no snippet and failures are reported"""
+    synthesizer = TemplateSynthesizer(template_config)
+    health_score = make_health_score(escalation=True, sentiment="negative")
+    health_score["indicator_results"]["escalation_language"][
+        "included_in_final_score"
+    ] = False
+    health_score["uncertainty_info"]["failed_indicators"] = ["mutual_collaboration"]
+
+    assessment = synthesizer.synthesize(health_score)
+
+    assert "De-escalate" not in assessment
+    assert "- Reset the tone early." in assessment
+    assert assessment.endswith(
+        "Not assessed due to analysis failures: mutual_collaboration."
+    )
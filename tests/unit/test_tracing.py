@@ -0,0 +1,196 @@
+import pytest
+from typing import Dict, Optional
+from pydantic import BaseModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, StateGraph
+from llm import acall_llm, call_llm
+from node_builders import create_graph_node
+from tracing import (
+    NOOP_SPAN,
+    JsonlTraceExporter,
+    configure_trace_exporter,
+    critical_path,
+    get_current_span,
+    load_traces,
+    start_trace,
+    trace_span,
+)
+
+
+class AnswerState(BaseModel):
+    answer: Optional[str] = None
+    failed_nodes: Dict[str, str] = {}
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    exporter = JsonlTraceExporter(str(tmp_path / "traces.jsonl"))
+    configure_trace_exporter(exporter)
+    yield exporter
+    configure_trace_exporter(None)
+
+
+def usage_llm():
+    message = AIMessage(
+        content="Answer",
+        usage_metadata={"input_tokens": 100, "output_tokens": 20, "total_tokens": 120},
+    )
+    return GenericFakeChatModel(messages=iter([message]))
+
+
+def node_span(name, start, end):
+    return {
+        "span_id": name,
+        "name": name,
+        "kind": "node",
+        "start_time": start,
+        "end_time": end,
+    }
+
+
+def test_spans_are_nested_and_exported(exporter):
+    """Test spans record their parent and are written once the trace ends"""
+    with start_trace("analyze", request_id="abc") as trace:
+        with trace_span("detect_escalation", "node") as node:
+            with trace_span("llm_call", "llm") as call:
+                assert get_current_span() is call
+
+    traces = load_traces(exporter.path)
+    spans = {span["name"]: span for span in traces[trace.trace_id]}
+    root = spans["analyze"]
+    assert root["parent_span_id"] is None
+    assert root["attributes"] == {"request_id": "abc"}
+    assert spans["detect_escalation"]["parent_span_id"] == root["span_id"]
+    assert spans["llm_call"]["parent_span_id"] == node.span_id
+    assert all(span["duration_seconds"] >= 0 for span in spans.values())
+
+
+def test_traces_are_grouped_by_id(exporter):
+    """Test every trace in the file is loaded separately"""
+    with start_trace("first"):
+        pass
+    with start_trace("second"):
+        pass
+
+    traces = load_traces(exporter.path)
+    assert [spans[0]["name"] for spans in traces.values()] == ["first", "second"]
+
+
+def test_no_tracing_without_exporter(tmp_path):
+    """Test nothing is recorded when no exporter is installed"""
+    with start_trace("analyze") as trace:
+        with trace_span("node", "node") as span:
+            assert span is NOOP_SPAN
+            span.set_attribute("ignored", True)
+
+    assert trace is None
+    assert get_current_span() is NOOP_SPAN
+    assert load_traces(str(tmp_path / "missing.jsonl")) == {}
+
+
+def test_errors_mark_span(exporter):
+    """Test an exception sets error status and is still exported"""
+    with pytest.raises(ValueError):
+        with start_trace("analyze") as trace:
+            with trace_span("node", "node"):
+                raise ValueError("boom")
+
+    spans = load_traces(exporter.path)[trace.trace_id]
+    assert {span["status"] for span in spans} == {"error"}
+    assert "boom" in spans[1]["attributes"]["error"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_async", [False, True])
+async def test_graph_nodes_and_llm_calls_are_traced(exporter, mock_logger, use_async):
+    """Test nodes contain their LLM call and its attempts, with token counts"""
+    llm = usage_llm()
+
+    def ask(state):
+        return {"answer": call_llm("Question", llm, mock_logger)}
+
+    async def aask(state):
+        return {"answer": await acall_llm("Question", llm, mock_logger)}
+
+    graph = StateGraph(AnswerState)
+    graph.add_node("ask_question", create_graph_node(ask, aask))
+    graph.set_entry_point("ask_question")
+    graph.add_edge("ask_question", END)
+    compiled = graph.compile()
+
+    with start_trace("analyze") as trace:
+        if use_async:
+            await compiled.ainvoke({})
+        else:
+            compiled.invoke({})
+
+    spans = {span["kind"]: span for span in load_traces(exporter.path)[trace.trace_id]}
+    assert spans["node"]["name"] == "ask_question"
+    assert spans["node"]["parent_span_id"] == spans["request"]["span_id"]
+    assert spans["llm"]["parent_span_id"] == spans["node"]["span_id"]
+    assert spans["llm_attempt"]["parent_span_id"] == spans["llm"]["span_id"]
+
+    call = spans["llm"]["attributes"]
+    assert call["node"] == "ask_question"
+    assert call["model"] == "GenericFakeChatModel"
+    assert call["retries"] == 0
+    assert call["prompt_tokens"] == 100
+    assert call["completion_tokens"] == 20
+    assert call["cache"] in ("hit", "miss", "off")
+    assert spans["llm_attempt"]["attributes"]["prompt_tokens"] == 100
+
+
+def test_failed_node_is_marked(exporter, mock_logger):
+    """Test a node replaced by its fallback keeps an error status"""
+
+    def fail(state):
+        raise ValueError("bad response")
+
+    async def afail(state):
+        fail(state)
+
+    graph = StateGraph(AnswerState)
+    graph.add_node(
+        "ask_question",
+        create_graph_node(fail, afail, fallback=lambda state, error: {"answer": None}),
+    )
+    graph.set_entry_point("ask_question")
+    graph.add_edge("ask_question", END)
+
+    with start_trace("analyze") as trace:
+        graph.compile().invoke({})
+
+    spans = load_traces(exporter.path)[trace.trace_id]
+    node = next(span for span in spans if span["kind"] == "node")
+    assert node["status"] == "error"
+
+
+def test_critical_path_follows_dependencies():
+    """Test the path steps back through the nodes each one waited on"""
+    spans = [
+        node_span("extract", 0.0, 1.0),
+        node_span("fast_detector", 1.0, 1.5),
+        node_span("slow_detector", 1.0, 4.0),
+        node_span("calculate_score", 4.0, 4.1),
+        node_span("write_assessment", 4.1, 6.0),
+    ]
+
+    path = [span["name"] for span in critical_path(spans)]
+
+    assert path == ["extract", "slow_detector", "calculate_score", "write_assessment"]
+
+
+def test_critical_path_skips_parallel_siblings():
+    """Test nodes of the same step are not chained when they finish quickly"""
+    spans = [
+        node_span("extract", 0.0, 1.0),
+        node_span("cached_detector", 1.0, 1.001),
+        node_span("other_cached_detector", 1.0005, 1.002),
+        node_span("calculate_score", 1.01, 1.02),
+    ]
+
+    path = [span["name"] for span in critical_path(spans)]
+
+    assert path == ["extract", "other_cached_detector", "calculate_score"]
+    assert critical_path([]) == []
@@ -0,0 +1,121 @@
+import pytest
+from models import ConversationAnalysisState, TranscriptIndex
+from transcript_metrics import (
+    compute_transcript_metrics,
+    format_transcript_facts,
+    get_transcript_index,
+    parse_transcript,
+)
+
+TRANSCRIPT = """Customer: Can you fix my account?
+Agent: Sure. What is the account number?
+Customer: It is 1234.
+It was opened last year.
+Agent: Thanks, fixed.
+Customer: Why did it break? Will it happen again?
+Customer: Hello?"""
+
+
+def test_parse_transcript_turns():
+    """Test turns, offsets and continuation lines are indexed"""
+    index = parse_transcript(TRANSCRIPT)
+
+    assert index.speakers == [
+        "Customer",
+        "Agent",
+        "Customer",
+        "Agent",
+        "Customer",
+        "Customer",
+    ]
+    assert TRANSCRIPT[index.starts[0] : index.ends[0]] == "Can you fix my account?"
+    assert TRANSCRIPT[index.starts[2] : index.ends[2]].endswith("opened last year.")
+    assert index.word_counts[2] == 8
+    assert index.is_question == [True, True, False, False, True, True]
+
+
+def test_parse_transcript_without_speakers():
+    """Test text without speaker labels yields an empty index"""
+    index = parse_transcript("just some text without labels")
+
+    assert index.turn_count == 0
+    assert format_transcript_facts(compute_transcript_metrics(index)) == ""
+
+
+def test_compute_transcript_metrics():
+    """Test per-speaker counts, shares, unanswered questions and trends"""
+    metrics = compute_transcript_metrics(parse_transcript(TRANSCRIPT))
+
+    assert metrics["turn_counts"] == {"Customer": 4, "Agent": 2}
+    assert sum(metrics["word_share"].values()) == pytest.approx(1.0)
+    assert metrics["questions_asked"] == {"Customer": 3, "Agent": 1}
+    # The repeated question and the final "Hello?" got no reply
+    assert metrics["unanswered_questions"] == {"Customer": 2, "Agent": 0}
+    assert metrics["length_trend"]["Agent"] == pytest.approx(2 / 6)
+
+
+def test_format_transcript_facts():
+    """Test metrics render as prompt lines"""
+    facts = format_transcript_facts(
+        compute_transcript_metrics(parse_transcript(TRANSCRIPT))
+    )
+
+    assert "- Turns: Customer: 4, Agent: 2" in facts
+    assert "Customer: 3 (2 unanswered)" in facts
+    assert "Agent: 0.33x" in facts
+
+
+def test_get_transcript_index_prefers_state():
+    """Test the graph-built index is reused instead of reparsing"""
+    index = TranscriptIndex(speakers=["A"], starts=[0], ends=[1])
+    state = ConversationAnalysisState(transcript=TRANSCRIPT, transcript_index=index)
+
+    assert get_transcript_index(state) is index
+    assert (
+        get_transcript_index(ConversationAnalysisState(transcript=TRANSCRIPT)).speakers
+        == parse_transcript(TRANSCRIPT).speakers
+    )
+
+
+def test_only_speaker_labels_start_turns():
+    """Test notes, steps, times and URLs stay inside the current turn"""
+    transcript = """Agent: Let me walk you through it.
+Step 2: open the settings page.
+Note: this resets your password.
+Customer: The page at https://example.com says 10:30: closed.
+Agent: Try again at 11:00."""
+
+    index = parse_transcript(transcript)
+
+    assert index.speakers == ["Agent", "Customer", "Agent"]
+    assert transcript[index.starts[0] : index.ends[0]].endswith("your password.")
+
+
+def test_named_speakers_start_turns():
+    """Test short transcripts between named speakers are indexed"""
+    assert parse_transcript("John: Hi Mary.\nMary: Hi John!").speakers == [
+        "John",
+        "Mary",
+    ]
+    assert parse_transcript(
+        "Dr. Smith: How are you feeling?\nPatient: Better, thanks."
+    ).speakers == ["Dr. Smith", "Patient"]
+
+
+def test_single_turn_and_late_speakers_start_turns():
+    """Test a speaker talking once, or only late, gets their own turn"""
+    opening = "".join(
+        f"Alice: Point {number}.\nBob: Noted {number}.\n" for number in range(6)
+    )
+    transcript = opening + "Carol: Can I ask a question?\nPS: bye"
+
+    index = parse_transcript(transcript)
+
+    assert index.speakers[-1] == "Carol"
+    assert index.is_question[-1]
+    assert not any(index.is_question[:-1])
+    assert compute_transcript_metrics(index)["turn_counts"] == {
+        "Alice": 6,
+        "Bob": 6,
+        "Carol": 1,
+    }